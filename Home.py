@@ -1,12 +1,17 @@
 import os
 import streamlit as st
 
+from backend.metrics import start_metrics_server
+
 st.set_page_config(
     page_title="Gov Info Companion",
     page_icon="🏛️",
     layout="wide",
 )
 
+# Prometheus endpoint for this server process (no-op after the first run)
+start_metrics_server()
+
 PASSWORD = os.getenv("APP_PASSWORD")
 
 if PASSWORD:
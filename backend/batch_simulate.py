@@ -0,0 +1,293 @@
+# backend/batch_simulate.py
+"""
+Retirement projections for a whole member file.
+
+Reads a CSV or Parquet file with one member per row and the RetirementInputs
+columns (current_age, retirement_age, current_savings, monthly_contribution,
+salary_growth_rate, assumed_return_rate; rates as fractions) in chunks of
+--chunk-rows. Each chunk is projected with project_savings_batch in a pool
+of worker processes and classified against the BRS / FRS / ERS of each
+member's cohort (the year they turn 55). Results are
+written as they come back, in input order and with any other input columns
+(a member id, say) carried through, so memory stays at a few chunks
+whatever the size of the file. Rows with missing, inconsistent or out of
+range inputs (ages outside 0-MAX_AGE, retirement before the current age,
+negative amounts, rates outside -100%..+100%) are classified as
+"Invalid input" rather than failing the run.
+
+A summary (members per classification, by current-age band, and a histogram
+of projected savings as a multiple of the cohort FRS) is printed and written as
+JSON next to the output, with the throughput in rows/s.
+
+Parquet input or output needs pyarrow.
+
+Usage:
+    python -m backend.batch_simulate members.parquet --synthetic 1000000   # write a synthetic member file
+    python -m backend.batch_simulate members.parquet results.parquet
+    python -m backend.batch_simulate members.csv results.csv --workers 4 --chunk-rows 500000
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, Iterator
+
+import numpy as np
+import pandas as pd
+
+from backend.config import CURRENT_YEAR_LABEL, RETIREMENT_SUM_GROWTH, RETIREMENT_SUMS_PATH
+from backend.simulator import (
+    RETIREMENT_SUM_LABELS,
+    RetirementInputs,
+    classify,
+    cohort_retirement_sums,
+    project_savings_batch,
+)
+
+INPUT_COLUMNS = [f.name for f in fields(RetirementInputs)]
+LABELS = RETIREMENT_SUM_LABELS + ("Invalid input",)
+INVALID = len(LABELS) - 1
+# Plausibility bounds; rows outside them are invalid. Projections allocate per
+# year of horizon, so an unbounded age could exhaust a worker's memory.
+MAX_AGE = 120
+MAX_RATE = 1.0
+
+# Upper edges of the current-age bands (<30, 30-39, ..., 60+)
+AGE_BAND_EDGES = np.array([30, 40, 50, 60])
+AGE_BANDS = ("<30", "30-39", "40-49", "50-59", "60+")
+# Projected savings histogram, in multiples of the cohort FRS; the last bin is open
+FRS_MULTIPLE_EDGES = np.round(np.arange(0.25, 5.01, 0.25), 2)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Parquet files need pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def read_chunks(path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if path.suffix == ".parquet":
+        for batch in _pyarrow().parquet.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+
+
+class ChunkWriter:
+    """
+    Appends DataFrames to a CSV or Parquet file (one row group per chunk).
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._parquet = path.suffix == ".parquet"
+        self._writer = None
+        self._schema = None
+        self._started = False
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self._parquet:
+            pa = _pyarrow()
+            table = pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pa.parquet.ParquetWriter(self.path, self._schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="a" if self._started else "w", header=not self._started, index=False)
+        self._started = True
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def project_chunk(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Project and classify one chunk (runs in a worker process). Returns the
+    projected savings, multiple of the cohort FRS and classification code
+    per row, plus the chunk's share of the summary counts.
+    """
+    current_age = columns["current_age"]
+    retirement_age = columns["retirement_age"]
+    valid = np.logical_and.reduce([np.isfinite(columns[name]) for name in INPUT_COLUMNS])
+    valid &= (0 <= current_age) & (current_age <= retirement_age) & (retirement_age <= MAX_AGE)
+    valid &= (columns["current_savings"] >= 0) & (columns["monthly_contribution"] >= 0)
+    for name in ("salary_growth_rate", "assumed_return_rate"):
+        valid &= (-MAX_RATE < columns[name]) & (columns[name] <= MAX_RATE)
+
+    projected = np.full(len(current_age), np.nan)
+    projected[valid] = project_savings_batch({name: v[valid] for name, v in columns.items()}).final_balance
+    sums = cohort_retirement_sums(current_age[valid])
+    code = np.full(len(current_age), INVALID, dtype="int8")
+    code[valid] = classify(projected[valid], sums)
+    multiple_of_frs = np.full(len(current_age), np.nan)
+    multiple_of_frs[valid] = projected[valid] / sums[:, 1]
+
+    band = np.searchsorted(AGE_BAND_EDGES, current_age[valid], side="right")
+    by_age = np.bincount(band * len(LABELS) + code[valid], minlength=len(AGE_BANDS) * len(LABELS))
+    multiple = np.searchsorted(FRS_MULTIPLE_EDGES, multiple_of_frs[valid], side="right")
+    return {
+        "projected_savings": projected,
+        "multiple_of_frs": multiple_of_frs,
+        "code": code,
+        "by_age": by_age.reshape(len(AGE_BANDS), len(LABELS)),
+        "frs_multiple": np.bincount(multiple, minlength=len(FRS_MULTIPLE_EDGES) + 1),
+        "invalid": np.count_nonzero(~valid),
+    }
+
+
+def _input_columns(chunk: pd.DataFrame) -> Dict[str, np.ndarray]:
+    missing = [name for name in INPUT_COLUMNS if name not in chunk.columns]
+    if missing:
+        raise SystemExit(f"Input is missing columns: {', '.join(missing)}")
+    # Anything non-numeric becomes NaN, i.e. an invalid row
+    return {name: pd.to_numeric(chunk[name], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            for name in INPUT_COLUMNS}
+
+
+def run(input_path: Path, output_path: Path, workers: int, chunk_rows: int, max_pending: int) -> Dict:
+    start = time.perf_counter()
+    by_age = np.zeros((len(AGE_BANDS), len(LABELS)), dtype="int64")
+    frs_multiple = np.zeros(len(FRS_MULTIPLE_EDGES) + 1, dtype="int64")
+    rows = invalid = 0
+    writer = ChunkWriter(output_path)
+
+    def finish(chunk: pd.DataFrame, result: Dict[str, np.ndarray]) -> None:
+        nonlocal rows, invalid
+        chunk = chunk.assign(
+            projected_savings=result["projected_savings"].round(2),
+            multiple_of_frs=result["multiple_of_frs"].round(2),
+            classification=pd.Categorical.from_codes(result["code"], categories=LABELS),
+        )
+        writer.write(chunk)
+        by_age[:] += result["by_age"]
+        frs_multiple[:] += result["frs_multiple"]
+        rows += len(chunk)
+        invalid += int(result["invalid"])
+
+    # Chunks are written in input order; at most max_pending are in flight,
+    # which is what bounds memory
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    pending: deque = deque()
+    try:
+        for chunk in read_chunks(input_path, chunk_rows):
+            columns = _input_columns(chunk)
+            if pool is None:
+                finish(chunk, project_chunk(columns))
+                continue
+            pending.append((chunk, pool.submit(project_chunk, columns)))
+            while len(pending) >= max_pending:
+                chunk, future = pending.popleft()
+                finish(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            finish(chunk, future.result())
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    seconds = time.perf_counter() - start
+    by_label = by_age.sum(axis=0)
+    by_label[INVALID] = invalid
+    return {
+        "input": str(input_path),
+        "output": str(output_path),
+        "rows": rows,
+        "invalid": invalid,
+        "seconds": round(seconds, 3),
+        "rows_per_s": round(rows / seconds) if seconds else None,
+        "workers": workers,
+        "retirement_sums": {"table": RETIREMENT_SUMS_PATH, "growth": RETIREMENT_SUM_GROWTH,
+                            "year": CURRENT_YEAR_LABEL},
+        "classification": dict(zip(LABELS, by_label.tolist())),
+        "by_age_band": {band: dict(zip(LABELS[:INVALID], counts[:INVALID].tolist()))
+                        for band, counts in zip(AGE_BANDS, by_age)},
+        "frs_multiple_histogram": {"upper_edges": FRS_MULTIPLE_EDGES.tolist() + [None],
+                                   "counts": frs_multiple.tolist()},
+    }
+
+
+def print_summary(summary: Dict) -> None:
+    rows = max(summary["rows"], 1)
+    print(f"{summary['rows']:,} members in {summary['seconds']:.1f}s ({summary['rows_per_s']:,} rows/s, "
+          f"{summary['workers'] or 'no'} worker processes) -> {summary['output']}")
+
+    print(f"\n{'classification':<22} {'members':>12} {'share':>7}")
+    for label, count in summary["classification"].items():
+        print(f"{label:<22} {count:>12,} {count / rows:>7.1%}")
+
+    labels = LABELS[:INVALID]
+    print(f"\n{'current age':<12}" + "".join(f"{label:>22}" for label in labels))
+    for band, counts in summary["by_age_band"].items():
+        total = max(sum(counts.values()), 1)
+        print(f"{band:<12}" + "".join(f"{counts[label] / total:>22.1%}" for label in labels))
+
+    print("\nprojected savings (x cohort FRS)")
+    histogram = summary["frs_multiple_histogram"]
+    peak = max(max(histogram["counts"]), 1)
+    lower = 0.0
+    for edge, count in zip(histogram["upper_edges"], histogram["counts"]):
+        span = f"{lower:.2f}-{edge:.2f}" if edge is not None else f"{lower:.2f}+"
+        print(f"{span:>10} {count:>12,} {'#' * round(40 * count / peak)}")
+        lower = edge
+
+
+def write_synthetic(path: Path, n: int, chunk_rows: int, seed: int) -> None:
+    """
+    A synthetic member population, for trying the pipeline at scale.
+    """
+    rng = np.random.default_rng(seed)
+    writer = ChunkWriter(path)
+    try:
+        for first in range(0, n, chunk_rows):
+            m = min(chunk_rows, n - first)
+            age = rng.integers(21, 65, m)
+            writer.write(pd.DataFrame({
+                "member_id": np.arange(first, first + m),
+                "current_age": age,
+                "retirement_age": np.maximum(age, rng.integers(55, 71, m)),
+                "current_savings": rng.lognormal(np.log(4_000.0 * (age - 20)), 0.8).round(2),
+                "monthly_contribution": rng.lognormal(np.log(500.0), 0.6, m).round(2),
+                "salary_growth_rate": rng.uniform(0.0, 0.04, m).round(4),
+                "assumed_return_rate": rng.uniform(0.025, 0.045, m).round(4),
+            }))
+    finally:
+        writer.close()
+    print(f"Wrote {n:,} synthetic members to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", type=Path, help="Member file (.csv or .parquet).")
+    parser.add_argument("output", type=Path, nargs="?", help="Results file (.csv or .parquet).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (0 projects in this process).")
+    parser.add_argument("--chunk-rows", type=int, default=200_000)
+    parser.add_argument("--max-pending", type=int, default=0,
+                        help="Chunks in flight at once (default: twice the workers).")
+    parser.add_argument("--summary", type=Path, help="Summary JSON (default: next to the output).")
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="Write N synthetic members to INPUT instead of projecting.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        write_synthetic(args.input, args.synthetic, args.chunk_rows, args.seed)
+        raise SystemExit(0)
+    if args.output is None:
+        parser.error("an output file is required")
+
+    summary = run(args.input, args.output, args.workers, args.chunk_rows, args.max_pending or 2 * max(args.workers, 1))
+    print_summary(summary)
+    summary_path = args.summary or args.output.with_name(args.output.stem + ".summary.json")
+    summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
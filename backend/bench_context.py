@@ -0,0 +1,110 @@
+# backend/bench_context.py
+"""
+Compare prompt size (and optionally LLM latency) between the legacy verbatim
+policy context (fixed k=6) and the token-budgeted packer.
+
+Usage:
+    python -m backend.bench_context            # prompt-size comparison only
+    python -m backend.bench_context --live     # also time chat completions
+"""
+
+import argparse
+import statistics
+import time
+from typing import List
+
+from backend.config import CONTEXT_TOKEN_BUDGET, CONTEXT_MAX_CHUNKS, OPENAI_MODEL
+from backend.context_packer import estimate_tokens, pack_context
+from backend.clients import get_openai_client
+from backend.rag import _build_policy_context, _build_system_prompt
+from backend.vector_store import retrieve
+
+LEGACY_K = 6
+
+QUESTIONS: List[str] = [
+    "What is the Full Retirement Sum (FRS)?",
+    "What is the difference between BRS, FRS and ERS?",
+    "How much can I withdraw from CPF at age 55?",
+    "What happens to my OA and SA when I turn 55?",
+    "If I own an HDB flat, can I use BRS instead of FRS?",
+    "How does CPF LIFE work in simple terms?",
+    "When do CPF LIFE payouts start?",
+    "How is extra interest paid on CPF balances?",
+    "Can I top up my parents' Retirement Account?",
+    "What are the CPF contribution rates for someone aged 60?",
+    "How do I apply to withdraw my CPF savings?",
+    "What can MediSave be used for?",
+]
+
+
+def _build_prompt(question: str, policy_context: str) -> str:
+    return (
+        f"User question: {question}\n\n"
+        f"CPF POLICY CONTEXT (RAG RETRIEVED, MAY BE PARTIAL)\n{policy_context}"
+    )
+
+
+def _time_completion(prompt: str, max_tokens: int) -> float:
+    start = time.perf_counter()
+    get_openai_client().chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": _build_system_prompt()},
+            {"role": "user", "content": prompt},
+        ],
+        max_tokens=max_tokens,
+        temperature=0,
+    )
+    return time.perf_counter() - start
+
+
+def run(token_budget: int, live: bool, max_tokens: int) -> None:
+    legacy_tokens = []
+    packed_tokens = []
+    legacy_latency = []
+    packed_latency = []
+
+    print(f"{'question':<55} {'legacy':>7} {'packed':>7} {'chunks':>7}")
+    for question in QUESTIONS:
+        chunks = retrieve(question, k=max(LEGACY_K, CONTEXT_MAX_CHUNKS))
+
+        legacy_context = _build_policy_context(chunks[:LEGACY_K]).text
+        packed = pack_context(chunks, query=question, token_budget=token_budget)
+
+        legacy_prompt = _build_prompt(question, legacy_context)
+        packed_prompt = _build_prompt(question, packed.text)
+
+        legacy_tokens.append(estimate_tokens(legacy_prompt))
+        packed_tokens.append(estimate_tokens(packed_prompt))
+
+        print(
+            f"{question[:55]:<55} {legacy_tokens[-1]:>7} {packed_tokens[-1]:>7} "
+            f"{len(packed.chunks):>3}/{packed.candidates:<3}"
+        )
+
+        if live:
+            legacy_latency.append(_time_completion(legacy_prompt, max_tokens))
+            packed_latency.append(_time_completion(packed_prompt, max_tokens))
+
+    total_legacy = sum(legacy_tokens)
+    total_packed = sum(packed_tokens)
+    print()
+    print(f"Token budget: {token_budget}")
+    print(f"Mean prompt tokens (approx.): legacy={statistics.mean(legacy_tokens):.0f} "
+          f"packed={statistics.mean(packed_tokens):.0f} "
+          f"({100 * (1 - total_packed / total_legacy):.1f}% smaller)")
+
+    if live:
+        print(f"Median LLM latency: legacy={statistics.median(legacy_latency):.2f}s "
+              f"packed={statistics.median(packed_latency):.2f}s")
+        print(f"Mean LLM latency:   legacy={statistics.mean(legacy_latency):.2f}s "
+              f"packed={statistics.mean(packed_latency):.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=int, default=CONTEXT_TOKEN_BUDGET)
+    parser.add_argument("--live", action="store_true", help="Time real chat completions.")
+    parser.add_argument("--max-tokens", type=int, default=256)
+    args = parser.parse_args()
+    run(args.budget, args.live, args.max_tokens)
@@ -0,0 +1,138 @@
+# backend/bench_hedging.py
+"""
+Measure generation tail latency with and without deadlines + hedging,
+against a fake slow LLM backend (no API calls).
+
+The fake backend draws latencies from a log-normal distribution and stalls
+for stall_factor x the median on a small fraction of calls, which is what
+drives p99 on real providers.
+
+Usage:
+    python -m backend.bench_hedging
+    python -m backend.bench_hedging --requests 400 --median 0.2 --stall-rate 0.05
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from backend.deadlines import DeadlineExceeded, LatencyTracker, hedged_call
+
+
+class FakeSlowLLM:
+    def __init__(self, median_s: float, sigma: float, stall_rate: float, stall_factor: float, seed: int):
+        self.median_s = median_s
+        self.sigma = sigma
+        self.stall_rate = stall_rate
+        self.stall_factor = stall_factor
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def __call__(self) -> str:
+        with self._lock:
+            self.calls += 1
+            delay = self.median_s * self._rng.lognormvariate(0.0, self.sigma)
+            if self._rng.random() < self.stall_rate:
+                delay *= self.stall_factor
+        time.sleep(delay)
+        return "answer"
+
+
+def _percentiles(samples: List[float]) -> str:
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    return (
+        f"p50={pct(0.50):.3f}s p95={pct(0.95):.3f}s p99={pct(0.99):.3f}s "
+        f"max={ordered[-1]:.3f}s mean={statistics.mean(ordered):.3f}s"
+    )
+
+
+def _run(label: str, n: int, concurrency: int, call) -> None:
+    latencies: List[float] = []
+    fallbacks = 0
+    lock = threading.Lock()
+
+    def one(_):
+        nonlocal fallbacks
+        start = time.perf_counter()
+        try:
+            call()
+        except DeadlineExceeded:
+            with lock:
+                fallbacks += 1
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(n)))
+
+    print(f"{label:<22} {_percentiles(latencies)}  fallbacks={fallbacks}/{n}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--median", type=float, default=0.1, help="Median fake LLM latency (s).")
+    parser.add_argument("--sigma", type=float, default=0.35)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--stall-factor", type=float, default=20.0)
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="Generation deadline (s); default 8x median.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    deadline = args.deadline or args.median * 8
+    # No scheduler bounds the attempts here, so give them a pool with room for
+    # every request, its hedge and any abandoned attempts
+    attempts = ThreadPoolExecutor(max_workers=4 * args.concurrency, thread_name_prefix="bench-attempt")
+
+    def make_backend() -> FakeSlowLLM:
+        return FakeSlowLLM(args.median, args.sigma, args.stall_rate, args.stall_factor, args.seed)
+
+    baseline = make_backend()
+    _run("baseline (no deadline)", args.requests, args.concurrency, baseline)
+
+    backend = make_backend()
+    _run(
+        "deadline only",
+        args.requests,
+        args.concurrency,
+        lambda: hedged_call("generation", backend, timeout_s=deadline, hedge_after_s=None, executor=attempts),
+    )
+
+    backend = make_backend()
+    tracker = LatencyTracker()
+    # Warm the tracker so the hedge delay reflects the backend's p95
+    for _ in range(tracker.min_samples):
+        start = time.perf_counter()
+        backend()
+        tracker.record(time.perf_counter() - start)
+    warmup_calls = backend.calls
+
+    def hedged():
+        return hedged_call(
+            "generation",
+            backend,
+            timeout_s=deadline,
+            hedge_after_s=tracker.percentile(0.95),
+            tracker=tracker,
+            executor=attempts,
+        )
+
+    _run("deadline + p95 hedge", args.requests, args.concurrency, hedged)
+    extra = backend.calls - warmup_calls - args.requests
+    print(f"\nHedged requests fired: {extra} ({100 * extra / args.requests:.1f}% extra backend calls)")
+    print(f"Deadline: {deadline:.2f}s, final hedge delay (p95): {tracker.percentile(0.95):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# backend/bench_http_pool.py
+"""
+Per-request latency of OpenAI calls over a shared keep-alive connection pool
+vs a new connection for every request, against a local mock server (no API
+key or network needed).
+
+The mock server answers /v1/embeddings and /v1/chat/completions with canned
+payloads. With --tls it serves HTTPS using a throwaway self-signed
+certificate (needs the openssl CLI), so the saved TLS handshakes show up in
+the numbers.
+
+Usage:
+    python -m backend.bench_http_pool
+    python -m backend.bench_http_pool --tls --requests 300
+    python -m backend.bench_http_pool --tls --endpoint chat --server-delay-ms 5
+"""
+
+import argparse
+import json
+import socket
+import ssl
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from backend.clients import new_openai_client
+
+_EMBEDDING = [0.0] * 1536
+
+
+class _MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive unless the client closes
+    server_delay_s = 0.0
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; without this, Nagle plus
+        # delayed ACKs add ~40ms to every response
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.server_delay_s:
+            time.sleep(self.server_delay_s)
+
+        if self.path.endswith("/embeddings"):
+            payload = {
+                "object": "list",
+                "model": body.get("model", "mock"),
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": _EMBEDDING}
+                    for i, _ in enumerate(body.get("input") or [""])
+                ],
+                "usage": {"prompt_tokens": 8, "total_tokens": 8},
+            }
+        else:
+            payload = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "Mock answer."},
+                }],
+                "usage": {"prompt_tokens": 20, "completion_tokens": 3, "total_tokens": 23},
+            }
+
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _self_signed_cert(directory: Path) -> tuple:
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", str(key), "-out", str(cert), "-days", "1",
+            "-subj", "/CN=localhost",
+            "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+def start_mock_server(tls_dir: Optional[Path], server_delay_s: float) -> tuple:
+    """
+    Returns (server, base_url, verify) with the server running in a thread.
+    """
+    handler = type("Handler", (_MockOpenAIHandler,), {"server_delay_s": server_delay_s})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+
+    scheme, verify = "http", True
+    if tls_dir is not None:
+        cert, key = _self_signed_cert(tls_dir)
+        server_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_ctx.load_cert_chain(cert, key)
+        server.socket = server_ctx.wrap_socket(server.socket, server_side=True)
+        scheme, verify = "https", ssl.create_default_context(cafile=str(cert))
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}/v1", verify
+
+
+def _call(client, endpoint: str, headers: Optional[Dict[str, str]] = None) -> None:
+    if endpoint == "embeddings":
+        client.embeddings.create(
+            model="text-embedding-3-small", input=["What is the FRS?"], extra_headers=headers
+        )
+    else:
+        client.chat.completions.create(
+            model="gpt-4.1-mini",
+            messages=[{"role": "user", "content": "What is the FRS?"}],
+            extra_headers=headers,
+        )
+
+
+def _measure(run_one: Callable[[], None], n: int) -> List[float]:
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        run_one()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _summary(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "mean": statistics.mean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+    }
+
+
+def run(n: int, tls: bool, endpoint: str, server_delay_ms: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        server, base_url, verify = start_mock_server(Path(tmp) if tls else None, server_delay_ms / 1000)
+        client = new_openai_client(base_url=base_url, verify=verify, api_key="mock")
+
+        try:
+            # Shared pool: connections kept alive between requests
+            _call(client, endpoint)  # warm-up opens the connection
+            before = server.connections
+            pooled_latency = _measure(lambda: _call(client, endpoint), n)
+            pooled_connections = server.connections - before
+
+            # No reuse: "Connection: close" forces a new TCP (and TLS) handshake
+            # per request, as separate short-lived clients would
+            before = server.connections
+            fresh_latency = _measure(lambda: _call(client, endpoint, {"Connection": "close"}), n)
+            fresh_connections = server.connections - before
+        finally:
+            client.close()
+            server.shutdown()
+
+    pooled_stats, fresh_stats = _summary(pooled_latency), _summary(fresh_latency)
+    print(f"{n} {endpoint} requests over {'HTTPS' if tls else 'HTTP'} to {base_url}")
+    print(f"{'':<16} {'mean':>9} {'p50':>9} {'p95':>9} {'connections':>12}")
+    for label, stats, conns in (
+        ("keep-alive pool", pooled_stats, pooled_connections),
+        ("new connection", fresh_stats, fresh_connections),
+    ):
+        print(f"{label:<16} {1e3 * stats['mean']:>7.2f}ms {1e3 * stats['p50']:>7.2f}ms "
+              f"{1e3 * stats['p95']:>7.2f}ms {conns:>12}")
+    saved = fresh_stats["p50"] - pooled_stats["p50"]
+    print(f"Saved per request (p50): {1e3 * saved:.2f}ms "
+          f"({100 * saved / fresh_stats['p50']:.0f}% of the new-connection latency)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--tls", action="store_true", help="Serve HTTPS with a self-signed certificate.")
+    parser.add_argument("--endpoint", choices=["embeddings", "chat"], default="embeddings")
+    parser.add_argument("--server-delay-ms", type=float, default=0.0,
+                        help="Simulated server processing time per request.")
+    args = parser.parse_args()
+    run(args.requests, args.tls, args.endpoint, args.server_delay_ms)
@@ -0,0 +1,316 @@
+# backend/bench_simulator.py
+"""
+Vectorised projection (project_savings_batch) vs the scalar project_savings
+loop, at 1, 1k and 1M profiles.
+
+Before timing, the batch engine is checked against the scalar loop on
+random profiles plus edge cases (return rate equal or nearly equal to the
+growth rate, zero years, zero contributions), for both final balances and
+year-by-year paths. The run aborts if any value differs by more than
+--rtol.
+
+The scalar loop is timed on at most --scalar-cap profiles and extrapolated
+beyond that. Then simulate_monte_carlo is timed at --mc-paths paths over
+40 years (memo bypassed), decumulate over 100k retirement balances,
+classification of 1M balances against their cohort's BRS / FRS / ERS
+(checked against classify_vs_retirement_sums), scenario_grid on a 20 x 20 x 10 x 10 grid (cells
+checked against project_savings), the goal-seek solvers on 100k profiles
+(answers checked by projecting them), a retirement-age slider sweep with and
+without the shared path prefixes, and the monthly account engine at --members
+members, after checking that members stepped together in chunks end up
+exactly where each would alone.
+
+Usage:
+    python -m backend.bench_simulator
+    python -m backend.bench_simulator --sizes 1 1000 1000000 --repeats 5
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from backend.config import BASIC_HEALTHCARE_SUM, CURRENT_YEAR_FRS
+from backend.simulator import (
+    MA,
+    RETIREMENT_SUM_LABELS,
+    RetirementInputs,
+    classify,
+    classify_vs_retirement_sums,
+    cohort_retirement_sums,
+    decumulate,
+    project_accounts,
+    project_accounts_batch,
+    project_savings,
+    project_savings_batch,
+    required_current_savings,
+    required_monthly_contribution,
+    required_retirement_age,
+    scenario_grid,
+    simulate_monte_carlo,
+    split_savings,
+)
+
+
+def random_profiles(n: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    current_age = rng.integers(20, 65, n)
+    return {
+        "current_age": current_age,
+        "retirement_age": current_age + rng.integers(0, 76 - current_age),
+        "current_savings": rng.uniform(0, 400_000, n).round(-2),
+        "monthly_contribution": rng.uniform(0, 2_500, n).round(),
+        "salary_growth_rate": rng.uniform(0.0, 0.05, n).round(3),
+        "assumed_return_rate": rng.uniform(0.01, 0.06, n).round(3),
+    }
+
+
+def edge_profiles() -> Dict[str, np.ndarray]:
+    r = np.array([0.04, 0.04, 0.04, 0.025, 0.0, 0.04, 0.04])
+    g = np.array([0.04, 0.04 + 1e-12, 0.04 - 1e-7, 0.05, 0.0, 0.02, 0.0])
+    return {
+        "current_age": np.array([35, 35, 20, 30, 40, 55, 64]),
+        "retirement_age": np.array([65, 65, 75, 70, 65, 55, 65]),
+        "current_savings": np.array([60_000, 0, 10_000, 5_000, 100_000, 250_000, 0.0]),
+        "monthly_contribution": np.array([900, 1_000, 300, 0, 500, 1_200, 1_500.0]),
+        "salary_growth_rate": g,
+        "assumed_return_rate": r,
+    }
+
+
+def _row(profiles: Dict[str, np.ndarray], i: int) -> RetirementInputs:
+    return RetirementInputs(
+        current_age=int(profiles["current_age"][i]),
+        retirement_age=int(profiles["retirement_age"][i]),
+        current_savings=float(profiles["current_savings"][i]),
+        monthly_contribution=float(profiles["monthly_contribution"][i]),
+        salary_growth_rate=float(profiles["salary_growth_rate"][i]),
+        assumed_return_rate=float(profiles["assumed_return_rate"][i]),
+    )
+
+
+def _scalar_path(inputs: RetirementInputs) -> List[float]:
+    return [
+        project_savings(RetirementInputs(
+            inputs.current_age, inputs.current_age + years, inputs.current_savings,
+            inputs.monthly_contribution, inputs.salary_growth_rate, inputs.assumed_return_rate,
+        ))
+        for years in range(inputs.retirement_age - inputs.current_age + 1)
+    ]
+
+
+def check_equivalence(profiles: Dict[str, np.ndarray], rtol: float) -> float:
+    """
+    Largest relative difference between the batch engine and the scalar loop.
+    """
+    batch = project_savings_batch(profiles, paths=True)
+    worst = 0.0
+    for i in range(len(profiles["current_age"])):
+        inputs = _row(profiles, i)
+        expected = np.array(_scalar_path(inputs))
+        got_path = batch.paths[i, : len(expected)]
+        got = np.append(got_path, batch.final_balance[i])
+        want = np.append(expected, expected[-1])
+        err = float(np.max(np.abs(got - want) / np.maximum(np.abs(want), 1.0)))
+        if err > rtol or not np.all(np.isnan(batch.paths[i, len(expected):])):
+            raise AssertionError(f"Profile {i} ({inputs}) differs: max relative error {err:.3g}")
+        worst = max(worst, err)
+    return worst
+
+
+def _time(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: List[int], repeats: int, scalar_cap: int, rtol: float) -> None:
+    worst = max(check_equivalence(edge_profiles(), rtol), check_equivalence(random_profiles(2_000, seed=1), rtol))
+    print(f"Equivalence: batch == scalar loop on 2,007 profiles (max relative error {worst:.2e})\n")
+
+    print(f"{'profiles':>10} {'scalar loop':>13} {'batch':>11} {'batch+paths':>12} {'speed-up':>9}")
+    for n in sizes:
+        profiles = random_profiles(n)
+        sample = min(n, scalar_cap)
+        rows = [_row(profiles, i) for i in range(sample)]
+        scalar = _time(lambda: [project_savings(p) for p in rows], repeats) * n / sample
+        batch = _time(lambda: project_savings_batch(profiles), repeats)
+        with_paths = _time(lambda: project_savings_batch(profiles, paths=True), repeats)
+        note = "*" if sample < n else " "
+        print(f"{n:>10,} {1e3 * scalar:>11.2f}ms{note} {1e3 * batch:>9.2f}ms {1e3 * with_paths:>10.2f}ms "
+              f"{scalar / batch:>8.1f}x")
+    if any(n > scalar_cap for n in sizes):
+        print(f"* extrapolated from {scalar_cap:,} profiles")
+
+
+def run_monte_carlo(n_paths: int, repeats: int) -> None:
+    inputs = RetirementInputs(25, 65, 20_000.0, 800.0, 0.02, 0.04)
+    seeds = iter(range(repeats))  # a new seed per repeat, so the memo never answers
+    elapsed = _time(lambda: simulate_monte_carlo(inputs, n_paths=n_paths, seed=next(seeds)), repeats)
+    result = simulate_monte_carlo(inputs, n_paths=n_paths, seed=0)
+    print(f"\nMonte Carlo: {n_paths:,} paths x 40 years in {1e3 * elapsed:.0f}ms "
+          f"(median final S${result.band(50.0)[-1]:,.0f}, deterministic S${project_savings(inputs):,.0f})")
+
+
+def run_decumulation(n: int, repeats: int) -> None:
+    balances = np.random.default_rng(6).uniform(50_000, 1_000_000, n)
+    retirement_ages = np.random.default_rng(7).integers(55, 71, n)
+    result = decumulate(balances, retirement_ages, 0.03, target_income=2_000.0, ra_target="FRS")
+    if np.any(result.premium > np.minimum(balances, CURRENT_YEAR_FRS)):
+        raise AssertionError("CPF LIFE premium exceeds the balance or the FRS")
+    elapsed = _time(lambda: decumulate(balances, retirement_ages, 0.03, target_income=2_000.0), repeats)
+    meets = ", ".join(f"{plan} {share:.0%}" for plan, share in zip(result.plans, result.meets_target.mean(axis=1)))
+    print(f"\nDecumulation: {n:,} balances x {len(result.plans)} CPF LIFE plans to age 95 in {1e3 * elapsed:.0f}ms "
+          f"(meet S$2,000/month: {meets})")
+
+
+def run_classify(n: int, repeats: int, scalar_cap: int) -> None:
+    profiles = random_profiles(n, seed=8)
+    balances = project_savings_batch(profiles).final_balance
+    sums = cohort_retirement_sums(profiles["current_age"])
+    sample = min(n, scalar_cap)
+    labels = [classify_vs_retirement_sums(balances[i], *sums[i])["label"] for i in range(sample)]
+    if [RETIREMENT_SUM_LABELS[code] for code in classify(balances[:sample], sums[:sample])] != labels:
+        raise AssertionError("Vectorised classification differs from classify_vs_retirement_sums")
+
+    scalar = _time(lambda: [classify_vs_retirement_sums(balances[i], *sums[i]) for i in range(sample)], repeats)
+    scalar *= n / sample
+    vectorised = _time(lambda: classify(balances, cohort_retirement_sums(profiles["current_age"])), repeats)
+    shares = np.bincount(classify(balances, sums), minlength=len(RETIREMENT_SUM_LABELS)) / n
+    print(f"\nClassification: {n:,} balances against their cohort's sums in {1e3 * vectorised:.0f}ms "
+          f"(scalar loop {1e3 * scalar:.0f}ms{'*' if sample < n else ''}, {scalar / vectorised:.0f}x; "
+          + ", ".join(f"{label} {share:.0%}" for label, share in zip(RETIREMENT_SUM_LABELS, shares)) + ")")
+
+
+def run_grid(repeats: int, rtol: float) -> None:
+    inputs = RetirementInputs(30, 65, 40_000.0, 700.0, 0.02, 0.04)
+    axes = (np.arange(55, 75), np.linspace(0.5, 2.0, 20), np.linspace(0.02, 0.05, 10), np.linspace(0.0, 0.045, 10))
+    grid = scenario_grid(inputs, *axes)
+    rng = np.random.default_rng(3)
+    for index in zip(*(rng.integers(0, len(axis), 200) for axis in axes)):
+        age, multiplier, r, g = (axis[i] for axis, i in zip(axes, index))
+        want = project_savings(RetirementInputs(
+            inputs.current_age, int(age), inputs.current_savings, inputs.monthly_contribution * multiplier, g, r,
+        ))
+        if abs(grid.projected_savings[index] - want) > rtol * abs(want):
+            raise AssertionError(f"Grid cell {index} differs from project_savings")
+
+    elapsed = _time(lambda: scenario_grid(inputs, *axes), repeats)
+    with_frame = _time(lambda: scenario_grid(inputs, *axes).to_frame(), repeats)
+    print(f"\nScenario grid: {grid.projected_savings.size:,} cells in {1e3 * elapsed:.2f}ms "
+          f"({1e3 * with_frame:.2f}ms as a tidy DataFrame; 200 cells == project_savings)")
+
+
+def run_goal_seek(n: int, repeats: int, rtol: float) -> None:
+    profiles = random_profiles(n, seed=4)
+    profiles["retirement_age"] = np.maximum(profiles["retirement_age"], profiles["current_age"] + 1)
+    target = np.random.default_rng(5).uniform(50_000, 1_500_000, n)
+
+    def final(**overrides) -> np.ndarray:
+        return project_savings_batch({**profiles, **overrides}).final_balance
+
+    contribution = required_monthly_contribution(profiles, target)
+    savings = required_current_savings(profiles, target)
+    age = required_retirement_age(profiles, target)
+    hit = contribution > 0
+    if not np.allclose(final(monthly_contribution=contribution)[hit], target[hit], rtol=rtol):
+        raise AssertionError("Required contribution does not reach the target")
+    hit = savings > 0
+    if not np.allclose(final(current_savings=savings)[hit], target[hit], rtol=rtol):
+        raise AssertionError("Required savings do not reach the target")
+    found = ~np.isnan(age)
+    at_age = final(retirement_age=np.where(found, age, profiles["current_age"]))
+    previous_age = np.where(found, np.maximum(age - 1, profiles["current_age"]), profiles["current_age"])
+    year_before = final(retirement_age=previous_age)
+    early = found & (age > profiles["current_age"])
+    if np.any(at_age[found] < target[found]) or np.any(year_before[early] >= target[early]):
+        raise AssertionError("Required retirement age is not the earliest that reaches the target")
+
+    elapsed = _time(lambda: (
+        required_monthly_contribution(profiles, target),
+        required_current_savings(profiles, target),
+        required_retirement_age(profiles, target),
+    ), repeats)
+    print(f"\nGoal seek: contribution, savings and retirement age for {n:,} profiles in {1e3 * elapsed:.1f}ms "
+          f"(answers projected back onto the target)")
+
+
+def run_path_sweep() -> None:
+    """
+    Moving the retirement-age slider from 50 to 70 a year at a time, on the
+    monthly account engine (the slowest one-member path).
+    """
+    savings = split_savings(30, 40_000.0)
+    ages = range(50, 71)
+
+    def from_scratch(retirement_age: int) -> np.ndarray:
+        return project_accounts_batch({
+            "current_age": [30], "retirement_age": [retirement_age], "monthly_contribution": [700.0],
+            "salary_growth_rate": [0.02], **{k: [v] for k, v in savings.items()},
+        }, yearly=True).yearly[:, :, 0]
+
+    start = time.perf_counter()
+    expected = [from_scratch(age) for age in ages]
+    scratch = time.perf_counter() - start
+
+    # A return rate no other run uses, so nothing is memoised yet
+    start = time.perf_counter()
+    shared = [project_accounts(RetirementInputs(30, age, 40_000.0, 700.0, 0.02, 0.0123)).balances for age in ages]
+    incremental = time.perf_counter() - start
+    if not all(np.array_equal(a, b) for a, b in zip(expected, shared)):
+        raise AssertionError("Shared-prefix account paths differ from fresh runs")
+    print(f"\nRetirement-age sweep 50..70 (account engine): {1e3 * scratch:.0f}ms from scratch, "
+          f"{1e3 * incremental:.0f}ms resuming shared prefixes (identical paths)")
+
+
+def random_members(n: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    profiles = random_profiles(n, seed)
+    rng = np.random.default_rng(seed + 1)
+    over_55 = profiles["current_age"] > 55
+    profiles.update({
+        "oa": rng.uniform(0, 150_000, n).round(),
+        "sa": np.where(over_55, 0.0, rng.uniform(0, 100_000, n).round()),
+        "ma": rng.uniform(0, 75_000, n).round(),
+        "ra": np.where(over_55, rng.uniform(0, 250_000, n).round(), 0.0),
+    })
+    return profiles
+
+
+def run_accounts(n_members: int, repeats: int) -> None:
+    members = random_members(n_members)
+    batch = project_accounts_batch(members, yearly=True, chunk_size=1_000)
+    for i in np.random.default_rng(2).choice(n_members, size=min(n_members, 50), replace=False):
+        alone = project_accounts_batch({k: v[i:i + 1] for k, v in members.items()}, yearly=True)
+        years = alone.yearly.shape[0]
+        if not (np.array_equal(alone.balances[:, 0], batch.balances[:, i])
+                and np.array_equal(alone.yearly[:, :, 0], batch.yearly[:years, :, i], equal_nan=True)):
+            raise AssertionError(f"Member {i} differs when stepped with others")
+    if batch.balances[MA].max() > BASIC_HEALTHCARE_SUM:
+        raise AssertionError("MediSave above the Basic Healthcare Sum")
+
+    elapsed = _time(lambda: project_accounts_batch(members), repeats)
+    print(f"\nAccount engine: {n_members:,} members, monthly steps to retirement, in {elapsed:.2f}s "
+          f"({1e6 * elapsed / n_members:.0f}us per member; lock-step == alone on 50 sampled members)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--scalar-cap", type=int, default=20_000, help="Max profiles timed with the scalar loop.")
+    parser.add_argument("--rtol", type=float, default=1e-9)
+    parser.add_argument("--mc-paths", type=int, default=100_000)
+    parser.add_argument("--members", type=int, default=100_000)
+    args = parser.parse_args()
+    run(args.sizes, args.repeats, args.scalar_cap, args.rtol)
+    run_monte_carlo(args.mc_paths, args.repeats)
+    run_decumulation(100_000, args.repeats)
+    run_classify(1_000_000, args.repeats, args.scalar_cap)
+    run_grid(args.repeats, args.rtol)
+    run_goal_seek(100_000, args.repeats, args.rtol)
+    run_path_sweep()
+    run_accounts(args.members, args.repeats)
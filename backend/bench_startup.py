@@ -0,0 +1,137 @@
+# backend/bench_startup.py
+"""
+Startup-time report for Home.py and each Streamlit page.
+
+For every page, the module-level imports are extracted (the page body itself
+needs a running Streamlit session) and executed in a fresh interpreter under
+`python -X importtime`. The report shows wall time, the cumulative import
+time of the page's direct imports, the heaviest modules, and whether CrewAI
+or the OpenAI SDK were loaded.
+
+Usage:
+    python -m backend.bench_startup
+    python -m backend.bench_startup --top 15 --repeats 5
+    python -m backend.bench_startup --forbid crewai pages/Use_Case_2_Retirement_Simulator.py
+"""
+
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_PACKAGES = ("crewai", "openai", "litellm", "streamlit", "pandas", "numpy")
+
+
+def default_pages() -> List[Path]:
+    return [ROOT / "Home.py"] + sorted((ROOT / "pages").glob("*.py"))
+
+
+def page_imports(path: Path) -> str:
+    """
+    Source of the module-level import statements of a page.
+    """
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in nodes) or "pass"
+
+
+def _run_importtime(code: str) -> Tuple[float, List[Tuple[int, int, str]]]:
+    """
+    Returns (wall seconds, [(self_us, cumulative_us, module), ...]).
+    """
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # One separator space, then two spaces of indentation per nesting level
+        rows.append((int(self_us), int(cumulative_us), name[1:].rstrip()))
+    return wall, rows
+
+
+def profile_page(path: Path, repeats: int, interpreter_modules: set) -> Dict:
+    code = page_imports(path)
+    walls = []
+    rows: List[Tuple[int, int, str]] = []
+    for _ in range(repeats):
+        wall, rows = _run_importtime(code)
+        walls.append(wall)
+
+    # Top-level entries (no leading indentation), minus what the bare
+    # interpreter imports at startup, are the page's direct imports
+    direct = [
+        (c, n) for _, c, n in rows if not n.startswith(" ") and n not in interpreter_modules
+    ]
+    loaded = {n.strip() for _, _, n in rows}
+    heavy = {pkg: pkg in loaded for pkg in HEAVY_PACKAGES}
+    heaviest = sorted(((s, n.strip()) for s, _, n in rows), reverse=True)
+
+    return {
+        "page": path.relative_to(ROOT).as_posix(),
+        "wall_s": statistics.median(walls),
+        "imports_s": sum(c for c, _ in direct) / 1e6,
+        "direct": sorted(direct, reverse=True),
+        "heaviest": heaviest,
+        "heavy": heavy,
+        "modules": len(rows),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", type=Path, help="Pages to profile (default: all).")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="Heaviest modules to list per page.")
+    parser.add_argument("--forbid", action="append", default=[],
+                        help="Fail if this package is imported by the profiled pages.")
+    args = parser.parse_args()
+
+    pages = [p.resolve() for p in args.pages] or default_pages()
+    baseline, baseline_rows = _run_importtime("pass")
+    interpreter_modules = {n.strip() for _, _, n in baseline_rows}
+    print(f"Interpreter baseline: {baseline:.3f}s\n")
+
+    violations = []
+    for path in pages:
+        report = profile_page(path, args.repeats, interpreter_modules)
+        loaded = ", ".join(pkg for pkg, hit in report["heavy"].items() if hit) or "none"
+        print(f"== {report['page']}")
+        print(f"   wall {report['wall_s']:.3f}s, imports {report['imports_s']:.3f}s, "
+              f"{report['modules']} modules; heavy packages loaded: {loaded}")
+        for cumulative, name in report["direct"]:
+            print(f"     {cumulative / 1e3:8.1f} ms  {name}")
+        print("   heaviest modules (self time):")
+        for self_us, name in report["heaviest"][: args.top]:
+            print(f"     {self_us / 1e3:8.1f} ms  {name}")
+        print()
+
+        for pkg in args.forbid:
+            if pkg in {n.strip() for _, n in report["heaviest"]}:
+                violations.append(f"{report['page']} imports {pkg}")
+
+    if violations:
+        print("FAILED:\n  " + "\n  ".join(violations))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,14 +6,12 @@ from pathlib import Path
 from typing import List, Dict
 
 import numpy as np
-from openai import OpenAI
 
-from backend.config import OPENAI_API_KEY, OPENAI_EMBEDDING_MODEL
-
-client = OpenAI(api_key=OPENAI_API_KEY)
+from backend.config import CORPUS_PATH
+from backend.providers import get_embedder
 
 RAW_DIR = Path("data/raw")
-OUT_PATH = Path("data/processed/cpf_corpus.jsonl")
+OUT_PATH = Path(CORPUS_PATH)
 
 
 def load_raw_documents() -> List[Dict]:
@@ -79,11 +77,7 @@ def chunk_text(text: str, max_chars: int = 800) -> List[str]:
 
 
 def embed_texts(texts: List[str]) -> List[List[float]]:
-    resp = client.embeddings.create(
-        model=OPENAI_EMBEDDING_MODEL,
-        input=texts,
-    )
-    return [item.embedding for item in resp.data]
+    return get_embedder().embed(texts).tolist()
 
 
 def build_corpus():
@@ -0,0 +1,153 @@
+# backend/clients.py
+
+import asyncio
+import logging
+import threading
+from typing import Optional
+
+from backend.config import (
+    require_openai_api_key,
+    OPENAI_BASE_URL,
+    HTTP_POOL_MAX_CONNECTIONS,
+    HTTP_POOL_MAX_KEEPALIVE,
+    HTTP_KEEPALIVE_EXPIRY_S,
+    HTTP_CONNECT_TIMEOUT_S,
+    HTTP_READ_TIMEOUT_S,
+    OPENAI_MAX_RETRIES,
+)
+
+# One keep-alive connection pool per process, shared by embedding, retrieval
+# and generation (including CrewAI agents), so TLS handshakes are paid once
+# per connection rather than once per client. Everything is created on first
+# use: importing this module does not load the OpenAI SDK.
+logger = logging.getLogger("cpf.clients")
+_lock = threading.Lock()
+_sync_client = None
+_async_client = None
+
+
+def http_limits():
+    import httpx
+
+    return httpx.Limits(
+        max_connections=HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_S,
+    )
+
+
+def http_timeout():
+    import httpx
+
+    return httpx.Timeout(HTTP_READ_TIMEOUT_S, connect=HTTP_CONNECT_TIMEOUT_S)
+
+
+def new_openai_client(base_url: Optional[str] = None, verify=True, api_key: Optional[str] = None):
+    """
+    A sync OpenAI client on its own pooled httpx transport. Use
+    get_openai_client() in application code; this is for tools that need a
+    separate pool (e.g. benchmarks against a local server).
+    """
+    import httpx
+    from openai import OpenAI
+
+    return OpenAI(
+        api_key=api_key or require_openai_api_key(),
+        base_url=base_url or OPENAI_BASE_URL,
+        max_retries=OPENAI_MAX_RETRIES,
+        timeout=http_timeout(),
+        http_client=httpx.Client(limits=http_limits(), timeout=http_timeout(), verify=verify),
+    )
+
+
+def new_async_openai_client(base_url: Optional[str] = None, verify=True, api_key: Optional[str] = None):
+    import httpx
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        api_key=api_key or require_openai_api_key(),
+        base_url=base_url or OPENAI_BASE_URL,
+        max_retries=OPENAI_MAX_RETRIES,
+        timeout=http_timeout(),
+        http_client=httpx.AsyncClient(limits=http_limits(), timeout=http_timeout(), verify=verify),
+    )
+
+
+def get_openai_client():
+    """
+    The process-wide sync OpenAI client (thread-safe; share it freely).
+    """
+    global _sync_client
+
+    with _lock:
+        if _sync_client is None:
+            _sync_client = new_openai_client()
+        return _sync_client
+
+
+def get_async_openai_client():
+    """
+    The process-wide async OpenAI client. Like any httpx.AsyncClient it must
+    only be used from one event loop.
+    """
+    global _async_client
+
+    with _lock:
+        if _async_client is None:
+            _async_client = new_async_openai_client()
+        return _async_client
+
+
+def crew_llm(model: str):
+    """
+    CrewAI LLM for `model` whose sync requests go through the shared pool.
+
+    Only the sync client is shared: an httpx.AsyncClient is bound to the
+    event loop it first runs on, and CrewAI and Streamlit script threads may
+    each run their own loop, so the LLM keeps its own async client.
+    """
+    from crewai import LLM
+
+    llm = LLM(
+        model=model,
+        api_key=require_openai_api_key(),
+        base_url=OPENAI_BASE_URL,
+        timeout=HTTP_READ_TIMEOUT_S,
+        max_retries=OPENAI_MAX_RETRIES,
+    )
+    # The native OpenAI provider (checked with crewai 1.15) builds its
+    # clients eagerly as private attributes; swap in ours. Other providers
+    # (e.g. the LiteLLM fallback) or renamed attributes keep their own.
+    if hasattr(llm, "_client"):
+        llm._client = get_openai_client()
+    else:
+        logger.warning(
+            "CrewAI %s for %s has no _client; it will not use the shared connection pool",
+            type(llm).__name__, model,
+        )
+    return llm
+
+
+def close_clients() -> None:
+    """
+    Close the shared sync and async clients (e.g. at the end of a batch job).
+    Called from inside a running event loop, the async client is closed on
+    that loop in the background.
+    """
+    global _sync_client, _async_client
+
+    with _lock:
+        sync_client, _sync_client = _sync_client, None
+        async_client, _async_client = _async_client, None
+
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None:
+        try:
+            asyncio.get_running_loop().create_task(async_client.close())
+        except RuntimeError:
+            try:
+                asyncio.run(async_client.close())
+            except Exception:
+                # Its connections may belong to a loop that has since closed
+                logger.warning("Could not close the async OpenAI client cleanly", exc_info=True)
@@ -10,13 +10,169 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
 OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+# Cheaper/faster tier for simple definitional questions (see backend/router.py)
+OPENAI_MODEL_FAST = os.getenv("OPENAI_MODEL_FAST", "gpt-4.1-nano")
 
-if not OPENAI_API_KEY:
-    raise RuntimeError("OPENAI_API_KEY is not set. Please add it to your .env file.")
+
+def require_openai_api_key() -> str:
+    """
+    Return the API key, failing only when something actually needs OpenAI
+    (so pages and offline tools can import the backend without a key).
+    """
+    if not OPENAI_API_KEY:
+        raise RuntimeError("OPENAI_API_KEY is not set. Please add it to your .env file.")
+    return OPENAI_API_KEY
+
+# --- Provider backends ("openai", or local stand-ins for offline runs) ---
+# "local" = deterministic hashed n-gram embedder (see backend/providers.py)
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai")
+# "fake" = simulated chat model with configurable latency and failures
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+LOCAL_EMBEDDING_DIM = int(os.getenv("LOCAL_EMBEDDING_DIM", "512"))
+# Simulated per-call embedding latency for the local embedder (seconds)
+LOCAL_EMBED_LATENCY_S = float(os.getenv("LOCAL_EMBED_LATENCY_S", "0"))
+FAKE_LLM_LATENCY_S = float(os.getenv("FAKE_LLM_LATENCY_S", "0.8"))  # time to first token
+FAKE_LLM_TOKENS_PER_S = float(os.getenv("FAKE_LLM_TOKENS_PER_S", "60"))
+FAKE_LLM_OUTPUT_TOKENS = int(os.getenv("FAKE_LLM_OUTPUT_TOKENS", "350"))
+FAKE_LLM_FAILURE_RATE = float(os.getenv("FAKE_LLM_FAILURE_RATE", "0"))
+FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "0"))
+
+# Embeddings from different providers are not comparable, so each has its own corpus file
+CORPUS_PATH = os.getenv(
+    "CORPUS_PATH",
+    "data/processed/cpf_corpus_local.jsonl" if EMBEDDING_PROVIDER == "local"
+    else "data/processed/cpf_corpus.jsonl",
+)
+
+# --- Shared HTTP connection pool for OpenAI traffic (see backend/clients.py) ---
+# Optional override, e.g. a local mock server for benchmarks
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "20"))
+HTTP_POOL_MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "10"))
+# Idle keep-alive connections are closed after this many seconds
+HTTP_KEEPALIVE_EXPIRY_S = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_S", "60"))
+HTTP_CONNECT_TIMEOUT_S = float(os.getenv("HTTP_CONNECT_TIMEOUT_S", "5"))
+HTTP_READ_TIMEOUT_S = float(os.getenv("HTTP_READ_TIMEOUT_S", "60"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+# --- RAG context packing ---
+# Approximate token budget for the retrieved policy context in each prompt;
+# 0 disables packing (every retrieved chunk verbatim).
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "900"))
+# Max candidate chunks considered before the similarity-gap cutoff.
+CONTEXT_MAX_CHUNKS = int(os.getenv("CONTEXT_MAX_CHUNKS", "8"))
+
+# --- LLM concurrency scheduler ---
+# Max simultaneous crew.kickoff() calls per server process.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+# Longest a request may wait in the queue before degrading (seconds).
+LLM_QUEUE_MAX_WAIT_S = float(os.getenv("LLM_QUEUE_MAX_WAIT_S", "30"))
+# Requests beyond this many queued are turned away immediately.
+LLM_QUEUE_MAX_SIZE = int(os.getenv("LLM_QUEUE_MAX_SIZE", "50"))
+
+# --- Per-stage deadlines and hedging (seconds) ---
+EMBED_TIMEOUT_S = float(os.getenv("EMBED_TIMEOUT_S", "5"))
+RETRIEVAL_TIMEOUT_S = float(os.getenv("RETRIEVAL_TIMEOUT_S", "8"))
+GENERATION_TIMEOUT_S = float(os.getenv("GENERATION_TIMEOUT_S", "45"))
+# A hedged second LLM request fires once a call runs longer than the recent p95
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "1") == "1"
+HEDGE_MIN_DELAY_S = float(os.getenv("HEDGE_MIN_DELAY_S", "3"))
+# Used until enough latency samples exist to compute a p95
+HEDGE_DEFAULT_DELAY_S = float(os.getenv("HEDGE_DEFAULT_DELAY_S", "20"))
+
+# --- Pre-generated FAQ answers (see backend/faq_batch.py) ---
+FAQ_ENABLED = os.getenv("FAQ_ENABLED", "1") == "1"
+FAQ_STORE_PATH = os.getenv("FAQ_STORE_PATH", "data/processed/faq_answers.jsonl")
+# Min content-word Jaccard similarity for a near match to be served
+FAQ_NEAR_MATCH_THRESHOLD = float(os.getenv("FAQ_NEAR_MATCH_THRESHOLD", "0.8"))
+# Looser match accepted once a spending budget is exhausted (see backend/usage.py)
+FAQ_BUDGET_MATCH_THRESHOLD = float(os.getenv("FAQ_BUDGET_MATCH_THRESHOLD", "0.5"))
+
+# --- Question router (topic filter + model tier) ---
+ROUTER_ENABLED = os.getenv("ROUTER_ENABLED", "1") == "1"
+# Send questions classed as simple to OPENAI_MODEL_FAST. Off until the
+# complexity rules score well on the held-out set (python -m backend.eval_router);
+# while off every question goes to OPENAI_MODEL.
+ROUTER_MODEL_TIERING = os.getenv("ROUTER_MODEL_TIERING", "0") == "1"
+
+# --- Per-stage tracing (see backend/tracing.py) ---
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0") == "1"
+# Comma-separated sinks: "memory" (aggregates + debug panel), "log", "jsonl"
+TRACING_SINKS = os.getenv("TRACING_SINKS", "memory")
+TRACING_JSONL_PATH = os.getenv("TRACING_JSONL_PATH", "data/traces/spans.jsonl")
+
+# --- Token usage, cost and budgets (see backend/usage.py) ---
+# USD per 1M tokens (input, output). Unlisted models are costed as OPENAI_MODEL.
+MODEL_PRICES_PER_1M = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+}
+# Spend limits in USD (0 = unlimited, the default). Past a limit, answers are
+# downgraded to FAQ or extractive ones instead of calling the LLM. Tracked per
+# process. Opt in explicitly, e.g. BUDGET_SESSION_USD=0.10 BUDGET_DAILY_USD=10.
+BUDGET_SESSION_USD = float(os.getenv("BUDGET_SESSION_USD", "0"))
+BUDGET_DAILY_USD = float(os.getenv("BUDGET_DAILY_USD", "0"))
+# Optional JSONL log of every metered call (read by backend/cost_report.py)
+USAGE_LOG_PATH = os.getenv("USAGE_LOG_PATH", "")
+
+# --- Request recording for replay (see backend/recorder.py, backend/replay.py) ---
+# Opt-in: appends one JSONL line per policy question / simulation request
+RECORDING_ENABLED = os.getenv("RECORDING_ENABLED", "0") == "1"
+RECORDING_PATH = os.getenv("RECORDING_PATH", "data/recordings/requests.jsonl")
+# Fraction of requests recorded (1.0 = all)
+RECORDING_SAMPLE_RATE = float(os.getenv("RECORDING_SAMPLE_RATE", "1.0"))
+
+# --- Metrics (see backend/metrics.py) ---
+# When off, every metric is a shared no-op object and no server is started
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# Prometheus text endpoint (http://HOST:PORT/metrics); 0 = do not serve
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# --- Retirement simulator (see backend/simulator.py) ---
+# Year-by-year projections memoised per process, shared across sessions
+SIMULATOR_CACHE_SIZE = int(os.getenv("SIMULATOR_CACHE_SIZE", "1024"))
+# Monte Carlo mode: paths per run, paths drawn per chunk (caps working memory),
+# and the yearly standard deviation of the return and contribution growth rates
+SIMULATOR_MC_PATHS = int(os.getenv("SIMULATOR_MC_PATHS", "20000"))
+SIMULATOR_MC_CHUNK = int(os.getenv("SIMULATOR_MC_CHUNK", "25000"))
+SIMULATOR_RETURN_VOLATILITY = float(os.getenv("SIMULATOR_RETURN_VOLATILITY", "0.01"))
+SIMULATOR_GROWTH_VOLATILITY = float(os.getenv("SIMULATOR_GROWTH_VOLATILITY", "0.02"))
+# Members stepped together by the monthly account engine (sized for CPU cache)
+SIMULATOR_ACCOUNTS_CHUNK = int(os.getenv("SIMULATOR_ACCOUNTS_CHUNK", "8192"))
 
 # --- Retirement sums (example; update to current official values) ---
+# The sums for members turning 55 this year (the CURRENT_YEAR_LABEL row of RETIREMENT_SUMS_PATH)
 CURRENT_YEAR_BRS = 106_500.0
 CURRENT_YEAR_FRS = 213_000.0
 CURRENT_YEAR_ERS = 426_000.0
 CURRENT_YEAR_LABEL = "2025"  # update as needed
+# BRS / FRS / ERS by the year a cohort turns 55; years past the end of the
+# table are extrapolated at RETIREMENT_SUM_GROWTH a year
+RETIREMENT_SUMS_PATH = os.getenv("RETIREMENT_SUMS_PATH", "data/retirement_sums.csv")
+RETIREMENT_SUM_GROWTH = float(os.getenv("RETIREMENT_SUM_GROWTH", "0.035"))
+
+# --- CPF account rules for the monthly OA/SA/MA/RA engine (example; update to current official values) ---
+CPF_OA_INTEREST_RATE = 0.025
+CPF_SMRA_INTEREST_RATE = 0.04  # SA, MA and RA floor rate
+# Extra interest counts at most this much of the OA
+CPF_EXTRA_INTEREST_OA_CAP = 20_000.0
+# MediSave savings above the Basic Healthcare Sum overflow to SA (RA from 55)
+BASIC_HEALTHCARE_SUM = 75_500.0
+# Retirement sum the RA is set aside against at 55: "BRS", "FRS" or "ERS"
+RA_FORMATION_TARGET = os.getenv("RA_FORMATION_TARGET", "FRS")
+# CPF LIFE plans (rough figures): S$ per month from 65 for each S$1,000 of
+# premium, and the yearly increase in payouts
+CPF_LIFE_PLANS = {
+    "Standard": (7.8, 0.0),
+    "Basic": (7.1, 0.0),
+    "Escalating": (6.2, 0.02),
+}
+# Payouts rise by about this much for each year they start after 65 (up to 70)
+CPF_LIFE_DEFERRAL_BONUS = 0.07
+# The retirement phase is simulated up to this age
+DECUMULATION_END_AGE = int(os.getenv("DECUMULATION_END_AGE", "95"))
 
@@ -0,0 +1,242 @@
+# backend/context_packer.py
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional
+
+import numpy as np
+
+# Rough English heuristic (~4 characters per token); good enough for budgeting
+# without pulling in a tokenizer dependency.
+CHARS_PER_TOKEN = 4
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_HEADING_RE = re.compile(r"^#{1,6}\s")
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for",
+    "from", "how", "i", "if", "in", "is", "it", "my", "of", "on", "or", "so",
+    "that", "the", "this", "to", "what", "when", "where", "which", "who", "why",
+    "will", "with", "you", "your", "cpf",
+}
+
+
+@dataclass
+class PackedContext:
+    text: str
+    chunks: List[Dict]
+    tokens_used: int
+    token_budget: int
+    candidates: int = 0
+    dropped_duplicates: List[str] = field(default_factory=list)
+    trimmed: List[str] = field(default_factory=list)
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def _terms(text: str) -> set:
+    return {w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS}
+
+
+def format_chunk(chunk: Dict, text: Optional[str] = None) -> str:
+    title = chunk.get("title", "Untitled section")
+    topic = chunk.get("topic", "general")
+    body = (text if text is not None else chunk.get("text", "") or "").strip()
+    return f"[{title} | topic: {topic}]\n{body}"
+
+
+def select_by_score_gap(
+    chunks: List[Dict],
+    max_gap: float = 0.06,
+    min_relative_score: float = 0.8,
+    min_k: int = 1,
+) -> List[Dict]:
+    """
+    Adaptive k: walk chunks in descending score order and stop at the first
+    large drop between neighbours, or once a chunk falls well below the top hit.
+    Chunks without a 'score' are kept as-is (no cutoff can be computed).
+    """
+    if not chunks or any("score" not in ch for ch in chunks):
+        return list(chunks)
+
+    ranked = sorted(chunks, key=lambda ch: ch["score"], reverse=True)
+    top = ranked[0]["score"]
+    selected = [ranked[0]]
+
+    for prev, ch in zip(ranked, ranked[1:]):
+        if len(selected) >= min_k:
+            if prev["score"] - ch["score"] > max_gap:
+                break
+            if top > 0 and ch["score"] < top * min_relative_score:
+                break
+        selected.append(ch)
+
+    return selected
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    denom = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / denom) if denom > 0 else 0.0
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def drop_near_duplicates(
+    chunks: List[Dict],
+    threshold: float = 0.95,
+) -> tuple:
+    """
+    Remove chunks that are near-duplicates of a higher-ranked chunk.
+    Uses embedding cosine similarity when available, else word Jaccard.
+    Returns (kept_chunks, dropped_chunk_ids).
+    """
+    kept: List[Dict] = []
+    kept_vecs: List[Optional[np.ndarray]] = []
+    kept_terms: List[set] = []
+    dropped: List[str] = []
+
+    for ch in chunks:
+        emb = ch.get("embedding")
+        vec = np.asarray(emb, dtype="float32") if emb is not None else None
+        terms = _terms(ch.get("text", "") or "")
+
+        is_dup = False
+        for other_vec, other_terms in zip(kept_vecs, kept_terms):
+            if vec is not None and other_vec is not None:
+                sim = _cosine(vec, other_vec)
+            else:
+                sim = _jaccard(terms, other_terms)
+            if sim >= threshold:
+                is_dup = True
+                break
+
+        if is_dup:
+            dropped.append(ch.get("chunk_id", ch.get("title", "?")))
+            continue
+
+        kept.append(ch)
+        kept_vecs.append(vec)
+        kept_terms.append(terms)
+
+    return kept, dropped
+
+
+def _split_sections(text: str) -> List[str]:
+    """
+    Split a chunk into Markdown sections (heading + body). Falls back to
+    paragraphs when the chunk has no headings.
+    """
+    sections: List[str] = []
+    current: List[str] = []
+
+    for line in text.splitlines():
+        if _HEADING_RE.match(line) and current:
+            sections.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    if current:
+        sections.append("\n".join(current).strip())
+
+    sections = [s for s in sections if s]
+    if len(sections) <= 1:
+        sections = [p.strip() for p in text.split("\n\n") if p.strip()]
+    return sections
+
+
+def trim_to_relevant_sections(text: str, query: str, max_tokens: int) -> str:
+    """
+    Keep the sections of a chunk that share the most terms with the query,
+    in their original order, until max_tokens is reached. The best section
+    is always kept (hard-truncated if it alone exceeds the budget).
+    """
+    text = (text or "").strip()
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    sections = _split_sections(text)
+    query_terms = _terms(query)
+
+    def overlap(section: str) -> float:
+        terms = _terms(section)
+        if not terms:
+            return 0.0
+        return len(terms & query_terms) / math.sqrt(len(terms))
+
+    order = sorted(range(len(sections)), key=lambda i: overlap(sections[i]), reverse=True)
+
+    # The best section goes in first, cut to the budget if it is too long on
+    # its own; the remaining room is filled greedily in relevance order
+    kept = {order[0]: sections[order[0]]}
+    if estimate_tokens(kept[order[0]]) > max_tokens:
+        kept[order[0]] = kept[order[0]][: max_tokens * CHARS_PER_TOKEN - 2].rstrip() + " …"
+    used = estimate_tokens(kept[order[0]])
+    for i in order[1:]:
+        cost = estimate_tokens(sections[i])
+        if used + cost > max_tokens:
+            continue
+        kept[i] = sections[i]
+        used += cost
+
+    return "\n\n".join(kept[i] for i in sorted(kept))
+
+
+def pack_context(
+    chunks: List[Dict],
+    query: str,
+    token_budget: int,
+    max_gap: float = 0.06,
+    min_relative_score: float = 0.8,
+    dedup_threshold: float = 0.95,
+    min_section_tokens: int = 40,
+) -> PackedContext:
+    """
+    Build a policy context block that fits within token_budget:
+    1) adaptive k via a similarity-gap cutoff,
+    2) near-duplicate removal,
+    3) per-chunk trimming to the sections most relevant to the query.
+    """
+    candidates = len(chunks)
+    selected = select_by_score_gap(chunks, max_gap=max_gap, min_relative_score=min_relative_score)
+    selected, dropped = drop_near_duplicates(selected, threshold=dedup_threshold)
+
+    separator_tokens = estimate_tokens("\n\n---\n\n")
+    parts: List[str] = []
+    packed: List[Dict] = []
+    trimmed: List[str] = []
+    used = 0
+
+    for ch in selected:
+        header_tokens = estimate_tokens(format_chunk(ch, text=""))
+        overhead = header_tokens + (separator_tokens if parts else 0)
+        remaining = token_budget - used - overhead
+        if remaining < min_section_tokens:
+            break
+
+        original = (ch.get("text", "") or "").strip()
+        text = trim_to_relevant_sections(original, query, remaining)
+        if text != original:
+            trimmed.append(ch.get("chunk_id", ch.get("title", "?")))
+
+        block = format_chunk(ch, text=text)
+        parts.append(block)
+        packed.append(ch)
+        used += overhead + estimate_tokens(text)
+
+    return PackedContext(
+        text="\n\n---\n\n".join(parts),
+        chunks=packed,
+        tokens_used=used,
+        token_budget=token_budget,
+        candidates=candidates,
+        dropped_duplicates=dropped,
+        trimmed=trimmed,
+    )
@@ -0,0 +1,210 @@
+# backend/cost_report.py
+"""
+Token usage and cost per answer.
+
+--log summarises a usage log (USAGE_LOG_PATH) by day, use case and model,
+plus spend per session.
+
+Without --log, the same question workload is answered under several
+configurations, each in a fresh process, and cost per answer is compared:
+
+- no caching, no packing: FAQ store off, the top 6 chunks verbatim in every prompt
+- context packing:        FAQ store off, context packed to CONTEXT_TOKEN_BUDGET
+- FAQ + context packing:  plus the FAQ store pre-generated for data/faq/questions.jsonl
+
+Questions are drawn from --questions with a Zipf-like popularity skew (so
+popular ones repeat, as in production), plus --simulations simulator
+explanations. By default this runs offline (local embedder, fake LLM
+metered as the real model with estimated token counts), so it costs nothing;
+--real uses OpenAI and spends real money. The one-off cost of pre-generating
+the FAQ store is reported separately.
+
+Usage:
+    python -m backend.cost_report
+    python -m backend.cost_report --answers 200 --simulations 20
+    python -m backend.cost_report --log data/usage/usage.jsonl
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from backend.load_test import DEFAULT_QUESTIONS, load_questions
+
+DEFAULT_FAQ_QUESTIONS = Path("data/faq/questions.jsonl")
+
+# name -> environment overrides
+VARIANTS = {
+    "no caching, no packing": {"FAQ_ENABLED": "0", "CONTEXT_TOKEN_BUDGET": "0", "CONTEXT_MAX_CHUNKS": "6"},
+    "context packing": {"FAQ_ENABLED": "0"},
+    "FAQ + context packing": {"FAQ_ENABLED": "1"},
+}
+
+# Offline: no simulated waiting, budgets off so nothing is downgraded
+_WORKER_ENV = {"FAKE_LLM_LATENCY_S": "0", "FAKE_LLM_TOKENS_PER_S": "1e9", "FAKE_LLM_FAILURE_RATE": "0",
+               "BUDGET_SESSION_USD": "0", "BUDGET_DAILY_USD": "0", "RECORDING_ENABLED": "0",
+               "METRICS_PORT": "0"}
+
+
+def summarise_log(path: Path) -> None:
+    by_key: Dict[tuple, List[float]] = {}
+    by_session: Dict[str, float] = {}
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            row = by_key.setdefault((rec["day"], rec["use_case"], rec["model"]), [0, 0, 0, 0.0])
+            row[0] += 1
+            row[1] += rec["prompt_tokens"]
+            row[2] += rec["completion_tokens"]
+            row[3] += rec["cost_usd"]
+            by_session[rec["session"]] = by_session.get(rec["session"], 0.0) + rec["cost_usd"]
+
+    print(f"{'day':<11} {'use case':<11} {'model':<24} {'calls':>6} {'prompt':>9} {'completion':>11} {'cost':>9}")
+    for (day, use_case, model), (calls, prompt, completion, cost) in sorted(by_key.items()):
+        print(f"{day:<11} {use_case:<11} {model:<24} {calls:>6} {prompt:>9} {completion:>11} ${cost:>8.4f}")
+    total = sum(r[3] for r in by_key.values())
+    print(f"Total ${total:.4f}")
+
+    sessions = sorted(v for k, v in by_session.items() if k != "anonymous")
+    if sessions:
+        print(f"\n{len(sessions)} sessions: mean ${sum(sessions) / len(sessions):.4f}, "
+              f"p95 ${sessions[min(len(sessions) - 1, int(0.95 * len(sessions)))]:.4f}, max ${sessions[-1]:.4f}")
+
+
+def run_workload(args) -> Dict:
+    """
+    Worker mode: answer the workload in this process and return usage totals.
+    """
+    import random
+
+    from backend.rag import answer_policy_question, explain_simulation_results
+    from backend.simulator import (
+        PRESETS,
+        RetirementInputs,
+        build_scenarios,
+        classify_vs_retirement_sums,
+        cohort_retirement_sums,
+    )
+    from backend.usage import ledger
+
+    rng = random.Random(args.seed)
+    questions, weights = load_questions(args.questions, args.question_skew)
+    faq_served = 0
+    for _ in range(args.answers):
+        item = rng.choices(questions, weights=weights)[0]
+        profile = {"Age band": item.get("age_band", "Prefer not to say"),
+                   "Income band": item.get("income_band", "Prefer not to say")}
+        before = sum(t["calls"] for t in ledger.totals().values())
+        answer_policy_question(item["question"], profile)
+        # An answer that made no metered call came from the FAQ store
+        faq_served += sum(t["calls"] for t in ledger.totals().values()) == before
+
+    for i in range(args.simulations):
+        preset = PRESETS[list(PRESETS)[i % len(PRESETS)]]
+        inputs = RetirementInputs(
+            current_age=int(preset["current_age"]),
+            retirement_age=int(preset["retirement_age"]),
+            current_savings=preset["current_savings"],
+            monthly_contribution=preset["monthly_contribution"],
+            salary_growth_rate=preset["salary_growth_rate_pct"] / 100,
+            assumed_return_rate=preset["assumed_return_rate_pct"] / 100,
+        )
+        base = build_scenarios(inputs)[0]
+        classification = classify_vs_retirement_sums(
+            base.projected_savings, *cohort_retirement_sums(inputs.current_age).tolist()
+        )
+        user_inputs = {**{k: v for k, v in preset.items() if k != "target_income"},
+                       "target_retirement_income": preset["target_income"]}
+        scenarios = [{"Scenario": "Base scenario", "Retirement age": base.retirement_age,
+                      "Projected savings (S$)": base.projected_savings, "Notes": classification["label"]}]
+        explain_simulation_results(user_inputs, scenarios, classification)
+
+    out: Dict[str, Dict] = {"faq_served": faq_served}
+    for (_, use_case, model), t in ledger.totals().items():
+        row = out.setdefault(use_case, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0})
+        for key in row:
+            row[key] += t[key]
+    return out
+
+
+def _worker(args, env: Dict[str, str]) -> Dict:
+    cmd = [sys.executable, "-m", "backend.cost_report", "--worker",
+           "--answers", str(args.answers), "--simulations", str(args.simulations),
+           "--questions", str(args.questions), "--question-skew", str(args.question_skew),
+           "--seed", str(args.seed)]
+    proc = subprocess.run(cmd, env={**os.environ, **env}, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr[-2000:])
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _build_faq_store(path: Path, env: Dict[str, str]) -> Dict:
+    """
+    Pre-generate the FAQ store into path; returns the batch's own usage.
+    """
+    env = {**os.environ, **env, "FAQ_STORE_PATH": str(path), "USAGE_LOG_PATH": str(path) + ".usage"}
+    subprocess.run([sys.executable, "-m", "backend.faq_batch", "--input", str(DEFAULT_FAQ_QUESTIONS)],
+                   env=env, capture_output=True, check=True)
+    cost = 0.0
+    usage_log = Path(env["USAGE_LOG_PATH"])
+    if usage_log.exists():
+        with usage_log.open("r", encoding="utf-8") as f:
+            cost = sum(json.loads(line)["cost_usd"] for line in f if line.strip())
+    return {"cost_usd": cost}
+
+
+def compare_variants(args) -> None:
+    env = dict(_WORKER_ENV)
+    if not args.real:
+        env.update({"EMBEDDING_PROVIDER": "local", "LLM_PROVIDER": "fake"})
+
+    with tempfile.TemporaryDirectory(prefix="cost-report-") as tmp:
+        env["FAQ_STORE_PATH"] = str(Path(tmp) / "faq_answers.jsonl")
+        faq = _build_faq_store(Path(env["FAQ_STORE_PATH"]), env)
+
+        answers = args.answers + args.simulations
+        print(f"{answers} answers ({args.answers} policy, {args.simulations} simulation), "
+              f"{'OpenAI' if args.real else 'offline, estimated tokens'}")
+        print(f"{'configuration':<31} {'FAQ hits':>8} {'API calls':>9} {'prompt/ans':>10} "
+              f"{'compl/ans':>9} {'$/1k answers':>12} {'vs first':>9}")
+        first = None
+        for name, overrides in VARIANTS.items():
+            result = _worker(args, {**env, **overrides})
+            totals = [v for k, v in result.items() if k != "faq_served"]
+            cost = sum(t["cost_usd"] for t in totals)
+            prompt = sum(t["prompt_tokens"] for t in totals)
+            completion = sum(t["completion_tokens"] for t in totals)
+            api_calls = sum(t["calls"] for t in totals)
+            first = first if first is not None else cost
+            print(f"{name:<31} {result['faq_served']:>8} {api_calls:>9} {prompt / answers:>10.0f} "
+                  f"{completion / answers:>9.0f} {1e3 * cost / answers:>12.3f} {100 * (cost / first - 1):>+8.1f}%")
+
+    print(f"\nAPI calls count embeddings and completions. "
+          f"Pre-generating the FAQ store cost ${faq['cost_usd']:.4f} once.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", type=Path, help="Summarise a usage log instead of running the workload.")
+    parser.add_argument("--answers", type=int, default=100, help="Policy questions per configuration.")
+    parser.add_argument("--simulations", type=int, default=10, help="Simulation explanations per configuration.")
+    parser.add_argument("--questions", type=Path, default=DEFAULT_QUESTIONS)
+    parser.add_argument("--question-skew", type=float, default=1.0, help="Zipf exponent of question popularity.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--real", action="store_true", help="Use OpenAI (spends real money).")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.log:
+        summarise_log(args.log)
+    elif args.worker:
+        print(json.dumps(run_workload(args)))
+    else:
+        compare_variants(args)
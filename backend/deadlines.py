@@ -0,0 +1,146 @@
+# backend/deadlines.py
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeout,
+    wait,
+)
+from typing import Any, Callable, List, Optional
+
+from backend.config import LLM_MAX_CONCURRENCY
+
+# Worker threads for deadline-bounded calls. Work that misses its deadline
+# keeps running in the background (Python threads cannot be cancelled); its
+# result is simply discarded.
+#
+# Generation attempts get a pool of their own, so abandoned or hedged LLM calls
+# that are still waiting on the provider can never hold up retrieval. Every
+# attempt holds an LLM scheduler slot while it runs, so LLM_MAX_CONCURRENCY
+# threads are enough; the spare ones are headroom.
+_retrieval_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="deadline-retrieval")
+_generation_executor = ThreadPoolExecutor(
+    max_workers=LLM_MAX_CONCURRENCY + 2, thread_name_prefix="deadline-generation"
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a stage does not finish within its deadline.
+    """
+
+    def __init__(self, stage: str, timeout_s: float):
+        super().__init__(f"{stage} did not finish within {timeout_s:.1f}s")
+        self.stage = stage
+        self.timeout_s = timeout_s
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent latencies, used to derive the hedge delay.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        p in [0, 1]. None until min_samples observations have been recorded.
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def submit(fn: Callable[..., Any], *args, executor: Optional[ThreadPoolExecutor] = None, **kwargs) -> Future:
+    """
+    Run fn on a worker pool (the retrieval pool unless given), carrying over
+    the caller's contextvars.
+    """
+    ctx = contextvars.copy_context()
+    return (executor or _retrieval_executor).submit(ctx.run, fn, *args, **kwargs)
+
+
+def run_with_deadline(stage: str, timeout_s: float, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Call fn and return its result, or raise DeadlineExceeded after timeout_s.
+    """
+    future = submit(fn, *args, **kwargs)
+    try:
+        return future.result(timeout=timeout_s)
+    except FutureTimeout:
+        raise DeadlineExceeded(stage, timeout_s) from None
+
+
+def hedged_call(
+    stage: str,
+    fn: Callable[[], Any],
+    timeout_s: float,
+    hedge_after_s: Optional[float],
+    start_hedge: Optional[Callable[[], bool]] = None,
+    tracker: Optional[LatencyTracker] = None,
+    executor: Optional[ThreadPoolExecutor] = None,
+) -> Any:
+    """
+    Run fn; if it has not finished after hedge_after_s, fire a second identical
+    call and return whichever finishes first. Raises DeadlineExceeded if no
+    attempt succeeds within timeout_s, or re-raises the last error if every
+    attempt failed before then.
+
+    start_hedge() is consulted before launching the hedge and may veto it
+    (e.g. when no spare LLM capacity is available). Attempts run on executor,
+    by default the generation pool, which is sized for callers that hold an
+    LLM scheduler slot per attempt.
+    """
+    executor = executor or _generation_executor
+
+    def attempt():
+        attempt_start = time.monotonic()
+        result = fn()
+        # Late finishers are recorded too, so the tracker sees true provider latency
+        if tracker is not None:
+            tracker.record(time.monotonic() - attempt_start)
+        return result
+
+    start = time.monotonic()
+    deadline = start + timeout_s
+    pending: List[Future] = [submit(attempt, executor=executor)]
+    hedged = hedge_after_s is None or hedge_after_s >= timeout_s
+    last_error: Optional[BaseException] = None
+
+    while pending:
+        now = time.monotonic()
+        if now >= deadline:
+            break
+
+        wait_until = deadline if hedged else min(deadline, start + hedge_after_s)
+        done, not_done = wait(pending, timeout=wait_until - now, return_when=FIRST_COMPLETED)
+        pending = list(not_done)
+
+        for future in done:
+            error = future.exception()
+            if error is None:
+                return future.result()
+            last_error = error
+
+        if not hedged and time.monotonic() >= start + hedge_after_s:
+            hedged = True
+            if pending and (start_hedge is None or start_hedge()):
+                pending.append(submit(attempt, executor=executor))
+
+    if pending or last_error is None:
+        raise DeadlineExceeded(stage, timeout_s)
+    raise last_error
@@ -0,0 +1,164 @@
+# backend/eval_router.py
+"""
+Offline evaluation of the question router against labelled question sets.
+
+By default two sets are scored separately: the tuning set, which the
+router's keyword tables were written against (so its figures are
+in-sample), and a held-out set that was labelled without reference to the
+keyword tables and is not used to tune them. Quote the held-out figures.
+
+Reports per set, without any API calls:
+- topic hit rate (a gold topic is among the predicted ones) and abstain rate,
+- share of the corpus scanned and the resulting similarity-scan time saved,
+- complexity accuracy, precision of the "simple" class (the questions the
+  fast tier would get) and share of questions actually sent to the fast
+  tier (none unless ROUTER_MODEL_TIERING=1),
+- router overhead per question.
+
+With --live it also embeds each question to compare filtered vs unfiltered
+top-k retrieval (accuracy retained), and times both model tiers on the
+questions routed to the fast tier.
+
+Usage:
+    python -m backend.eval_router
+    python -m backend.eval_router --live
+    python -m backend.eval_router --eval-set data/faq/router_eval_heldout.jsonl
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from backend.clients import get_openai_client
+from backend.config import OPENAI_MODEL, OPENAI_MODEL_FAST
+from backend.router import route_question
+from backend.vector_store import corpus_records, retrieve
+
+TUNING_SET = Path("data/faq/router_eval.jsonl")
+HELDOUT_SET = Path("data/faq/router_eval_heldout.jsonl")
+
+
+def load_eval_set(path: Path) -> List[Dict]:
+    with path.open("r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _scan_seconds(matrix: np.ndarray, repeats: int = 2000) -> float:
+    query = np.random.default_rng(0).standard_normal(matrix.shape[1]).astype("float32")
+    start = time.perf_counter()
+    for _ in range(repeats):
+        dot = matrix @ query
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        np.argsort(-(dot / (norms + 1e-8)))
+    return (time.perf_counter() - start) / repeats
+
+
+def _time_completion(model: str, question: str, max_tokens: int) -> float:
+    start = time.perf_counter()
+    get_openai_client().chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": question}],
+        max_tokens=max_tokens,
+        temperature=0,
+    )
+    return time.perf_counter() - start
+
+
+def evaluate(items: List[Dict], title: str, live: bool, k: int, max_tokens: int) -> None:
+    records = corpus_records()
+    topic_sizes: Dict[str, int] = {}
+    for rec in records:
+        topic_sizes[rec["topic"]] = topic_sizes.get(rec["topic"], 0) + 1
+    matrix = np.array([rec["embedding"] for rec in records], dtype="float32")
+
+    hits = abstains = complexity_ok = fast = predicted_simple = simple_ok = 0
+    scanned_fractions: List[float] = []
+    router_seconds: List[float] = []
+    overlaps: List[float] = []
+    top1_kept = 0
+    fast_questions: List[str] = []
+
+    for item in items:
+        start = time.perf_counter()
+        route = route_question(item["question"])
+        router_seconds.append(time.perf_counter() - start)
+
+        gold = set(item["topics"])
+        if route.topics is None:
+            abstains += 1
+            hits += 1
+            scanned_fractions.append(1.0)
+        else:
+            hits += bool(gold & set(route.topics))
+            scanned_fractions.append(sum(topic_sizes.get(t, 0) for t in route.topics) / len(records))
+
+        complexity_ok += route.complexity == item["complexity"]
+        if route.complexity == "simple":
+            predicted_simple += 1
+            simple_ok += item["complexity"] == "simple"
+        if route.model == OPENAI_MODEL_FAST:
+            fast += 1
+            fast_questions.append(item["question"])
+
+        if live and route.topics:
+            full = [ch["chunk_id"] for ch in retrieve(item["question"], k=k)]
+            narrowed = [ch["chunk_id"] for ch in retrieve(item["question"], k=k, topic_filter=route.topics)]
+            overlaps.append(len(set(full) & set(narrowed)) / max(1, len(full)))
+            top1_kept += bool(full and narrowed and full[0] == narrowed[0])
+
+        print(f"{'ok ' if route.topics is None or gold & set(route.topics) else 'MISS'} "
+              f"{route.complexity:<7} {str(route.topics):<45} {item['question'][:60]}")
+
+    n = len(items)
+    mean_fraction = statistics.mean(scanned_fractions)
+    full_scan = _scan_seconds(matrix)
+    subset = matrix[: max(1, round(mean_fraction * len(records)))]
+    narrowed_scan = _scan_seconds(subset)
+
+    print()
+    print(f"== {title}")
+    print(f"Questions: {n}")
+    print(f"Topic hit rate: {100 * hits / n:.1f}% (router abstained on {abstains})")
+    print(f"Corpus scanned: {100 * mean_fraction:.1f}% of {len(records)} chunks on average")
+    print(f"Similarity scan: {1e6 * full_scan:.1f}µs full vs {1e6 * narrowed_scan:.1f}µs narrowed")
+    print(f"Complexity accuracy: {100 * complexity_ok / n:.1f}%")
+    if predicted_simple:
+        print(f"Classed simple: {100 * predicted_simple / n:.1f}% of questions, "
+              f"{100 * simple_ok / predicted_simple:.1f}% of them correctly")
+    print(f"Fast tier ({OPENAI_MODEL_FAST}): {100 * fast / n:.1f}% of questions")
+    print(f"Router overhead: {1e6 * statistics.mean(router_seconds):.0f}µs mean per question")
+
+    if live:
+        if overlaps:
+            print(f"Retrieval overlap@{k} filtered vs full: {100 * statistics.mean(overlaps):.1f}%, "
+                  f"top-1 kept: {100 * top1_kept / len(overlaps):.1f}%")
+        if fast_questions:
+            default_latency = [_time_completion(OPENAI_MODEL, q, max_tokens) for q in fast_questions]
+            fast_latency = [_time_completion(OPENAI_MODEL_FAST, q, max_tokens) for q in fast_questions]
+            saved = statistics.mean(default_latency) - statistics.mean(fast_latency)
+            print(f"Generation on fast-tier questions: {OPENAI_MODEL} "
+                  f"{statistics.mean(default_latency):.2f}s vs {OPENAI_MODEL_FAST} "
+                  f"{statistics.mean(fast_latency):.2f}s (saves {saved:.2f}s per question)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eval-set", type=Path, nargs="+", default=[TUNING_SET, HELDOUT_SET])
+    parser.add_argument("--live", action="store_true", help="Use the embedding and chat APIs too.")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--max-tokens", type=int, default=300)
+    args = parser.parse_args()
+    for path in args.eval_set:
+        if path == TUNING_SET:
+            title = f"{path} (tuning set: in-sample, the keyword tables were written against it)"
+        elif path == HELDOUT_SET:
+            title = f"{path} (held-out)"
+        else:
+            title = str(path)
+        evaluate(load_eval_set(path), title, args.live, args.k, args.max_tokens)
+        print()
@@ -0,0 +1,142 @@
+# backend/faq_batch.py
+"""
+Pre-generate answers for frequently asked CPF questions.
+
+Reads a JSONL of {"question": ..., "age_band": ..., "income_band": ...}
+(bands optional), runs retrieval + generation with a bounded number of
+concurrent workers, and appends one record per answer to the FAQ store.
+Records are tied to the current corpus version; re-running skips questions
+that already have an answer for this version, so an interrupted run resumes
+where it stopped.
+
+Usage:
+    python -m backend.faq_batch
+    python -m backend.faq_batch --input data/faq/questions.jsonl --workers 4
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from backend.config import FAQ_STORE_PATH, OPENAI_MODEL
+from backend.faq_store import FAQStore, faq_key
+from backend.rag import generate_policy_answer, retrieve_policy_context
+from backend.vector_store import corpus_version
+
+DEFAULT_INPUT = Path("data/faq/questions.jsonl")
+
+
+def load_questions(path: Path) -> List[Dict]:
+    items: List[Dict] = []
+    seen = set()
+
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            key = faq_key(item["question"], item.get("age_band"), item.get("income_band"))
+            if key in seen:
+                continue
+            seen.add(key)
+            items.append({**item, "key": key})
+
+    return items
+
+
+def _answer_one(item: Dict, version: str) -> Dict:
+    profile_context = {}
+    if item.get("age_band"):
+        profile_context["Age band"] = item["age_band"]
+    if item.get("income_band"):
+        profile_context["Income band"] = item["income_band"]
+
+    start = time.perf_counter()
+    retrieval = retrieve_policy_context(item["question"], profile_context)
+    answer = generate_policy_answer(retrieval, strict=True)
+    seconds = time.perf_counter() - start
+
+    return {
+        "key": item["key"],
+        "question": item["question"],
+        "age_band": item.get("age_band"),
+        "income_band": item.get("income_band"),
+        "answer": answer,
+        "sources": sorted({ch.get("source", "") for ch in retrieval.context_chunks} - {""}),
+        "corpus_version": version,
+        "model": retrieval.route.model if retrieval.route else OPENAI_MODEL,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seconds": round(seconds, 3),
+    }
+
+
+def run(input_path: Path, output_path: Path, workers: int, force: bool) -> None:
+    version = corpus_version()
+    items = load_questions(input_path)
+
+    done_keys = set() if force else FAQStore(output_path, version).keys()
+    todo = [item for item in items if item["key"] not in done_keys]
+
+    print(f"Corpus version {version}: {len(items)} questions, "
+          f"{len(items) - len(todo)} already answered, {len(todo)} to generate.")
+    if not todo:
+        return
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    write_lock = threading.Lock()
+    latencies: List[float] = []
+    failures = 0
+    start = time.perf_counter()
+
+    with output_path.open("a", encoding="utf-8") as out:
+        pool = ThreadPoolExecutor(max_workers=workers)
+        futures = {pool.submit(_answer_one, item, version): item for item in todo}
+        try:
+            for i, future in enumerate(as_completed(futures), start=1):
+                item = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    failures += 1
+                    print(f"[{i}/{len(todo)}] FAILED {item['question']!r}: {e}")
+                    continue
+
+                # One flushed line per answer, so an interruption loses at most
+                # the answers still in flight
+                with write_lock:
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                latencies.append(record["seconds"])
+                print(f"[{i}/{len(todo)}] {record['seconds']:.1f}s {item['question']!r}")
+        except KeyboardInterrupt:
+            print("Interrupted; re-run the same command to resume.")
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    print()
+    print(f"Generated {len(latencies)} answers ({failures} failed) in {elapsed:.1f}s "
+          f"with {workers} workers.")
+    if latencies:
+        ordered = sorted(latencies)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        print(f"Throughput: {60 * len(latencies) / elapsed:.1f} answers/min; "
+              f"latency mean={statistics.mean(ordered):.1f}s p95={p95:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT)
+    parser.add_argument("--output", type=Path, default=Path(FAQ_STORE_PATH))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--force", action="store_true", help="Regenerate answers that already exist.")
+    args = parser.parse_args()
+    run(args.input, args.output, args.workers, args.force)
@@ -0,0 +1,149 @@
+# backend/faq_store.py
+
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backend.config import FAQ_STORE_PATH, FAQ_NEAR_MATCH_THRESHOLD
+from backend.vector_store import corpus_version
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Words that do not change what is being asked
+_FILLER = {
+    "a", "an", "the", "is", "are", "do", "does", "can", "could", "i", "my", "me",
+    "please", "what", "whats", "how", "explain", "tell", "about", "of", "to", "in",
+    "for", "and", "cpf",
+}
+
+# Profile band values that mean "no band given"
+_UNSPECIFIED_BANDS = {"", "not specified", "prefer not to say"}
+
+
+def normalise_question(question: str) -> str:
+    return " ".join(_WORD_RE.findall((question or "").lower()))
+
+
+def normalise_band(band: Optional[str]) -> str:
+    value = (band or "").strip()
+    return "any" if value.lower() in _UNSPECIFIED_BANDS else value
+
+
+def faq_key(question: str, age_band: Optional[str] = None, income_band: Optional[str] = None) -> str:
+    return "|".join(
+        [normalise_question(question), normalise_band(age_band), normalise_band(income_band)]
+    )
+
+
+def _content_words(question: str) -> frozenset:
+    return frozenset(w for w in normalise_question(question).split() if w not in _FILLER)
+
+
+class FAQStore:
+    """
+    Pre-generated answers keyed by (normalised question, age band, income band),
+    loaded from the JSONL written by backend.faq_batch. Only records generated
+    against the current corpus version are served. The file is re-read when it
+    changes on disk.
+    """
+
+    def __init__(self, path: Path, corpus_version: str):
+        self.path = Path(path)
+        self.corpus_version = corpus_version
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._exact: Dict[str, Dict] = {}
+        self._by_bands: Dict[tuple, List[tuple]] = {}
+
+    def _refresh(self) -> None:
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            self._mtime, self._exact, self._by_bands = None, {}, {}
+            return
+
+        if mtime == self._mtime:
+            return
+
+        exact: Dict[str, Dict] = {}
+        by_bands: Dict[tuple, List[tuple]] = {}
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    # A partially written last line from an interrupted batch run
+                    continue
+                if rec.get("corpus_version") != self.corpus_version:
+                    continue
+                exact[rec["key"]] = rec
+
+        for rec in exact.values():
+            bands = (normalise_band(rec.get("age_band")), normalise_band(rec.get("income_band")))
+            by_bands.setdefault(bands, []).append((_content_words(rec["question"]), rec))
+
+        self._mtime, self._exact, self._by_bands = mtime, exact, by_bands
+
+    def lookup(
+        self,
+        question: str,
+        age_band: Optional[str] = None,
+        income_band: Optional[str] = None,
+        min_similarity: float = FAQ_NEAR_MATCH_THRESHOLD,
+    ) -> Optional[Dict]:
+        """
+        Exact match on the normalised key, else the closest stored question
+        with the same bands whose content-word Jaccard similarity is at least
+        min_similarity (FAQ_NEAR_MATCH_THRESHOLD by default).
+        """
+        with self._lock:
+            self._refresh()
+            rec = self._exact.get(faq_key(question, age_band, income_band))
+            if rec is not None:
+                return rec
+
+            words = _content_words(question)
+            if not words:
+                return None
+
+            bands = (normalise_band(age_band), normalise_band(income_band))
+            best, best_sim = None, 0.0
+            for stored_words, stored in self._by_bands.get(bands, []):
+                if not stored_words:
+                    continue
+                sim = len(words & stored_words) / len(words | stored_words)
+                if sim > best_sim:
+                    best, best_sim = stored, sim
+
+            if best is not None and best_sim >= min_similarity:
+                return best
+            return None
+
+    def keys(self) -> set:
+        with self._lock:
+            self._refresh()
+            return set(self._exact)
+
+
+_store: Optional[FAQStore] = None
+_store_lock = threading.Lock()
+
+
+def get_faq_store() -> Optional[FAQStore]:
+    """
+    Shared store for the current corpus, or None if the corpus is missing.
+    """
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = FAQStore(FAQ_STORE_PATH, corpus_version())
+            except RuntimeError:
+                return None
+        return _store
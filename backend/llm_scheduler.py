@@ -0,0 +1,187 @@
+# backend/llm_scheduler.py
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Lower value = served first
+PRIORITY_INTERACTIVE = 0  # Use Case 1: policy questions
+PRIORITY_BACKGROUND = 1  # Use Case 2: simulator narratives
+
+
+class SchedulerBusy(RuntimeError):
+    """
+    Raised when a request cannot get an LLM slot: the queue is full, or the
+    request waited longer than the scheduler's max wait.
+    """
+
+    def __init__(self, message: str, position: Optional[int] = None, waited: float = 0.0):
+        super().__init__(message)
+        self.position = position
+        self.waited = waited
+
+
+class _Ticket:
+    __slots__ = ("priority", "seq", "granted", "cancelled")
+
+    def __init__(self, priority: int, seq: int):
+        self.priority = priority
+        self.seq = seq
+        self.granted = False
+        self.cancelled = False
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class LLMScheduler:
+    """
+    Caps the number of concurrent LLM calls in this process. Requests beyond
+    the cap wait in a priority queue (FIFO within a priority) for at most
+    max_wait_s seconds; a full queue or an expired wait raises SchedulerBusy
+    so the caller can degrade gracefully instead of hammering the provider.
+    """
+
+    def __init__(self, max_concurrency: int, max_wait_s: float, max_queue: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_wait_s = max_wait_s
+        self.max_queue = max_queue
+
+        self._cond = threading.Condition()
+        self._queue: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._active = 0
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._waits: deque = deque(maxlen=1000)
+
+    # ------------------------------------------------------------------
+    # Queue internals (caller must hold self._cond)
+    # ------------------------------------------------------------------
+    def _queued(self) -> int:
+        return sum(1 for t in self._queue if not t.cancelled)
+
+    def _position(self, ticket: _Ticket) -> int:
+        return 1 + sum(1 for t in self._queue if not t.cancelled and t < ticket)
+
+    def _dispatch(self) -> None:
+        granted = False
+        while self._queue and self._active < self.max_concurrency:
+            ticket = heapq.heappop(self._queue)
+            if ticket.cancelled:
+                continue
+            ticket.granted = True
+            self._active += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def acquire(
+        self,
+        priority: int = PRIORITY_INTERACTIVE,
+        on_queued: Optional[Callable[[int], None]] = None,
+    ) -> float:
+        """
+        Block until a slot is free. Returns the time spent waiting (seconds).
+        """
+        start = time.monotonic()
+
+        with self._cond:
+            if self._active < self.max_concurrency and self._queued() == 0:
+                self._active += 1
+                self.admitted += 1
+                self._waits.append(0.0)
+                return 0.0
+
+            if self._queued() >= self.max_queue:
+                self.rejected += 1
+                raise SchedulerBusy("LLM queue is full", position=self._queued() + 1)
+
+            ticket = _Ticket(priority, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            position = self._position(ticket)
+
+        if on_queued is not None:
+            on_queued(position)
+
+        with self._cond:
+            deadline = start + self.max_wait_s
+            while not ticket.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            waited = time.monotonic() - start
+            if not ticket.granted:
+                ticket.cancelled = True
+                self.timed_out += 1
+                raise SchedulerBusy(
+                    "Timed out waiting for an LLM slot",
+                    position=self._position(ticket),
+                    waited=waited,
+                )
+
+            self.admitted += 1
+            self._waits.append(waited)
+            return waited
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot only if one is free right now and nobody is queued.
+        Used for optional extra work such as hedged requests.
+        """
+        with self._cond:
+            if self._active < self.max_concurrency and self._queued() == 0:
+                self._active += 1
+                return True
+            return False
+
+    def release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(
+        self,
+        priority: int = PRIORITY_INTERACTIVE,
+        on_queued: Optional[Callable[[int], None]] = None,
+    ):
+        self.acquire(priority=priority, on_queued=on_queued)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            waits = sorted(self._waits)
+            active = self._active
+            queued = self._queued()
+
+        def pct(p: float) -> float:
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(p * len(waits)))]
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": active,
+            "queue_depth": queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_p50_s": pct(0.50),
+            "wait_p95_s": pct(0.95),
+            "wait_max_s": waits[-1] if waits else 0.0,
+        }
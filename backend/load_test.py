@@ -0,0 +1,282 @@
+# backend/load_test.py
+"""
+Concurrent-user load test for both use cases.
+
+N virtual users (threads) each loop over a weighted mix of operations:
+- policy:     answer_policy_question (FAQ lookup, retrieval, generation)
+- retrieve:   vector_store.retrieve only
+- simulation: simulator scenarios + classification, then explain_simulation_results
+
+Questions come from a JSONL file (popularity follows a Zipf-like skew, so
+popular questions repeat as they would in production) and simulator inputs
+from the page presets, optionally jittered so requests are not identical.
+
+The report covers throughput, p50/p95/p99 latency per stage, outcome rates
+(ok / degraded / busy / error), scheduler and coalescing stats, and process
+RSS growth.
+
+Use --offline to run against the local stand-in backends (hashed n-gram
+embeddings, simulated LLM) with no network or API key; build the local corpus
+first with EMBEDDING_PROVIDER=local python -m backend.build_corpus.
+
+Usage:
+    python -m backend.load_test --offline --users 20 --duration 60
+    python -m backend.load_test --offline --users 50 --mix policy=0.6,retrieve=0.2,simulation=0.2
+    python -m backend.load_test --users 5 --iterations 4        # real OpenAI backends
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+DEFAULT_QUESTIONS = Path("data/faq/router_eval.jsonl")
+STAGES = ("policy", "retrieve", "simulate", "explain")
+DEFAULT_MIX = "policy=0.5,retrieve=0.2,simulation=0.3"
+
+# Phrases of the fallback answers in backend/rag.py, used to classify outcomes
+_BUSY_MARKERS = ("handling a lot of questions", "because the assistant is busy")
+_DEGRADED_MARKERS = ("taking longer than expected", "in time right now", "reached its usage limit")
+_ERROR_MARKERS = ("(Internal error:", "unable to generate an explanation right now")
+
+
+def parse_weights(spec: str, sep: str = ",") -> Dict[str, float]:
+    weights = {}
+    for part in spec.split(sep):
+        name, _, value = part.partition("=")
+        weights[name.strip()] = float(value or 1)
+    return weights
+
+
+def rss_mb() -> float:
+    """
+    Current resident set size in MB (Linux), else the peak RSS.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def classify_answer(text: str) -> str:
+    if any(m in text for m in _ERROR_MARKERS):
+        return "error"
+    if any(m in text for m in _BUSY_MARKERS):
+        return "busy"
+    if any(m in text for m in _DEGRADED_MARKERS):
+        return "degraded"
+    return "ok"
+
+
+def _percentile(ordered: List[float], p: float) -> float:
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+class Results:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.outcomes: Dict[str, Dict[str, int]] = {stage: {} for stage in STAGES}
+
+    def record(self, stage: str, seconds: float, outcome: str) -> None:
+        with self._lock:
+            self.latencies[stage].append(seconds)
+            counts = self.outcomes[stage]
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+
+class VirtualUser(threading.Thread):
+    def __init__(self, uid: int, args, questions: List[Dict], question_weights: List[float],
+                 presets: Dict[str, float], results: Results, stop_at: float):
+        super().__init__(name=f"vu-{uid}", daemon=True)
+        self.rng = random.Random(args.seed * 10_007 + uid)
+        self.args = args
+        self.questions = questions
+        self.question_weights = question_weights
+        self.presets, self.preset_weights = zip(*presets.items())
+        self.results = results
+        self.stop_at = stop_at
+        self.ops, self.op_weights = zip(*parse_weights(args.mix).items())
+
+    def _timed(self, stage: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            out = fn(*args, **kwargs)
+        except Exception:
+            self.results.record(stage, time.perf_counter() - start, "exception")
+            return None
+        outcome = classify_answer(out) if isinstance(out, str) else "ok"
+        self.results.record(stage, time.perf_counter() - start, outcome)
+        return out
+
+    def _question(self) -> Dict:
+        return self.rng.choices(self.questions, weights=self.question_weights)[0]
+
+    def _policy(self) -> None:
+        from backend.rag import answer_policy_question
+
+        item = self._question()
+        profile = {"Age band": item.get("age_band", "Prefer not to say"),
+                   "Income band": item.get("income_band", "Prefer not to say")}
+        self._timed("policy", answer_policy_question, item["question"], profile)
+
+    def _retrieve(self) -> None:
+        from backend.vector_store import retrieve
+
+        self._timed("retrieve", retrieve, self._question()["question"], k=5)
+
+    def _simulation(self) -> None:
+        from backend.rag import explain_simulation_results
+        from backend.simulator import (
+            PRESETS,
+            RetirementInputs,
+            build_scenarios,
+            classify_vs_retirement_sums,
+            cohort_retirement_sums,
+        )
+
+        name = self.rng.choices(self.presets, weights=self.preset_weights)[0]
+        preset = dict(PRESETS[name])
+        if self.args.jitter:
+            for key in ("current_savings", "monthly_contribution"):
+                preset[key] = round(preset[key] * self.rng.uniform(1 - self.args.jitter, 1 + self.args.jitter), -1)
+
+        def simulate():
+            inputs = RetirementInputs(
+                current_age=int(preset["current_age"]),
+                retirement_age=int(preset["retirement_age"]),
+                current_savings=preset["current_savings"],
+                monthly_contribution=preset["monthly_contribution"],
+                salary_growth_rate=preset["salary_growth_rate_pct"] / 100,
+                assumed_return_rate=preset["assumed_return_rate_pct"] / 100,
+            )
+            scenarios = build_scenarios(inputs)
+            base = scenarios[0]
+            return scenarios, classify_vs_retirement_sums(
+                base.projected_savings, *cohort_retirement_sums(inputs.current_age).tolist()
+            )
+
+        simulated = self._timed("simulate", simulate)
+        if simulated is None:
+            return
+        scenarios, classification = simulated
+        user_inputs = {**{k: v for k, v in preset.items() if k != "target_income"},
+                       "target_retirement_income": preset["target_income"]}
+        scenario_dicts = [
+            {"Scenario": "Base scenario", "Retirement age": scenarios[0].retirement_age,
+             "Projected savings (S$)": scenarios[0].projected_savings, "Notes": classification["label"]}
+        ]
+        self._timed("explain", explain_simulation_results, user_inputs, scenario_dicts, classification)
+
+    def run(self) -> None:
+        iterations = 0
+        while time.perf_counter() < self.stop_at:
+            if self.args.iterations and iterations >= self.args.iterations:
+                break
+            op = self.rng.choices(self.ops, weights=self.op_weights)[0]
+            getattr(self, f"_{op}")()
+            iterations += 1
+            if self.args.think_time:
+                time.sleep(self.rng.expovariate(1 / self.args.think_time))
+
+
+def load_questions(path: Path, skew: float) -> tuple:
+    with path.open("r", encoding="utf-8") as f:
+        questions = [json.loads(line) for line in f if line.strip()]
+    # Rank r gets weight 1/r^skew; skew 0 is a uniform mix
+    weights = [1 / (rank ** skew) for rank in range(1, len(questions) + 1)]
+    return questions, weights
+
+
+def report(results: Results, elapsed: float, rss_samples: List[float]) -> None:
+    from backend.rag import llm_scheduler
+    from backend.singleflight import singleflight_stats
+
+    total = sum(len(v) for v in results.latencies.values())
+    print()
+    print(f"Elapsed {elapsed:.1f}s, {total} stage calls, {total / elapsed:.2f} calls/s")
+    print(f"{'stage':<9} {'n':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  outcomes")
+    for stage in STAGES:
+        lat = sorted(results.latencies[stage])
+        if not lat:
+            continue
+        outcomes = results.outcomes[stage]
+        rates = ", ".join(f"{k} {100 * v / len(lat):.1f}%" for k, v in sorted(outcomes.items()))
+        print(f"{stage:<9} {len(lat):>6} {len(lat) / elapsed:>7.2f} {_percentile(lat, 0.50):>7.2f}s "
+              f"{_percentile(lat, 0.95):>7.2f}s {_percentile(lat, 0.99):>7.2f}s {lat[-1]:>7.2f}s  {rates}")
+
+    print()
+    print(f"LLM scheduler: {llm_scheduler.stats()}")
+    for name, stats in singleflight_stats().items():
+        print(f"Singleflight {name}: {stats}")
+    print(f"RSS: start {rss_samples[0]:.0f} MB, end {rss_samples[-1]:.0f} MB, "
+          f"peak {max(rss_samples):.0f} MB (growth {rss_samples[-1] - rss_samples[0]:+.0f} MB)")
+
+
+def run(args) -> None:
+    if args.offline:
+        # Must be set before backend.config is first imported
+        os.environ.setdefault("EMBEDDING_PROVIDER", "local")
+        os.environ.setdefault("LLM_PROVIDER", "fake")
+
+    from backend.simulator import PRESETS
+    from backend.vector_store import corpus_records
+
+    questions, question_weights = load_questions(args.questions, args.question_skew)
+    presets = parse_weights(args.presets, sep=";") if args.presets else {name: 1.0 for name in PRESETS}
+    unknown = set(presets) - set(PRESETS)
+    if unknown:
+        raise SystemExit(f"Unknown presets: {sorted(unknown)}; choose from {list(PRESETS)}")
+    unknown = set(parse_weights(args.mix)) - {"policy", "retrieve", "simulation"}
+    if unknown:
+        raise SystemExit(f"Unknown operations in --mix: {sorted(unknown)}")
+
+    # Load the corpus and the LLM stack before the clock starts, so latency and
+    # RSS growth reflect the run rather than first-use imports
+    corpus_records()
+    import crewai  # noqa: F401
+    import backend.rag  # noqa: F401
+    rss_samples = [rss_mb()]
+    results = Results()
+    start = time.perf_counter()
+    stop_at = start + args.duration
+
+    users = []
+    for uid in range(args.users):
+        user = VirtualUser(uid, args, questions, question_weights, presets, results, stop_at)
+        user.start()
+        users.append(user)
+        if args.ramp_up:
+            time.sleep(args.ramp_up / args.users)
+
+    while any(u.is_alive() for u in users):
+        time.sleep(1.0)
+        rss_samples.append(rss_mb())
+        done = sum(len(v) for v in results.latencies.values())
+        print(f"\r{time.perf_counter() - start:6.1f}s  {done} calls  RSS {rss_samples[-1]:.0f} MB", end="", flush=True)
+
+    rss_samples.append(rss_mb())
+    report(results, time.perf_counter() - start, rss_samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users.")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run (upper bound).")
+    parser.add_argument("--iterations", type=int, default=0, help="Operations per user (0 = until --duration).")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which users start.")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between a user's operations.")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Operation weights, e.g. policy=0.5,retrieve=0.2,simulation=0.3")
+    parser.add_argument("--questions", type=Path, default=DEFAULT_QUESTIONS)
+    parser.add_argument("--question-skew", type=float, default=1.0, help="Zipf exponent of question popularity.")
+    parser.add_argument("--presets", default="", help="';'-separated preset weights, e.g. 'Age 45, catching up=2;Near retirement (age 55)=1'.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Relative jitter applied to preset savings/contributions.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--offline", action="store_true", help="Use the local embedder and simulated LLM.")
+    run(parser.parse_args())
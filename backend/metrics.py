@@ -0,0 +1,302 @@
+# backend/metrics.py
+
+import bisect
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.config import METRICS_ENABLED, METRICS_PORT, METRICS_HOST
+
+# Counters, gauges and histograms exported in Prometheus text format.
+# Writes go to per-thread cells (each thread only ever writes its own), so
+# the hot path takes no lock; a scrape sums the cells. With METRICS_ENABLED
+# off, every metric is a shared no-op.
+
+logger = logging.getLogger("cpf.metrics")
+
+# Seconds; spans sub-millisecond scans up to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+_registry: Dict[str, "_Family"] = {}
+_collectors: List[Callable[[], Iterable[Tuple]]] = []
+_registry_lock = threading.Lock()
+
+
+class _Cells:
+    """
+    One list of floats per writer thread. Cells of finished threads are folded
+    into a retired total at scrape time, so short-lived threads (e.g. one
+    Streamlit script run) do not accumulate.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cells: List[Tuple[threading.Thread, List[float]]] = []
+        self._retired = [0.0] * size
+
+    def cell(self) -> List[float]:
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = [0.0] * self._size
+            with self._lock:
+                self._cells.append((threading.current_thread(), cell))
+            self._local.cell = cell
+            return cell
+
+    def snapshot(self) -> List[float]:
+        with self._lock:
+            total = list(self._retired)
+            alive = []
+            for thread, cell in self._cells:
+                for i, v in enumerate(cell):
+                    total[i] += v
+                if thread.is_alive():
+                    alive.append((thread, cell))
+                else:
+                    self._retired = [r + v for r, v in zip(self._retired, cell)]
+            self._cells = alive
+        return total
+
+
+class _Counter:
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cells.cell()[0] += amount
+
+    def samples(self, name: str, labels: str) -> List[str]:
+        return [f"{name}{labels} {_fmt(self._cells.snapshot()[0])}"]
+
+
+class _Gauge:
+    def __init__(self):
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def samples(self, name: str, labels: str) -> List[str]:
+        return [f"{name}{labels} {_fmt(self._value)}"]
+
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self._buckets = tuple(buckets)
+        # bucket counts, +Inf count, sum, count
+        self._cells = _Cells(len(self._buckets) + 3)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.cell()
+        cell[bisect.bisect_left(self._buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def samples(self, name: str, labels: str) -> List[str]:
+        snap = self._cells.snapshot()
+        inner = labels[1:-1] + "," if labels else ""
+        lines = []
+        cumulative = 0.0
+        for bound, count in zip(list(self._buckets) + ["+Inf"], snap[:-2]):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{inner}le="{bound}"}} {_fmt(cumulative)}')
+        lines.append(f"{name}_sum{labels} {_fmt(snap[-2])}")
+        lines.append(f"{name}_count{labels} {_fmt(snap[-1])}")
+        return lines
+
+
+class _Family:
+    """
+    A named metric; with label names, .labels(...) returns one child per
+    label combination, otherwise the family records directly.
+    """
+
+    def __init__(self, kind: str, name: str, help_text: str, labelnames: Sequence[str], factory: Callable):
+        self.kind = kind
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._child(())
+
+    def _child(self, values: Tuple[str, ...]):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    def labels(self, **labels):
+        return self._child(tuple(str(labels[n]) for n in self.labelnames))
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines += child.samples(self.name, _labels(zip(self.labelnames, values)))
+        return lines
+
+
+class _Noop:
+    def labels(self, **labels) -> "_Noop":
+        return self
+
+    def inc(self, amount: float = 1.0) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def observe(self, value: float) -> None:
+        pass
+
+
+_NOOP = _Noop()
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    pairs = list(pairs)
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _register(kind: str, name: str, help_text: str, labelnames: Sequence[str], factory: Callable):
+    if not METRICS_ENABLED:
+        return _NOOP
+    with _registry_lock:
+        family = _registry.get(name)
+        if family is None:
+            family = _Family(kind, name, help_text, labelnames, factory)
+            _registry[name] = family
+        return family
+
+
+# ---------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------
+
+
+def counter(name: str, help_text: str, labelnames: Sequence[str] = ()):
+    return _register("counter", name, help_text, labelnames, _Counter)
+
+
+def gauge(name: str, help_text: str, labelnames: Sequence[str] = ()):
+    return _register("gauge", name, help_text, labelnames, _Gauge)
+
+
+def histogram(name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+    return _register("histogram", name, help_text, labelnames, lambda: _Histogram(buckets))
+
+
+def register_collector(fn: Callable[[], Iterable[Tuple]]) -> None:
+    """
+    fn() is called at scrape time and yields (name, kind, help, samples),
+    where samples is a list of ({label: value}, number). Use it to export
+    values that are already tracked elsewhere, at no hot-path cost.
+    """
+    if METRICS_ENABLED:
+        with _registry_lock:
+            _collectors.append(fn)
+
+
+def _rss_bytes() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _process_metrics():
+    rss = _rss_bytes()
+    if rss is not None:
+        yield "process_resident_memory_bytes", "gauge", "Resident set size of this worker.", [({}, rss)]
+    yield "process_threads", "gauge", "Live Python threads.", [({}, threading.active_count())]
+
+
+def render() -> str:
+    """
+    All metrics in Prometheus text exposition format.
+    """
+    with _registry_lock:
+        families = list(_registry.values())
+        collectors = list(_collectors)
+
+    lines: List[str] = []
+    for family in sorted(families, key=lambda f: f.name):
+        lines += family.render()
+    for collect in collectors:
+        try:
+            for name, kind, help_text, samples in collect():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{_labels(sorted(labels.items()))} {_fmt(value)}" for labels, value in samples]
+        except Exception:
+            logger.exception("Metrics collector %r failed", collect)
+    return "\n".join(lines) + "\n"
+
+
+if METRICS_ENABLED:
+    register_collector(_process_metrics)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = METRICS_HOST) -> Optional[int]:
+    """
+    Serve /metrics from a daemon thread in this process. Safe to call on
+    every Streamlit rerun; returns the bound port, or None when disabled.
+    """
+    global _server
+
+    if not METRICS_ENABLED or not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                logger.warning("Metrics endpoint not started on %s:%s: %s", host, port, e)
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+        return _server.server_address[1]
@@ -0,0 +1,243 @@
+# backend/providers.py
+
+import hashlib
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backend import usage
+from backend.context_packer import estimate_tokens
+from backend.tracing import annotate, span
+from backend.config import (
+    EMBEDDING_PROVIDER,
+    LLM_PROVIDER,
+    OPENAI_EMBEDDING_MODEL,
+    LOCAL_EMBEDDING_DIM,
+    LOCAL_EMBED_LATENCY_S,
+    FAKE_LLM_LATENCY_S,
+    FAKE_LLM_TOKENS_PER_S,
+    FAKE_LLM_OUTPUT_TOKENS,
+    FAKE_LLM_FAILURE_RATE,
+    FAKE_LLM_SEED,
+)
+
+# Embedding and chat backends, picked by EMBEDDING_PROVIDER / LLM_PROVIDER.
+# The local ones need no network or API key, so retrieval, caching and
+# concurrency changes can be load-tested offline at realistic timings.
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Too common to say anything about a chunk's topic
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for",
+    "from", "how", "i", "if", "in", "is", "it", "my", "of", "on", "or", "so",
+    "that", "the", "this", "to", "what", "when", "where", "which", "who", "why",
+    "will", "with", "you", "your", "cpf", "s", "me", "there", "their", "they",
+}
+
+
+class OpenAIEmbedder:
+    def __init__(self, model: str = OPENAI_EMBEDDING_MODEL):
+        self.name = model
+
+    def embed(self, texts: List[str], timeout: Optional[float] = None) -> np.ndarray:
+        from backend.clients import get_openai_client
+
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        resp = get_openai_client().embeddings.create(model=self.name, input=texts, **kwargs)
+        if resp.usage is not None:
+            annotate(embedding_tokens=resp.usage.total_tokens)
+            usage.record(self.name, resp.usage.total_tokens, kind="embedding")
+        return np.array([item.embedding for item in resp.data], dtype="float32")
+
+
+class HashingEmbedder:
+    """
+    Deterministic bag-of-n-grams embedder: word unigrams, word bigrams and
+    character trigrams, hashed (signed) into a fixed number of dimensions and
+    L2-normalised. Lexical only, but stable across runs and machines.
+    """
+
+    def __init__(self, dim: int = LOCAL_EMBEDDING_DIM, latency_s: float = LOCAL_EMBED_LATENCY_S):
+        self.dim = dim
+        self.latency_s = latency_s
+        self.name = f"local-hash-{dim}"
+        self._slots: Dict[str, tuple] = {}
+
+    def _slot(self, feature: str) -> tuple:
+        slot = self._slots.get(feature)
+        if slot is None:
+            h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            slot = (h % self.dim, 1.0 if (h >> 63) & 1 else -1.0)
+            self._slots[feature] = slot
+        return slot
+
+    def _features(self, text: str) -> Dict[str, float]:
+        words = [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+        counts: Dict[str, float] = {}
+        for w in words:
+            counts["w:" + w] = counts.get("w:" + w, 0.0) + 1.0
+            padded = f"#{w}#"
+            for i in range(len(padded) - 2):
+                tri = "c:" + padded[i:i + 3]
+                counts[tri] = counts.get(tri, 0.0) + 0.5
+        for a, b in zip(words, words[1:]):
+            counts[f"b:{a}_{b}"] = counts.get(f"b:{a}_{b}", 0.0) + 1.0
+        return counts
+
+    def embed(self, texts: List[str], timeout: Optional[float] = None) -> np.ndarray:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        # Metered as the OpenAI model it stands in for, so offline runs estimate real spend
+        usage.record(OPENAI_EMBEDDING_MODEL, sum(estimate_tokens(t) for t in texts), kind="embedding", estimated=True)
+
+        out = np.zeros((len(texts), self.dim), dtype="float32")
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                idx, sign = self._slot(feature)
+                # Sublinear term frequency, so long chunks are not dominated by repeats
+                out[row, idx] += sign * np.log1p(count)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.maximum(norms, 1e-8)
+
+
+class FakeChatModel:
+    """
+    Stand-in chat model: waits for a time-to-first-token plus output tokens at
+    a fixed rate, fails at a configurable rate, and answers with sentences
+    lifted from the prompt (so answers stay on-topic and deterministic).
+    """
+
+    def __init__(
+        self,
+        latency_s: float = FAKE_LLM_LATENCY_S,
+        tokens_per_s: float = FAKE_LLM_TOKENS_PER_S,
+        output_tokens: int = FAKE_LLM_OUTPUT_TOKENS,
+        failure_rate: float = FAKE_LLM_FAILURE_RATE,
+        seed: int = FAKE_LLM_SEED,
+    ):
+        self.latency_s = latency_s
+        self.tokens_per_s = tokens_per_s
+        self.output_tokens = output_tokens
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def complete(self, prompt: str) -> str:
+        with self._rng_lock:
+            fails = self._rng.random() < self.failure_rate
+            jitter = self._rng.uniform(0.8, 1.2)
+
+        if fails:
+            time.sleep(self.latency_s * jitter)
+            raise RuntimeError("Simulated LLM failure (FAKE_LLM_FAILURE_RATE)")
+
+        answer = self._answer(prompt, max(1, int(self.output_tokens * jitter)))
+        # Words stand in for tokens; ~0.75 words per token
+        tokens = len(answer.split()) / 0.75
+        time.sleep(self.latency_s * jitter + tokens / self.tokens_per_s)
+        return answer
+
+    @staticmethod
+    def _answer(prompt: str, max_tokens: int) -> str:
+        # Prefer the retrieved policy context over the instructions around it
+        match = re.search(r"CPF POLICY CONTEXT[^\n]*\n(.*?)(?:\n\s*YOUR TASK|$)", prompt, re.S)
+        source = match.group(1) if match else prompt
+        sentences = []
+        for piece in re.split(r"(?<=[.!?])\s+|\n+", source):
+            piece = piece.strip().lstrip("-* ").strip()
+            if len(piece) > 40 and not piece.startswith(("#", "[")):
+                sentences.append(piece)
+        budget_words = int(max_tokens * 0.75)
+        lines = ["### Summary (offline stand-in model)", ""]
+        used = 0
+        for s in sentences:
+            words = len(s.split())
+            if used + words > budget_words:
+                break
+            lines.append(f"- {s}")
+            used += words
+        lines += ["", "Please check the official CPF website for the latest rules."]
+        return "\n".join(lines)
+
+
+_lock = threading.Lock()
+_embedder = None
+_chat_model: Optional[FakeChatModel] = None
+_fake_llm_class = None
+
+
+def get_embedder():
+    """
+    The configured embedder (OpenAIEmbedder or HashingEmbedder).
+    """
+    global _embedder
+
+    with _lock:
+        if _embedder is None:
+            if EMBEDDING_PROVIDER == "local":
+                _embedder = HashingEmbedder()
+            elif EMBEDDING_PROVIDER == "openai":
+                _embedder = OpenAIEmbedder()
+            else:
+                raise ValueError(f"Unknown EMBEDDING_PROVIDER: {EMBEDDING_PROVIDER!r}")
+        return _embedder
+
+
+def get_chat_model() -> FakeChatModel:
+    global _chat_model
+
+    with _lock:
+        if _chat_model is None:
+            _chat_model = FakeChatModel()
+        return _chat_model
+
+
+def _fake_crew_llm_class():
+    """
+    CrewAI adapter around FakeChatModel, defined on first use so that CrewAI
+    is only imported when an agent is actually built.
+    """
+    global _fake_llm_class
+
+    if _fake_llm_class is None:
+        from crewai.llms.base_llm import BaseLLM
+
+        class FakeCrewLLM(BaseLLM):
+            llm_type: str = "fake"
+
+            def call(self, messages, tools=None, callbacks=None, available_functions=None,
+                     from_task=None, from_agent=None, response_model=None):
+                if isinstance(messages, str):
+                    prompt = messages
+                else:
+                    prompt = "\n".join(str(m.get("content", "")) for m in messages)
+                with span("llm_call", provider="fake", model=self.model) as s:
+                    answer = get_chat_model().complete(prompt)
+                    prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(answer)
+                    s.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+                    usage.record(self.model, prompt_tokens, completion_tokens, estimated=True)
+                    return answer
+
+            def supports_function_calling(self) -> bool:
+                return False
+
+        _fake_llm_class = FakeCrewLLM
+    return _fake_llm_class
+
+
+def chat_llm(model: str):
+    """
+    LLM for a CrewAI agent: the pooled OpenAI client, or the fake model.
+    """
+    if LLM_PROVIDER == "fake":
+        return _fake_crew_llm_class()(model=model, provider="fake")
+    if LLM_PROVIDER == "openai":
+        from backend.clients import crew_llm
+
+        return crew_llm(model)
+    raise ValueError(f"Unknown LLM_PROVIDER: {LLM_PROVIDER!r}")
@@ -0,0 +1,137 @@
+# backend/recorder.py
+
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from backend.config import (
+    RECORDING_ENABLED,
+    RECORDING_PATH,
+    RECORDING_SAMPLE_RATE,
+    EMBEDDING_PROVIDER,
+    LLM_PROVIDER,
+)
+
+# Opt-in log of real policy questions and simulation requests, replayed by
+# backend/replay.py to compare performance between commits. Only fields that
+# are needed to re-issue the request are kept (profile bands, simulator
+# inputs), plus per-stage timings; identifiers typed into a question are
+# masked before anything is written.
+
+# NRIC/FIN, e-mail addresses and 8-digit Singapore phone numbers
+_PII_PATTERNS = (
+    (re.compile(r"\b[STFGM]\d{7}[A-Z]\b", re.I), "[NRIC]"),
+    (re.compile(r"\b[\w.+-]+@[\w-]+\.[\w.-]+\b"), "[EMAIL]"),
+    (re.compile(r"(?<!\d)(?:\+?65[ -]?)?[689]\d{3}[ -]?\d{4}(?!\d)"), "[PHONE]"),
+)
+
+_enabled = RECORDING_ENABLED
+_path = Path(RECORDING_PATH)
+_lock = threading.Lock()
+
+
+def redact(text: str) -> str:
+    for pattern, placeholder in _PII_PATTERNS:
+        text = pattern.sub(placeholder, text)
+    return text
+
+
+class Recording:
+    """
+    One request being recorded: fields to replay it, plus stage timings.
+    """
+
+    def __init__(self, kind: str, fields: Dict[str, Any]):
+        self.kind = kind
+        self.fields = fields
+        self.timings: Dict[str, float] = {}
+
+    def set(self, **fields) -> None:
+        self.fields.update(fields)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[f"{name}_s"] = round(time.perf_counter() - start, 4)
+
+
+class _NoopRecording:
+    def set(self, **fields) -> None:
+        pass
+
+    @contextmanager
+    def stage(self, name: str):
+        yield
+
+
+_NOOP = _NoopRecording()
+
+
+def _write(record: Dict[str, Any]) -> None:
+    line = json.dumps(record, default=str, ensure_ascii=False)
+    with _lock:
+        _path.parent.mkdir(parents=True, exist_ok=True)
+        with _path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+# ---------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def configure(enabled: bool, path: Optional[str] = None) -> None:
+    global _enabled, _path
+    _enabled = enabled
+    if path is not None:
+        _path = Path(path)
+
+
+@contextmanager
+def recording(kind: str, **fields):
+    """
+    with recording("policy", question=q, age_band=a, income_band=i) as rec:
+        with rec.stage("retrieve"):
+            ...
+        rec.set(served="generated")
+
+    Writes one line when the block exits (also on error). A no-op unless
+    RECORDING_ENABLED=1.
+    """
+    if not _enabled or random.random() >= RECORDING_SAMPLE_RATE:
+        yield _NOOP
+        return
+
+    if "question" in fields:
+        fields["question"] = redact(fields["question"])
+    rec = Recording(kind, fields)
+    ts = time.time()
+    start = time.perf_counter()
+    error = None
+    try:
+        yield rec
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        rec.timings["total_s"] = round(time.perf_counter() - start, 4)
+        _write({
+            "ts": round(ts, 3),
+            "kind": kind,
+            **rec.fields,
+            "timings": rec.timings,
+            "providers": {"embedding": EMBEDDING_PROVIDER, "llm": LLM_PROVIDER},
+            "error": error,
+        })
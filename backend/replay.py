@@ -0,0 +1,366 @@
+# backend/replay.py
+"""
+Replay a recorded request log against the current code and compare
+performance between runs or commits.
+
+Record real traffic first (opt-in, non-PII fields plus timings):
+    RECORDING_ENABLED=1 streamlit run Home.py     # appends to data/recordings/requests.jsonl
+
+Each recorded policy question is re-run through the same phases as the page
+(FAQ lookup, retrieval, generation) and each simulation request through
+explain_simulation_results. The run summary holds p50/p95/p99 latency per
+stage, outcome rates and cache hit rates (FAQ store, request coalescing),
+and can be saved as JSON and compared with another run. With --offline the
+local embedder and seeded fake LLM are used, so a replay is repeatable and
+needs no API key.
+
+--commits checks out each commit in a temporary git worktree and replays
+the log there in a fresh process (both commits must include this tool).
+The exit status is 1 if the second run regresses beyond --threshold.
+
+Usage:
+    python -m backend.replay data/recordings/requests.jsonl --offline --out base.json
+    python -m backend.replay data/recordings/requests.jsonl --offline --baseline base.json
+    python -m backend.replay data/recordings/requests.jsonl --offline --commits main HEAD
+    python -m backend.replay data/recordings/requests.jsonl --concurrency 4 --speed 2   # real backends
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backend.load_test import classify_answer
+
+DEFAULT_LOG = Path("data/recordings/requests.jsonl")
+STAGES = ("faq", "retrieve", "generate", "policy", "explain")
+
+# A stage regresses only if it is slower by both margins (filters timer noise)
+MIN_REGRESSION_S = 0.005
+
+
+def load_log(path: Path, kinds: Optional[List[str]] = None, limit: int = 0) -> List[Dict]:
+    records = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            if kinds and rec.get("kind") not in kinds:
+                continue
+            records.append(rec)
+            if limit and len(records) >= limit:
+                break
+    return records
+
+
+def _percentile(ordered: List[float], p: float) -> float:
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class ReplayResults:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.outcomes: Dict[str, Dict[str, int]] = {}
+        self.faq_hits = 0
+        self.faq_lookups = 0
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.latencies[stage].append(seconds)
+
+    def outcome(self, kind: str, outcome: str) -> None:
+        with self._lock:
+            counts = self.outcomes.setdefault(kind, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    def faq(self, hit: bool) -> None:
+        with self._lock:
+            self.faq_lookups += 1
+            self.faq_hits += hit
+
+
+def _timed(results: ReplayResults, stage: str, fn, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        results.record(stage, time.perf_counter() - start)
+
+
+def replay_policy(rec: Dict, results: ReplayResults) -> str:
+    from backend.rag import generate_policy_answer, lookup_faq_answer, retrieve_policy_context
+
+    question = rec["question"]
+    profile = {
+        "Age band": rec.get("age_band", "Prefer not to say"),
+        "Income band": rec.get("income_band", "Prefer not to say"),
+    }
+    start = time.perf_counter()
+    answer = _timed(results, "faq", lookup_faq_answer, question, profile)
+    results.faq(answer is not None)
+    if answer is None:
+        retrieval = _timed(results, "retrieve", retrieve_policy_context, question, profile)
+        answer = _timed(results, "generate", generate_policy_answer, retrieval)
+    results.record("policy", time.perf_counter() - start)
+    return answer
+
+
+def replay_simulation(rec: Dict, results: ReplayResults) -> str:
+    from backend.rag import explain_simulation_results
+
+    return _timed(
+        results,
+        "explain",
+        explain_simulation_results,
+        rec["user_inputs"],
+        rec["scenarios"],
+        rec["base_classification"],
+    )
+
+
+def _replay_one(rec: Dict, results: ReplayResults) -> None:
+    kind = rec.get("kind")
+    try:
+        if kind == "policy":
+            answer = replay_policy(rec, results)
+        elif kind == "simulation":
+            answer = replay_simulation(rec, results)
+        else:
+            return
+    except Exception:
+        results.outcome(kind, "exception")
+        return
+    results.outcome(kind, classify_answer(answer))
+
+
+def run_replay(records: List[Dict], concurrency: int = 1, speed: float = 0.0) -> tuple:
+    """
+    Re-issue the records in log order. With speed > 0 each request starts at
+    its recorded offset divided by speed (open loop); otherwise as soon as one
+    of the `concurrency` workers is free. Returns (results, elapsed seconds).
+    """
+    results = ReplayResults()
+    t0 = records[0].get("ts", 0.0) if records else 0.0
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for rec in records:
+            if speed > 0:
+                delay = (rec.get("ts", t0) - t0) / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            pool.submit(_replay_one, rec, results)
+
+    return results, time.perf_counter() - start
+
+
+def summarise(results: ReplayResults, elapsed: float, flights_before: Dict, flights_after: Dict) -> Dict:
+    from backend.config import EMBEDDING_PROVIDER, LLM_PROVIDER
+
+    stages = {}
+    for stage, samples in results.latencies.items():
+        if not samples:
+            continue
+        ordered = sorted(samples)
+        stages[stage] = {
+            "n": len(ordered),
+            "mean_s": sum(ordered) / len(ordered),
+            "p50_s": _percentile(ordered, 0.50),
+            "p95_s": _percentile(ordered, 0.95),
+            "p99_s": _percentile(ordered, 0.99),
+            "max_s": ordered[-1],
+        }
+
+    hit_rates = {}
+    if results.faq_lookups:
+        hit_rates["faq"] = results.faq_hits / results.faq_lookups
+    for name, after in flights_after.items():
+        before = flights_before.get(name, {})
+        executed = after["executed"] - before.get("executed", 0)
+        coalesced = after["coalesced"] - before.get("coalesced", 0)
+        if executed + coalesced:
+            hit_rates[f"coalesced:{name}"] = coalesced / (executed + coalesced)
+
+    return {
+        "commit": _git_commit(),
+        "providers": {"embedding": EMBEDDING_PROVIDER, "llm": LLM_PROVIDER},
+        "requests": sum(sum(c.values()) for c in results.outcomes.values()),
+        "elapsed_s": elapsed,
+        "stages": stages,
+        "outcomes": results.outcomes,
+        "hit_rates": hit_rates,
+    }
+
+
+def print_summary(summary: Dict) -> None:
+    print(f"Commit {summary['commit']}, providers {summary['providers']}, "
+          f"{summary['requests']} requests in {summary['elapsed_s']:.1f}s")
+    print(f"{'stage':<9} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for stage, s in summary["stages"].items():
+        print(f"{stage:<9} {s['n']:>5} {1e3 * s['p50_s']:>7.1f}ms {1e3 * s['p95_s']:>7.1f}ms "
+              f"{1e3 * s['p99_s']:>7.1f}ms {1e3 * s['max_s']:>7.1f}ms")
+    for kind, counts in summary["outcomes"].items():
+        total = sum(counts.values())
+        print(f"{kind} outcomes: " + ", ".join(f"{k} {100 * v / total:.1f}%" for k, v in sorted(counts.items())))
+    for name, rate in summary["hit_rates"].items():
+        print(f"hit rate {name}: {100 * rate:.1f}%")
+
+
+def _rates(summary: Dict) -> Dict[str, float]:
+    rates = {f"hit {name}": rate for name, rate in summary["hit_rates"].items()}
+    for kind, counts in summary["outcomes"].items():
+        rates[f"{kind} ok"] = counts.get("ok", 0) / sum(counts.values())
+    return rates
+
+
+def compare(base: Dict, cand: Dict, threshold: float) -> List[str]:
+    """
+    Print base vs candidate side by side; return the regressions found:
+    a stage p50/p95 slower by more than `threshold` (relative), a hit rate or
+    ok rate lower by more than `threshold` (absolute).
+    """
+    regressions = []
+    print(f"\n{'':<40} {base['commit'] or 'base':>14} {cand['commit'] or 'candidate':>14} {'change':>9}")
+    for stage in STAGES:
+        if stage not in base["stages"] or stage not in cand["stages"]:
+            continue
+        for stat in ("p50_s", "p95_s"):
+            b, c = base["stages"][stage][stat], cand["stages"][stage][stat]
+            change = (c - b) / b if b else 0.0
+            flag = ""
+            if change > threshold and c - b > MIN_REGRESSION_S:
+                flag = "  REGRESSION"
+                regressions.append(f"{stage} {stat[:-2]} {1e3 * b:.1f}ms -> {1e3 * c:.1f}ms")
+            print(f"{stage + ' ' + stat[:-2]:<40} {1e3 * b:>12.1f}ms {1e3 * c:>12.1f}ms {100 * change:>+8.1f}%{flag}")
+
+    base_rates, cand_rates = _rates(base), _rates(cand)
+    for name in sorted(set(base_rates) | set(cand_rates)):
+        b, c = base_rates.get(name, 0.0), cand_rates.get(name, 0.0)
+        flag = ""
+        if b - c > threshold:
+            flag = "  REGRESSION"
+            regressions.append(f"{name} rate {100 * b:.1f}% -> {100 * c:.1f}%")
+        print(f"{name:<40} {100 * b:>13.1f}% {100 * c:>13.1f}% {100 * (c - b):>+7.1f}pt{flag}")
+    return regressions
+
+
+def replay(args) -> Dict:
+    if args.offline:
+        # Must be set before backend.config is first imported
+        os.environ.setdefault("EMBEDDING_PROVIDER", "local")
+        os.environ.setdefault("LLM_PROVIDER", "fake")
+    os.environ.setdefault("FAKE_LLM_SEED", str(args.seed))
+
+    from backend.singleflight import singleflight_stats
+    from backend.vector_store import corpus_records
+
+    records = load_log(args.log, args.kind, args.limit) * args.repeat
+    if not records:
+        raise SystemExit(f"No requests to replay in {args.log}")
+
+    # Load the corpus and run one request of each kind untimed: the first
+    # CrewAI kickoff in a process pays several seconds of one-off setup
+    corpus_records()
+    warmup = {rec["kind"]: rec for rec in reversed(records)}
+    for rec in warmup.values():
+        _replay_one(rec, ReplayResults())
+
+    flights_before = singleflight_stats()
+    results, elapsed = run_replay(records, args.concurrency, args.speed)
+    return summarise(results, elapsed, flights_before, singleflight_stats())
+
+
+def _passthrough(args) -> List[str]:
+    flags = ["--concurrency", str(args.concurrency), "--speed", str(args.speed),
+             "--repeat", str(args.repeat), "--seed", str(args.seed), "--limit", str(args.limit)]
+    for kind in args.kind or []:
+        flags += ["--kind", kind]
+    if args.offline:
+        flags.append("--offline")
+    return flags
+
+
+def replay_commits(args) -> List[Dict]:
+    """
+    Replay the log on each commit in its own worktree and fresh process.
+    """
+    log = args.log.resolve()
+    summaries = []
+    with tempfile.TemporaryDirectory(prefix="replay-") as tmp:
+        for i, commit in enumerate(args.commits):
+            tree, out = Path(tmp) / f"tree{i}", Path(tmp) / f"run{i}.json"
+            subprocess.run(["git", "worktree", "add", "--detach", str(tree), commit],
+                           check=True, capture_output=True)
+            try:
+                print(f"Replaying {log} on {commit} ...", flush=True)
+                subprocess.run(
+                    [sys.executable, "-m", "backend.replay", str(log), "--out", str(out), *_passthrough(args)],
+                    cwd=tree,
+                    check=True,
+                )
+                summaries.append(json.loads(out.read_text(encoding="utf-8")))
+            finally:
+                subprocess.run(["git", "worktree", "remove", "--force", str(tree)], capture_output=True)
+    return summaries
+
+
+def main(args) -> int:
+    if args.commits:
+        base, cand = replay_commits(args)
+    else:
+        cand = replay(args)
+        print_summary(cand)
+        if args.out:
+            args.out.parent.mkdir(parents=True, exist_ok=True)
+            args.out.write_text(json.dumps(cand, indent=2), encoding="utf-8")
+        if not args.baseline:
+            return 0
+        base = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    regressions = compare(base, cand, args.threshold)
+    if regressions:
+        print("\nRegressions:\n- " + "\n- ".join(regressions))
+        return 1
+    print("\nNo regressions beyond the threshold.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", type=Path, nargs="?", default=DEFAULT_LOG, help="Recorded request log (JSONL).")
+    parser.add_argument("--offline", action="store_true", help="Use the local embedder and seeded fake LLM.")
+    parser.add_argument("--kind", action="append", choices=["policy", "simulation"], help="Only replay this kind.")
+    parser.add_argument("--limit", type=int, default=0, help="Replay at most this many records (0 = all).")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the log this many times in a row.")
+    parser.add_argument("--concurrency", type=int, default=1, help="Requests in flight at once.")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Keep the recorded arrival times, sped up by this factor (0 = back to back).")
+    parser.add_argument("--seed", type=int, default=0, help="FAKE_LLM_SEED for offline replays.")
+    parser.add_argument("--out", type=Path, help="Save the run summary as JSON.")
+    parser.add_argument("--baseline", type=Path, help="Compare against a saved run summary.")
+    parser.add_argument("--commits", nargs=2, metavar=("BASE", "CANDIDATE"),
+                        help="Replay on two git commits and compare them.")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative latency / absolute rate change that counts as a regression.")
+    sys.exit(main(parser.parse_args()))
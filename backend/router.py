@@ -0,0 +1,209 @@
+# backend/router.py
+
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from backend.config import OPENAI_MODEL, OPENAI_MODEL_FAST, ROUTER_MODEL_TIERING
+from backend.vector_store import corpus_records
+
+# Hand-curated cues per corpus topic. Multi-word phrases count 1.5x.
+TOPIC_KEYWORDS: Dict[str, List[str]] = {
+    "retirement_sums": [
+        "brs", "frs", "ers", "retirement sum", "retirement sums", "basic retirement",
+        "full retirement", "enhanced retirement", "cohort", "set aside",
+    ],
+    "cpf_life": [
+        "cpf life", "annuity", "standard plan", "basic plan", "escalating",
+        "monthly payout", "monthly payouts", "lifelong", "bequest",
+    ],
+    "payout_age": [
+        "payout age", "payout eligibility age", "start payouts", "payouts start",
+        "defer", "delay", "age 65", "age 70",
+    ],
+    "withdrawals": [
+        "withdraw", "withdrawal", "withdrawals", "age 55", "at 55", "turn 55",
+        "lump sum", "5000", "5 000", "take out",
+    ],
+    "withdrawal_process": [
+        "apply", "application", "paynow", "bank account", "steps", "submit",
+        "how do i withdraw", "how to withdraw",
+    ],
+    "property": [
+        "hdb", "flat", "property", "housing", "home loan", "buy a home", "mortgage",
+        "pledge", "lease", "house", "condo",
+    ],
+    "interest": [
+        "interest", "extra interest", "interest rate", "interest rates", "floor rate",
+        "earn interest", "returns",
+    ],
+    "topups": [
+        "top up", "top ups", "topup", "topups", "rstu", "tax relief", "transfer",
+        "voluntary contribution",
+    ],
+    "medisave": [
+        "medisave", "medisave account", "medical", "hospital", "hospitalisation", "basic healthcare sum",
+        "bhs", "medishield", "careshield", "healthcare",
+    ],
+    "contributions": [
+        "contribution", "contributions", "contribution rate", "contribution rates",
+        "employer", "employee", "wage", "wages", "salary", "ordinary wage",
+    ],
+}
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for",
+    "from", "how", "i", "if", "in", "is", "it", "my", "of", "on", "or", "so",
+    "that", "the", "this", "to", "what", "when", "where", "which", "who", "why",
+    "will", "with", "you", "your", "cpf", "s", "me", "there", "their", "they",
+}
+
+# Question openings that usually signal a definitional ("what is X") query
+_DEFINITIONAL_RE = re.compile(
+    r"^(what\s+(is|are|does)|define|meaning\s+of|explain|tell\s+me\s+about|who\s+is)\b"
+)
+
+# Cues of a personal scenario, a comparison or a multi-part question. A bare
+# "my" is not one: "Can I withdraw my CPF at 55?" is a simple eligibility question.
+_COMPLEX_RE = re.compile(
+    r"\b(if|i\s+have|i\s+am|i'm|should|compare|versus|vs|difference|both|"
+    r"scenario|calculate|planning|afford|better)\b|\$|\d{3,}"
+)
+
+SIMPLE_MAX_WORDS = 12
+
+
+@dataclass
+class RouteDecision:
+    topics: Optional[List[str]]  # None = search the whole corpus
+    complexity: str  # "simple" or "complex"
+    model: str
+    scores: Dict[str, float] = field(default_factory=dict)
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def _keyword_patterns() -> Dict[str, List[tuple]]:
+    patterns = {}
+    for topic, keywords in TOPIC_KEYWORDS.items():
+        patterns[topic] = [
+            (re.compile(r"\b" + r"\s+".join(map(re.escape, kw.split())) + r"\b"),
+             1.5 if " " in kw else 1.0)
+            for kw in keywords
+        ]
+    return patterns
+
+
+_PATTERNS = _keyword_patterns()
+
+
+class _TopicCentroids:
+    """
+    TF-IDF centroid of each topic's chunk text, built once from the corpus.
+    Purely lexical, so routing needs no embedding call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._centroids: Optional[Dict[str, Dict[str, float]]] = None
+
+    def get(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            if self._centroids is None:
+                self._centroids = self._build(corpus_records())
+            return self._centroids
+
+    @staticmethod
+    def _build(records: List[Dict]) -> Dict[str, Dict[str, float]]:
+        counts: Dict[str, Counter] = {}
+        for rec in records:
+            text = f"{rec.get('title', '')} {rec.get('text', '')}"
+            words = [w for w in _words(text) if w not in _STOPWORDS and not w.isdigit()]
+            counts.setdefault(rec.get("topic", "general"), Counter()).update(words)
+
+        n_topics = len(counts)
+        doc_freq = Counter()
+        for c in counts.values():
+            doc_freq.update(c.keys())
+
+        centroids = {}
+        for topic, c in counts.items():
+            weights = {
+                w: (1 + math.log(tf)) * math.log(1 + n_topics / doc_freq[w])
+                for w, tf in c.items()
+            }
+            norm = math.sqrt(sum(v * v for v in weights.values())) or 1.0
+            centroids[topic] = {w: v / norm for w, v in weights.items()}
+        return centroids
+
+
+_centroids = _TopicCentroids()
+
+
+def score_topics(question: str) -> Dict[str, float]:
+    """
+    Keyword score plus (scaled) lexical-centroid cosine for every topic.
+    """
+    text = " ".join(_words(question))
+    query_words = {w for w in text.split() if w not in _STOPWORDS}
+    q_norm = math.sqrt(len(query_words)) or 1.0
+
+    scores: Dict[str, float] = {}
+    for topic, centroid in _centroids.get().items():
+        keyword_score = sum(weight for pattern, weight in _PATTERNS.get(topic, []) if pattern.search(text))
+        cosine = sum(centroid.get(w, 0.0) for w in query_words) / q_norm
+        scores[topic] = keyword_score + 4.0 * cosine
+    return scores
+
+
+def predict_topics(
+    question: str,
+    min_score: float = 1.0,
+    relative_cutoff: float = 0.5,
+    max_topics: int = 3,
+) -> tuple:
+    """
+    Topics worth searching for this question, or None when the router is not
+    confident enough to narrow the search. Returns (topics, scores).
+    """
+    scores = score_topics(question)
+    ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    if not ranked or ranked[0][1] < min_score:
+        return None, scores
+
+    top = ranked[0][1]
+    topics = [t for t, s in ranked[:max_topics] if s >= top * relative_cutoff]
+    return topics, scores
+
+
+def classify_complexity(question: str) -> str:
+    """
+    'simple' for short, single, definitional questions; 'complex' for
+    scenarios, comparisons and multi-part questions, and for anything the
+    rules are unsure of, so that doubt always lands on the strong model.
+    """
+    text = " ".join(_words(question))
+    raw = (question or "").lower()
+    content_words = [w for w in text.split() if w not in _STOPWORDS]
+
+    if raw.count("?") > 1 or _COMPLEX_RE.search(raw):
+        return "complex"
+    if len(content_words) > SIMPLE_MAX_WORDS:
+        return "complex"
+    if _DEFINITIONAL_RE.search(text) or len(content_words) <= 6:
+        return "simple"
+    return "complex"
+
+
+def route_question(question: str) -> RouteDecision:
+    topics, scores = predict_topics(question)
+    complexity = classify_complexity(question)
+    model = OPENAI_MODEL_FAST if ROUTER_MODEL_TIERING and complexity == "simple" else OPENAI_MODEL
+    return RouteDecision(topics=topics, complexity=complexity, model=model, scores=scores)
@@ -1,9 +1,66 @@
 # backend/simulator.py
 
-from backend.config import CURRENT_YEAR_BRS, CURRENT_YEAR_FRS, CURRENT_YEAR_ERS
-from dataclasses import dataclass
-from typing import List, Dict
+from backend import metrics
+from backend.config import (
+    BASIC_HEALTHCARE_SUM,
+    CPF_LIFE_DEFERRAL_BONUS,
+    CPF_LIFE_PLANS,
+    DECUMULATION_END_AGE,
+    CPF_EXTRA_INTEREST_OA_CAP,
+    CPF_OA_INTEREST_RATE,
+    CPF_SMRA_INTEREST_RATE,
+    RA_FORMATION_TARGET,
+    CURRENT_YEAR_LABEL,
+    RETIREMENT_SUM_GROWTH,
+    RETIREMENT_SUMS_PATH,
+    SIMULATOR_CACHE_SIZE,
+    SIMULATOR_ACCOUNTS_CHUNK,
+    SIMULATOR_MC_PATHS,
+    SIMULATOR_MC_CHUNK,
+    SIMULATOR_RETURN_VOLATILITY,
+    SIMULATOR_GROWTH_VOLATILITY,
+)
+from collections import OrderedDict
+from dataclasses import asdict, astuple, dataclass, field
+from typing import Callable, List, Dict, Mapping, Optional, Tuple
+import functools
 import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Quick presets offered on the simulator page (values use the page's input keys)
+PRESETS: Dict[str, Dict[str, float]] = {
+    "Typical 35-year-old (mid-income)": {
+        "current_age": 35,
+        "retirement_age": 65,
+        "current_savings": 60_000.0,
+        "monthly_contribution": 900.0,
+        "salary_growth_rate_pct": 2.0,
+        "assumed_return_rate_pct": 4.0,
+        "target_income": 2200.0,
+    },
+    "Age 45, catching up": {
+        "current_age": 45,
+        "retirement_age": 65,
+        "current_savings": 140_000.0,
+        "monthly_contribution": 1_000.0,
+        "salary_growth_rate_pct": 1.5,
+        "assumed_return_rate_pct": 4.0,
+        "target_income": 2500.0,
+    },
+    "Near retirement (age 55)": {
+        "current_age": 55,
+        "retirement_age": 65,
+        "current_savings": 260_000.0,
+        "monthly_contribution": 1_100.0,
+        "salary_growth_rate_pct": 1.0,
+        "assumed_return_rate_pct": 4.0,
+        "target_income": 2500.0,
+    },
+}
+
 
 @dataclass
 class RetirementInputs:
@@ -48,68 +105,1108 @@ def project_savings(inputs: RetirementInputs) -> float:
     return balance
 
 
-def build_scenarios(inputs: RetirementInputs) -> List[ScenarioResult]:
+@dataclass
+class BatchProjection:
+    final_balance: np.ndarray  # (n,) balance at each profile's retirement age
+    years: np.ndarray  # (n,) years to retirement
+    # (n, max(years) + 1) balance after 0..max(years) years; NaN past retirement
+    paths: Optional[np.ndarray] = None
+
+
+def _as_float_array(profiles, key: str) -> np.ndarray:
+    return np.atleast_1d(np.asarray(profiles[key], dtype="float64"))
+
+
+def _growth_factors(n: np.ndarray, r: np.ndarray, g: np.ndarray) -> tuple:
     """
-    Build a few simple comparison scenarios:
-    - Base case
-    - Retire 2 years later
-    - Increase monthly contribution by 20%
+    (1+r)^n and S = sum_{k<n} ((1+g)/(1+r))^k, so that the balance after n
+    years is (1+r)^n * (b0 + c0 * S). S is computed as expm1(nL) / expm1(L)
+    with L = log((1+g)/(1+r)), which stays accurate as g approaches r (where
+    S -> n) instead of dividing two nearly equal differences.
     """
-    scenarios: List[ScenarioResult] = []
+    log_q = np.log1p(g) - np.log1p(r)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        series = np.where(log_q == 0.0, n, np.expm1(n * log_q) / np.expm1(log_q))
+    return np.power(1.0 + r, n), series
 
-    # 1) Base case
-    base_projection = project_savings(inputs)
-    scenarios.append(
-        ScenarioResult(
-            name="Base case",
-            retirement_age=inputs.retirement_age,
-            projected_savings=base_projection,
-            notes="Projection using your current inputs."
+
+def project_savings_batch(profiles: Mapping, paths: bool = False) -> BatchProjection:
+    """
+    Vectorised project_savings for many profiles at once (same model:
+    contribution added, then interest, then contributions grow), using the
+    closed form
+
+        B = b0 (1+r)^n + c0 (1+r) ((1+r)^n - (1+g)^n) / (r - g)
+
+    with c0 = 12 x monthly contribution (c0 (1+r) n (1+r)^(n-1) when r == g).
+
+    profiles maps the RetirementInputs field names to arrays of equal length:
+    a dict of arrays, a DataFrame or a NumPy structured array all work. With
+    paths=True the year-by-year balances are returned as well (memory is
+    n x (max years + 1) floats).
+    """
+    current_age = _as_float_array(profiles, "current_age")
+    retirement_age = _as_float_array(profiles, "retirement_age")
+    b0 = _as_float_array(profiles, "current_savings")
+    c0 = _as_float_array(profiles, "monthly_contribution") * 12
+    g = _as_float_array(profiles, "salary_growth_rate")
+    r = _as_float_array(profiles, "assumed_return_rate")
+
+    years = retirement_age - current_age
+    if np.any(years < 0):
+        raise ValueError("Retirement age must be >= current age")
+
+    growth, series = _growth_factors(years, r, g)
+    result = BatchProjection(final_balance=growth * (b0 + c0 * series), years=years.astype("int64"))
+
+    if paths:
+        horizon = int(years.max(initial=0))
+        path = _step_paths(b0, c0.copy(), r, g, horizon)
+        path[np.arange(horizon + 1)[:, None] > years[None, :]] = np.nan
+        result.paths = path.T
+
+    return result
+
+
+def _step_paths(balance: np.ndarray, contribution: np.ndarray, r: np.ndarray, g: np.ndarray, steps: int) -> np.ndarray:
+    """
+    Balances after 0..steps more years, shape (steps + 1, n), starting from
+    balance with contribution due in the first year. contribution is
+    advanced in place to the one due in the year after the last step.
+    """
+    # One vectorised step per year, filled year-major so each step writes
+    # contiguous memory
+    path = np.empty((steps + 1, len(balance)))
+    path[0] = balance
+    growth = 1.0 + r
+    for year in range(1, steps + 1):
+        np.add(path[year - 1], contribution, out=path[year])
+        path[year] *= growth
+        contribution *= 1.0 + g
+    return path
+
+
+class _PathCache:
+    """
+    Year-by-year paths memoised on everything except the horizon. A longer
+    horizon resumes from the last cached year instead of starting again,
+    and a shorter one is a slice of what is cached.
+
+    extend(key, rows, carry, years) returns the rows for years
+    len(rows) .. years and the carry (e.g. the next contribution) to resume
+    from later; rows and carry are None when nothing is cached yet.
+    """
+
+    def __init__(self, extend: Callable, maxsize: int):
+        self._extend = extend
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.extensions = self.misses = 0
+
+    def get(self, key: tuple, years: int) -> np.ndarray:
+        """
+        Read-only rows 0..years for key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if len(entry[0]) > years:
+                    self.hits += 1
+                    return entry[0][: years + 1]
+        rows, carry = entry if entry is not None else (None, None)
+        new_rows, carry = self._extend(key, rows, carry, years)
+        rows = new_rows if rows is None else np.concatenate([rows, new_rows])
+        rows.flags.writeable = False
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.extensions += 1
+            current = self._entries.get(key)
+            # Another session may have extended the same prefix meanwhile
+            if current is None or len(current[0]) < len(rows):
+                self._entries[key] = (rows, carry)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return rows[: years + 1]
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "extensions": self.extensions, "misses": self.misses,
+                    "entries": len(self._entries)}
+
+
+@dataclass(frozen=True)
+class YearlyProjection:
+    """
+    Year-by-year projection for one set of inputs, as columns indexed by age
+    (current age .. retirement age). Arrays are shared by every caller with
+    the same inputs and are read-only.
+    """
+
+    age: np.ndarray
+    balance: np.ndarray  # at the start of each age
+    contribution: np.ndarray  # paid in during the year from that age (0 at retirement)
+    interest: np.ndarray  # credited during the year from that age (0 at retirement)
+
+    @property
+    def final_balance(self) -> float:
+        return float(self.balance[-1])
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "Age": self.age,
+            "Year": self.age - self.age[0],  # years from now
+            "Contribution (S$)": self.contribution,
+            "Interest (S$)": self.interest,
+            "Projected savings (S$)": self.balance,
+        })
+
+
+def _extend_balance_path(prefix: tuple, rows: Optional[np.ndarray], carry, years: int) -> tuple:
+    current_savings, monthly_contribution, g, r = prefix
+    if rows is None:
+        start, balance, contribution = 0, current_savings, monthly_contribution * 12
+    else:
+        start, balance, contribution = len(rows) - 1, rows[-1], carry
+    contribution = np.array([contribution], dtype="float64")
+    path = _step_paths(np.array([balance]), contribution, np.array([r]), np.array([g]), years - start)
+    new_rows = path[:, 0] if rows is None else path[1:, 0]
+    return new_rows, float(contribution[0])
+
+
+# Balance paths keyed on (current_savings, monthly_contribution, growth, return)
+_balance_paths = _PathCache(_extend_balance_path, SIMULATOR_CACHE_SIZE)
+
+
+@functools.lru_cache(maxsize=SIMULATOR_CACHE_SIZE)
+def _yearly_projection(key: tuple) -> YearlyProjection:
+    inputs = RetirementInputs(*key)
+    years = inputs.retirement_age - inputs.current_age
+    balance = _balance_paths.get(
+        (inputs.current_savings, inputs.monthly_contribution, inputs.salary_growth_rate, inputs.assumed_return_rate),
+        years,
+    )
+
+    contribution = np.zeros(years + 1)
+    contribution[:years] = inputs.monthly_contribution * 12 * (1 + inputs.salary_growth_rate) ** np.arange(years)
+    interest = np.zeros(years + 1)
+    interest[:years] = np.diff(balance) - contribution[:years]
+
+    columns = {
+        "age": np.arange(inputs.current_age, inputs.retirement_age + 1),
+        "balance": balance,
+        "contribution": contribution,
+        "interest": interest,
+    }
+    for column in columns.values():
+        column.flags.writeable = False
+    return YearlyProjection(**columns)
+
+
+def project_yearly(inputs: RetirementInputs) -> YearlyProjection:
+    """
+    Year-by-year version of project_savings (same compounding order), from
+    the batch engine. Results are memoised on the inputs for the life of the
+    process, so reruns and other sessions with the same inputs reuse them;
+    the balance path is also shared across retirement ages, so moving the
+    retirement age only computes the years not seen before.
+    """
+    if inputs.retirement_age < inputs.current_age:
+        raise ValueError("Retirement age must be >= current age")
+    return _yearly_projection(astuple(inputs))
+
+
+MC_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    """
+    Percentile bands of the balance at each age over n_paths stochastic
+    paths, plus the share of paths reaching each retirement sum and (with
+    a target income) meeting it every year of retirement on each CPF LIFE
+    plan.
+    """
+
+    age: np.ndarray
+    percentiles: Tuple[float, ...]
+    bands: np.ndarray  # (len(percentiles), len(age)); bands[i] is the percentiles[i] path
+    prob_reach: Dict[str, float]  # "BRS" / "FRS" / "ERS" -> share of final balances >= that sum
+    n_paths: int
+    prob_meet_target: Dict[str, float] = field(default_factory=dict)  # plan -> share of paths
+
+    def band(self, percentile: float) -> np.ndarray:
+        return self.bands[self.percentiles.index(percentile)]
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame({"Age": self.age})
+        for p, band in zip(self.percentiles, self.bands):
+            frame[f"P{p:g} (S$)"] = band
+        return frame
+
+
+def _monte_carlo_chunk(
+    inputs: RetirementInputs,
+    rng: np.random.Generator,
+    n: int,
+    return_volatility: float,
+    growth_volatility: float,
+) -> np.ndarray:
+    """
+    Balances for n paths, shape (years + 1, n). Each year's return and
+    contribution growth are drawn independently (normal around the inputs).
+    """
+    years = inputs.retirement_age - inputs.current_age
+    returns = rng.standard_normal((years, n))
+    returns *= return_volatility
+    returns += 1.0 + inputs.assumed_return_rate
+    growth = rng.standard_normal((years, n))
+    growth *= growth_volatility
+    growth += 1.0 + inputs.salary_growth_rate
+
+    balance = np.empty((years + 1, n))
+    balance[0] = inputs.current_savings
+    contribution = np.full(n, inputs.monthly_contribution * 12.0)
+    for year in range(years):
+        np.add(balance[year], contribution, out=balance[year + 1])
+        balance[year + 1] *= returns[year]
+        contribution *= growth[year]
+    return balance
+
+
+@functools.lru_cache(maxsize=SIMULATOR_CACHE_SIZE)
+def _monte_carlo(
+    key: tuple,
+    n_paths: int,
+    return_volatility: float,
+    growth_volatility: float,
+    seed: int,
+    chunk_size: int,
+    percentiles: Tuple[float, ...],
+    target_income: float,
+) -> MonteCarloResult:
+    inputs = RetirementInputs(*key)
+    years = inputs.retirement_age - inputs.current_age
+
+    # Balances are kept as float32 (ample for S$ percentiles, half the
+    # memory); random draws only ever exist for one chunk at a time.
+    balances = np.empty((years + 1, n_paths), dtype="float32")
+    n_chunks = -(-n_paths // chunk_size)
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        start = i * chunk_size
+        stop = min(start + chunk_size, n_paths)
+        balances[:, start:stop] = _monte_carlo_chunk(
+            inputs, np.random.default_rng(child), stop - start, return_volatility, growth_volatility
         )
+
+    bands = np.percentile(balances, percentiles, axis=1).astype("float64")
+    final = balances[-1]
+    paths_by_class = np.bincount(classify(final, cohort_retirement_sums(inputs.current_age)), minlength=4)
+    prob_reach = {
+        name: float(paths_by_class[i + 1:].sum()) / n_paths for i, name in enumerate(RETIREMENT_SUM_NAMES)
+    }
+    prob_meet_target = {}
+    if target_income > 0:
+        retirement = decumulate(
+            final, inputs.retirement_age, inputs.assumed_return_rate, target_income, current_age=inputs.current_age
+        )
+        prob_meet_target = dict(zip(retirement.plans, retirement.meets_target.mean(axis=1).tolist()))
+    age = np.arange(inputs.current_age, inputs.retirement_age + 1)
+    for array in (age, bands):
+        array.flags.writeable = False
+    return MonteCarloResult(
+        age=age, percentiles=percentiles, bands=bands, prob_reach=prob_reach, n_paths=n_paths,
+        prob_meet_target=prob_meet_target,
     )
 
-    # 2) Retire 2 years later (if possible)
-    if inputs.retirement_age + 2 <= 75:  # arbitrary cap
-        later_inputs = RetirementInputs(
-            current_age=inputs.current_age,
-            retirement_age=inputs.retirement_age + 2,
-            current_savings=inputs.current_savings,
-            monthly_contribution=inputs.monthly_contribution,
-            salary_growth_rate=inputs.salary_growth_rate,
-            assumed_return_rate=inputs.assumed_return_rate,
+
+def simulate_monte_carlo(
+    inputs: RetirementInputs,
+    n_paths: int = SIMULATOR_MC_PATHS,
+    return_volatility: float = SIMULATOR_RETURN_VOLATILITY,
+    growth_volatility: float = SIMULATOR_GROWTH_VOLATILITY,
+    seed: int = 0,
+    chunk_size: int = SIMULATOR_MC_CHUNK,
+    percentiles: Tuple[float, ...] = MC_PERCENTILES,
+    target_income: float = 0.0,
+) -> MonteCarloResult:
+    """
+    Monte Carlo version of project_yearly: the return and contribution
+    growth rates vary from year to year (standard deviations
+    return_volatility / growth_volatility around the inputs), over n_paths
+    paths drawn chunk_size at a time. With a target_income, every path's
+    final balance is also run through decumulate.
+
+    Results are reproducible for the same seed and chunk_size, and memoised
+    like project_yearly.
+    """
+    if inputs.retirement_age < inputs.current_age:
+        raise ValueError("Retirement age must be >= current age")
+    if n_paths < 1 or chunk_size < 1:
+        raise ValueError("n_paths and chunk_size must be positive")
+    return _monte_carlo(
+        astuple(inputs), n_paths, return_volatility, growth_volatility, seed, chunk_size, tuple(percentiles),
+        target_income,
+    )
+
+
+# ---------------------------------------------------------------------
+# Monthly OA / SA / MA / RA engine
+# ---------------------------------------------------------------------
+
+OA, SA, MA, RA = range(4)
+ACCOUNTS = ("OA", "SA", "MA", "RA")
+
+# Contribution rates (% of wage) to OA / SA (RA from 55) / MA for each age
+# band, by the band's lower bound (2025 rates; example values). Only the
+# shares matter: the engine splits each month's total contribution.
+ALLOCATION_AGE_BANDS = np.array([0, 35, 45, 50, 55, 60, 65, 70])
+ALLOCATION_RATES = np.array([
+    [23.0, 6.0, 8.0],
+    [21.0, 7.0, 9.0],
+    [19.0, 8.0, 10.0],
+    [15.0, 11.5, 10.5],
+    [11.5, 10.5, 10.5],
+    [3.5, 9.5, 10.5],
+    [1.0, 5.0, 10.5],
+    [1.0, 1.0, 10.5],
+])
+ALLOCATION_SHARES = ALLOCATION_RATES / ALLOCATION_RATES.sum(axis=1, keepdims=True)
+
+# Extra interest: +1% on the first S$60k of combined balances below 55;
+# from 55, +2% on the first S$30k and +1% on the next S$30k.
+_EXTRA_TIER_1, _EXTRA_TIER_2 = 30_000.0, 60_000.0
+
+
+@dataclass
+class AccountProjection:
+    balances: np.ndarray  # (4, n) OA / SA / MA / RA at each member's retirement age
+    years: np.ndarray  # (n,) years to retirement
+    # (max(years) + 1, 4, n) balances at each birthday; NaN past retirement
+    yearly: Optional[np.ndarray] = None
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.balances.sum(axis=0)
+
+
+def _allocation_band(age: np.ndarray) -> np.ndarray:
+    return np.searchsorted(ALLOCATION_AGE_BANDS, age, side="right") - 1
+
+
+def split_savings(current_age: int, total: float) -> Dict[str, float]:
+    """
+    Rough OA / SA / MA / RA split of a single savings figure, in the
+    proportions contributions are allocated at current_age.
+    """
+    oa, special, ma = ALLOCATION_SHARES[_allocation_band(np.array([current_age]))[0]] * total
+    if current_age >= 55:
+        return {"oa": oa, "sa": 0.0, "ma": ma, "ra": special}
+    return {"oa": oa, "sa": special, "ma": ma, "ra": 0.0}
+
+
+def _extra_interest(state: np.ndarray, senior: np.ndarray) -> np.ndarray:
+    """
+    Annual extra interest earned by the RA, OA, SA and MA (rows in that
+    order, which is also the order balances count towards the tiers; the OA
+    counts up to its cap). senior is 1.0 from 55, else 0.0.
+    """
+    cumulative = np.zeros((5, state.shape[1]))
+    cumulative[1] = state[RA]
+    np.add(cumulative[1], np.minimum(state[OA], CPF_EXTRA_INTEREST_OA_CAP), out=cumulative[2])
+    np.add(cumulative[2], state[SA], out=cumulative[3])
+    np.add(cumulative[3], state[MA], out=cumulative[4])
+    # +1% on everything within the second tier, +1% more within the first from 55
+    first = np.diff(np.minimum(cumulative, _EXTRA_TIER_1), axis=0)
+    extra = np.diff(np.minimum(cumulative, _EXTRA_TIER_2), axis=0)
+    first *= 0.01 * senior
+    extra *= 0.01
+    extra += first
+    return extra
+
+
+def _credit_special(state: np.ndarray, amount: np.ndarray, senior: np.ndarray, ra_cap: np.ndarray) -> None:
+    """
+    Pay amount into the SA, or from 55 (senior == 1.0) into the RA up to
+    ra_cap with the rest to the OA.
+    """
+    to_ra = np.maximum(ra_cap - state[RA], 0.0)
+    np.minimum(to_ra, amount, out=to_ra)
+    to_ra *= senior
+    state[SA] += amount * (1.0 - senior)
+    state[RA] += to_ra
+    state[OA] += amount * senior - to_ra
+
+
+def _form_ra(state: np.ndarray, forming: np.ndarray, target: np.ndarray, from_oa: bool) -> None:
+    """
+    Set aside the RA for members in forming: SA first, then (if from_oa) OA,
+    up to target. Whatever is left in the SA moves to the OA.
+    """
+    need = np.where(forming, np.maximum(target - state[RA], 0.0), 0.0)
+    moved = np.minimum(state[SA], need)
+    state[RA] += moved
+    need -= moved
+    if from_oa:
+        from_oa_amount = np.minimum(state[OA], need)
+        state[OA] -= from_oa_amount
+        state[RA] += from_oa_amount
+    leftover = np.where(forming, state[SA] - moved, 0.0)
+    state[SA] -= moved + leftover
+    state[OA] += leftover
+
+
+def _project_accounts_chunk(
+    current_age: np.ndarray,
+    years: np.ndarray,
+    state: np.ndarray,
+    contribution: np.ndarray,
+    growth: np.ndarray,
+    target: np.ndarray,
+    frs: np.ndarray,
+    snapshots: Optional[np.ndarray],
+) -> np.ndarray:
+    """
+    Step one chunk of members to retirement; state and contribution are
+    updated in place, snapshots (if given) filled at each birthday. target
+    and frs are each member's cohort RA formation sum and FRS. Returns the
+    (4, n) balances at retirement.
+    """
+    monthly_base_rates = np.array([CPF_OA_INTEREST_RATE] + [CPF_SMRA_INTEREST_RATE] * 3)[:, None] / 12.0
+    ra_cap = np.maximum(frs, target)
+    final = state.copy()
+    accrued = np.zeros_like(state)
+    accrued_oa_extra = np.zeros(len(years))
+    _form_ra(state, current_age > 55, 0.0, from_oa=False)
+    if snapshots is not None:
+        snapshots[0] = state
+
+    # Every member starts on a birthday, so age bands, contribution growth
+    # and RA formation change for everyone in the same month. Members keep
+    # being stepped after they retire; their balances are read off at
+    # retirement and the later values are discarded.
+    for year in range(int(years.max(initial=0))):
+        age = current_age + year
+        senior = (age >= 55).astype("float64")
+        if year:
+            contribution *= growth
+        _form_ra(state, age == 55, target, from_oa=True)
+        oa_share, special_share, ma_share = ALLOCATION_SHARES[_allocation_band(age)].T * contribution
+
+        for _ in range(12):
+            extra = _extra_interest(state, senior)
+            extra /= 12.0
+            accrued += state * monthly_base_rates
+            accrued[RA] += extra[0]
+            accrued_oa_extra += extra[1]
+            accrued[SA] += extra[2]
+            accrued[MA] += extra[3]
+
+            state[OA] += oa_share
+            state[MA] += ma_share
+            overflow = np.maximum(state[MA] - BASIC_HEALTHCARE_SUM, 0.0)
+            state[MA] -= overflow
+            _credit_special(state, special_share + overflow, senior, ra_cap)
+
+        state += accrued
+        _credit_special(state, accrued_oa_extra, senior, ra_cap)
+        accrued[:] = 0.0
+        accrued_oa_extra[:] = 0.0
+        overflow = np.maximum(state[MA] - BASIC_HEALTHCARE_SUM, 0.0)
+        state[MA] -= overflow
+        _credit_special(state, overflow, senior, ra_cap)
+
+        retiring = years == year + 1
+        final[:, retiring] = state[:, retiring]
+        if snapshots is not None:
+            in_work = years > year
+            snapshots[year + 1][:, in_work] = state[:, in_work]
+
+    return final
+
+
+def project_accounts_batch(
+    profiles: Mapping,
+    yearly: bool = False,
+    ra_target: str = RA_FORMATION_TARGET,
+    chunk_size: int = SIMULATOR_ACCOUNTS_CHUNK,
+) -> AccountProjection:
+    """
+    Month-by-month OA / SA / MA / RA projection for many members in
+    lock-step, with state held in (4, n) arrays and members stepped
+    chunk_size at a time (small enough to stay in CPU cache).
+
+    profiles maps current_age, retirement_age, oa, sa, ma, ra,
+    monthly_contribution and salary_growth_rate to arrays of equal length
+    (contributions grow at each birthday). Each month:
+
+    - interest accrues on the opening balances: the floor rates plus extra
+      interest, credited at the end of each member-year; extra interest
+      earned on the OA is paid into the SA / RA
+    - the contribution is split by the member's age-band allocation
+    - MediSave above the Basic Healthcare Sum overflows to SA / RA
+
+    At 55 the RA is formed against ra_target from the SA, then the OA, and
+    the SA is closed. From 55, payments into the RA stop at the FRS (or
+    ra_target, if higher) and the rest goes to the OA. Both are the sums of
+    each member's cohort (cohort_retirement_sums). Members already over
+    55 only have their SA moved. The assumed_return_rate used elsewhere
+    plays no part here.
+    """
+    current_age = _as_float_array(profiles, "current_age").astype("int64")
+    retirement_age = _as_float_array(profiles, "retirement_age").astype("int64")
+    years = retirement_age - current_age
+    if np.any(years < 0):
+        raise ValueError("Retirement age must be >= current age")
+    if ra_target not in RETIREMENT_SUM_NAMES:
+        raise ValueError(f"ra_target must be one of {', '.join(RETIREMENT_SUM_NAMES)}")
+    sums = cohort_retirement_sums(current_age)
+    target, frs = sums[:, RETIREMENT_SUM_NAMES.index(ra_target)], sums[:, 1]
+
+    state = np.stack([_as_float_array(profiles, key) for key in ("oa", "sa", "ma", "ra")])
+    contribution = _as_float_array(profiles, "monthly_contribution").copy()
+    growth = 1.0 + _as_float_array(profiles, "salary_growth_rate")
+
+    final = np.empty_like(state)
+    snapshots = None
+    if yearly:
+        snapshots = np.full((int(years.max(initial=0)) + 1, 4, len(years)), np.nan)
+    for start in range(0, len(years), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        final[:, chunk] = _project_accounts_chunk(
+            current_age[chunk], years[chunk], state[:, chunk].copy(), contribution[chunk], growth[chunk],
+            target[chunk], frs[chunk], None if snapshots is None else snapshots[:, :, chunk],
         )
-        later_projection = project_savings(later_inputs)
-        scenarios.append(
-            ScenarioResult(
-                name="Retire 2 years later",
-                retirement_age=later_inputs.retirement_age,
-                projected_savings=later_projection,
-                notes="Shows effect of delaying retirement by 2 years."
-            )
+
+    return AccountProjection(balances=final, years=years, yearly=snapshots)
+
+
+@dataclass(frozen=True)
+class YearlyAccounts:
+    """
+    project_accounts output for one member: balances at each age (current
+    .. retirement) as read-only (len(age), 4) columns OA / SA / MA / RA.
+    """
+
+    age: np.ndarray
+    balances: np.ndarray
+
+    @property
+    def final_total(self) -> float:
+        return float(self.balances[-1].sum())
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame({"Age": self.age})
+        for i, name in enumerate(ACCOUNTS):
+            frame[f"{name} (S$)"] = self.balances[:, i]
+        frame["Total (S$)"] = self.balances.sum(axis=1)
+        return frame
+
+
+def _extend_account_path(prefix: tuple, rows: Optional[np.ndarray], carry, years: int) -> tuple:
+    current_age, current_savings, monthly_contribution, g, ra_target = prefix
+    if rows is None:
+        start, contribution = 0, monthly_contribution
+        state = np.array([list(split_savings(current_age, current_savings).values())]).T
+    else:
+        # Birthdays fall between interest credits, so the balances are the whole state
+        start, contribution, state = len(rows) - 1, carry, rows[-1][:, None].copy()
+    contribution = np.array([contribution], dtype="float64")
+    sums = cohort_retirement_sums([current_age])
+    snapshots = np.full((years - start + 1, 4, 1), np.nan)
+    _project_accounts_chunk(
+        np.array([current_age + start]), np.array([years - start]), state, contribution,
+        np.array([1.0 + g]), sums[:, RETIREMENT_SUM_NAMES.index(ra_target)], sums[:, 1], snapshots,
+    )
+    if years > start:
+        contribution *= 1.0 + g  # the chunk leaves it at the last year's
+    new_rows = snapshots[:, :, 0] if rows is None else snapshots[1:, :, 0]
+    return new_rows, float(contribution[0])
+
+
+# Account paths keyed on (current_age, current_savings, monthly_contribution,
+# growth, ra_target); the return rate plays no part in this engine
+_account_paths = _PathCache(_extend_account_path, SIMULATOR_CACHE_SIZE)
+
+
+@functools.lru_cache(maxsize=SIMULATOR_CACHE_SIZE)
+def _yearly_accounts(key: tuple, ra_target: str) -> YearlyAccounts:
+    inputs = RetirementInputs(*key)
+    balances = _account_paths.get(
+        (inputs.current_age, inputs.current_savings, inputs.monthly_contribution, inputs.salary_growth_rate,
+         ra_target),
+        inputs.retirement_age - inputs.current_age,
+    )
+    age = np.arange(inputs.current_age, inputs.retirement_age + 1)
+    age.flags.writeable = False
+    return YearlyAccounts(age=age, balances=balances)
+
+
+def project_accounts(inputs: RetirementInputs, ra_target: str = RA_FORMATION_TARGET) -> YearlyAccounts:
+    """
+    Monthly-rules projection for one member, with current_savings split
+    across accounts by split_savings. Memoised like project_yearly,
+    including the path shared across retirement ages (and return rates,
+    which this engine does not use).
+    """
+    if inputs.retirement_age < inputs.current_age:
+        raise ValueError("Retirement age must be >= current age")
+    return _yearly_accounts(astuple(inputs), ra_target)
+
+
+@dataclass(frozen=True)
+class ScenarioGrid:
+    """
+    Projected savings for every combination of the four axes;
+    projected_savings[i, j, k, l] is for retirement_age[i],
+    contribution_multiplier[j], return_rate[k] and growth_rate[l].
+    """
+
+    retirement_age: np.ndarray
+    contribution_multiplier: np.ndarray
+    return_rate: np.ndarray
+    growth_rate: np.ndarray
+    projected_savings: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        One row per combination (tidy / long format).
+        """
+        axes = np.meshgrid(
+            self.retirement_age, self.contribution_multiplier, self.return_rate, self.growth_rate, indexing="ij"
         )
+        return pd.DataFrame({
+            "Retirement age": axes[0].ravel(),
+            "Contribution multiplier": axes[1].ravel(),
+            "Return rate": axes[2].ravel(),
+            "Growth rate": axes[3].ravel(),
+            "Projected savings (S$)": self.projected_savings.ravel(),
+        })
+
+
+def scenario_grid(
+    inputs: RetirementInputs,
+    retirement_ages,
+    contribution_multipliers=(1.0,),
+    return_rates=None,
+    growth_rates=None,
+) -> ScenarioGrid:
+    """
+    project_savings over the cartesian product of retirement ages,
+    contribution multipliers, return rates and growth rates (the last two
+    default to the inputs' own), evaluated in one broadcast pass of the
+    closed form used by project_savings_batch.
+    """
+    ages = np.atleast_1d(np.asarray(retirement_ages, dtype="int64"))
+    if np.any(ages < inputs.current_age):
+        raise ValueError("Retirement age must be >= current age")
+    multipliers = np.atleast_1d(np.asarray(contribution_multipliers, dtype="float64"))
+    r = np.atleast_1d(np.asarray(
+        inputs.assumed_return_rate if return_rates is None else return_rates, dtype="float64"
+    ))
+    g = np.atleast_1d(np.asarray(
+        inputs.salary_growth_rate if growth_rates is None else growth_rates, dtype="float64"
+    ))
+
+    # Axes: (age, multiplier, return, growth); the growth factors do not
+    # depend on the multiplier, so they are computed on (age, 1, return, growth)
+    n = (ages - inputs.current_age).astype("float64")[:, None, None, None]
+    growth, series = _growth_factors(n, r[None, None, :, None], g[None, None, None, :])
+    c0 = 12.0 * inputs.monthly_contribution * multipliers[None, :, None, None]
+    savings = growth * (inputs.current_savings + c0 * series)
+    return ScenarioGrid(
+        retirement_age=ages,
+        contribution_multiplier=multipliers,
+        return_rate=r,
+        growth_rate=g,
+        projected_savings=savings,
+    )
+
+
+def sensitivity(
+    inputs: RetirementInputs,
+    retirement_years: int = 2,
+    contribution_change: float = 0.2,
+    rate_change: float = 0.01,
+) -> pd.DataFrame:
+    """
+    Tornado-chart data: the change in projected savings when each assumption
+    alone is moved down / up (retirement age by retirement_years, the
+    contribution by contribution_change, the return and growth rates by
+    rate_change), largest swing first. One 3 x 3 x 3 x 3 scenario_grid.
+    The earlier retirement age is never before the current age, and the
+    label states the moves actually made.
+    """
+    earlier_age = max(inputs.current_age, inputs.retirement_age - retirement_years)
+    years_earlier = inputs.retirement_age - earlier_age
+    if years_earlier == retirement_years:
+        age_move = f"±{retirement_years} years"
+    elif years_earlier == 0:
+        age_move = f"+{retirement_years} years"
+    else:
+        age_move = f"−{years_earlier} / +{retirement_years} years"
+    grid = scenario_grid(
+        inputs,
+        [earlier_age, inputs.retirement_age, inputs.retirement_age + retirement_years],
+        [1.0 - contribution_change, 1.0, 1.0 + contribution_change],
+        inputs.assumed_return_rate + np.array([-rate_change, 0.0, rate_change]),
+        inputs.salary_growth_rate + np.array([-rate_change, 0.0, rate_change]),
+    ).projected_savings
+    base = grid[1, 1, 1, 1]
+    labels = [
+        f"Retirement age {age_move}",
+        f"Monthly contribution ±{contribution_change:.0%}",
+        f"Return rate ±{100 * rate_change:g} pp",
+        f"Contribution growth ±{100 * rate_change:g} pp",
+    ]
+    rows = []
+    for axis, label in enumerate(labels):
+        low, high = (grid[tuple(i if a == axis else 1 for a in range(4))] - base for i in (0, 2))
+        rows.append({"Assumption": label, "Lower (S$)": low, "Higher (S$)": high})
+    frame = pd.DataFrame(rows)
+    swing = (frame["Higher (S$)"] - frame["Lower (S$)"]).abs()
+    return frame.loc[swing.sort_values(ascending=False).index].reset_index(drop=True)
+
+
+# ---------------------------------------------------------------------
+# Goal seek: what it takes to reach a target sum
+# ---------------------------------------------------------------------
+
+
+def target_from_payout(monthly_payout) -> np.ndarray:
+    """
+    Sum needed at 65 for a CPF LIFE Standard payout of monthly_payout (rough
+    rate from CPF_LIFE_PLANS).
+    """
+    return np.asarray(monthly_payout, dtype="float64") * 1_000.0 / CPF_LIFE_PLANS["Standard"][0]
+
+
+def _goal_inputs(profiles: Mapping, target) -> tuple:
+    current_age = _as_float_array(profiles, "current_age")
+    b0 = _as_float_array(profiles, "current_savings")
+    c0 = _as_float_array(profiles, "monthly_contribution") * 12
+    g = _as_float_array(profiles, "salary_growth_rate")
+    r = _as_float_array(profiles, "assumed_return_rate")
+    return current_age, b0, c0, g, r, np.asarray(target, dtype="float64")
+
+
+def required_monthly_contribution(profiles: Mapping, target) -> np.ndarray:
+    """
+    Monthly contribution (growing as usual) that reaches target exactly at
+    the retirement age: solves (1+r)^n (b0 + c0 S) = target for c0. 0 when
+    current savings alone get there, inf when there are no years left.
+    """
+    current_age, b0, _, g, r, target = _goal_inputs(profiles, target)
+    n = _as_float_array(profiles, "retirement_age") - current_age
+    growth, series = _growth_factors(n, r, g)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c0 = (target / growth - b0) / series
+    return np.where(target / growth <= b0, 0.0, c0) / 12.0
+
+
+def required_current_savings(profiles: Mapping, target) -> np.ndarray:
+    """
+    Savings needed today to reach target at the retirement age with the
+    given contributions (0 if the contributions alone get there).
+    """
+    current_age, _, c0, g, r, target = _goal_inputs(profiles, target)
+    n = _as_float_array(profiles, "retirement_age") - current_age
+    growth, series = _growth_factors(n, r, g)
+    return np.maximum(target / growth - c0 * series, 0.0)
+
+
+def required_retirement_age(profiles: Mapping, target, max_age: int = 75) -> np.ndarray:
+    """
+    Earliest whole retirement age (up to max_age) at which the projection
+    reaches target, by bisection on the years run for all profiles at once;
+    NaN where it is not reached by max_age. Assumes the balance never
+    shrinks from one year to the next (non-negative rates).
+    """
+    current_age, b0, c0, g, r, target = _goal_inputs(profiles, target)
+    target = np.broadcast_to(target, current_age.shape)
+
+    def reached(n: np.ndarray) -> np.ndarray:
+        growth, series = _growth_factors(n, r, g)
+        return growth * (b0 + c0 * series) >= target
+
+    # Invariant: not reached after lo years, reached after hi years
+    hi = np.maximum(max_age - current_age, 0.0)
+    possible = reached(hi)
+    done = reached(np.zeros_like(hi))
+    lo = np.zeros_like(hi)
+    hi = np.where(done, 0.0, hi)
+    while np.any(hi - lo > 1):
+        mid = np.floor((lo + hi) / 2)
+        ok = reached(mid)
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, mid)
+    return np.where(possible, current_age + hi, np.nan)
+
+
+def goal_seek(inputs: RetirementInputs, target_payout: float = 0.0, max_age: int = 75) -> pd.DataFrame:
+    """
+    For BRS, FRS, ERS (and a target monthly payout, if given), what each
+    lever would have to be on its own: monthly contribution, savings today,
+    or retirement age. All targets are solved in one batch.
+    """
+    targets = dict(zip(RETIREMENT_SUM_NAMES, cohort_retirement_sums(inputs.current_age).tolist()))
+    if target_payout > 0:
+        targets[f"S${target_payout:,.0f}/month payout"] = float(target_from_payout(target_payout))
+    amounts = np.array(list(targets.values()))
+    profiles = {key: np.full(len(amounts), value, dtype="float64") for key, value in asdict(inputs).items()}
+    return pd.DataFrame({
+        "Target": list(targets),
+        "Amount (S$)": amounts,
+        "Monthly contribution (S$)": required_monthly_contribution(profiles, amounts),
+        "Savings today (S$)": required_current_savings(profiles, amounts),
+        "Retirement age": required_retirement_age(profiles, amounts, max_age),
+    })
+
 
-    # 3) Increase monthly contribution by 20%
-    higher_contrib_inputs = RetirementInputs(
+# ---------------------------------------------------------------------
+# Retirement phase: CPF LIFE payouts and drawdown
+# ---------------------------------------------------------------------
+
+
+@dataclass
+class Decumulation:
+    """
+    Retirement phase for n scenarios / paths under each CPF LIFE plan.
+    """
+
+    plans: Tuple[str, ...]
+    premium: np.ndarray  # (n,) committed to CPF LIFE
+    payout_start_age: np.ndarray  # (n,)
+    monthly_payout: np.ndarray  # (len(plans), n) in the first year of payouts
+    meets_target: np.ndarray  # (len(plans), n) target income met in every year up to the end age
+    depleted_age: np.ndarray  # (len(plans), n) age other savings run out; NaN if they last
+    # With paths=True: per-age monthly income and other savings, shape
+    # (len(ages), len(plans), n); NaN before retirement
+    ages: Optional[np.ndarray] = None
+    monthly_income: Optional[np.ndarray] = None
+    other_savings: Optional[np.ndarray] = None
+
+    def to_frame(self, i: int = 0) -> pd.DataFrame:
+        """
+        Monthly income by age under each plan for scenario i (needs paths=True).
+        """
+        frame = pd.DataFrame({"Age": self.ages})
+        for p, plan in enumerate(self.plans):
+            frame[f"{plan} (S$/month)"] = self.monthly_income[:, p, i]
+        return frame.dropna()
+
+
+def decumulate(
+    final_balance,
+    retirement_age,
+    return_rate,
+    target_income: float = 0.0,
+    ra_target: str = RA_FORMATION_TARGET,
+    end_age: int = DECUMULATION_END_AGE,
+    paths: bool = False,
+    current_age=None,
+) -> Decumulation:
+    """
+    From each retirement balance, up to the ra_target sum of the member's
+    cohort (from current_age; by default, those turning 55 this year) is
+    committed to CPF LIFE, with payouts starting at 65 (or at retirement, if later, up to
+    70 with the deferral bonus). The rest is other savings, which earn
+    return_rate and top income up to target_income (per month) for as long
+    as they last. Year by year up to end_age, vectorised over scenarios /
+    paths and plans; arguments broadcast against final_balance.
+    """
+    balance = np.atleast_1d(np.asarray(final_balance, dtype="float64"))
+    retirement_age = np.broadcast_to(np.asarray(retirement_age, dtype="float64"), balance.shape)
+    growth = 1.0 + np.broadcast_to(np.asarray(return_rate, dtype="float64"), balance.shape)
+    annual_target = 12.0 * float(target_income)
+
+    plans = tuple(CPF_LIFE_PLANS)
+    rates = np.array([CPF_LIFE_PLANS[plan][0] for plan in plans])[:, None]
+    escalation = 1.0 + np.array([CPF_LIFE_PLANS[plan][1] for plan in plans])[:, None]
+
+    cohort_sums = cohort_retirement_sums(55 if current_age is None else current_age)
+    premium = np.minimum(balance, cohort_sums[..., RETIREMENT_SUM_NAMES.index(ra_target)])
+    start = np.clip(retirement_age, 65, 70)
+    monthly_payout = premium / 1_000.0 * rates * (1.0 + CPF_LIFE_DEFERRAL_BONUS) ** (start - 65)
+
+    other = np.repeat((balance - premium)[None, :], len(plans), axis=0)
+    meets = np.ones_like(other, dtype=bool)
+    depleted = np.full_like(other, np.nan)
+    ages = np.arange(int(retirement_age.min(initial=end_age)), end_age + 1)
+    income_path = savings_path = None
+    if paths:
+        income_path = np.full((len(ages), len(plans), len(balance)), np.nan)
+        savings_path = np.full_like(income_path, np.nan)
+
+    payout = monthly_payout * 12.0
+    for k, age in enumerate(ages):
+        retired = age >= retirement_age
+        paying = retired & (age >= start)
+        if k:
+            payout = np.where(paying & (age > start), payout * escalation, payout)
+        annual_payout = payout * paying
+        need = np.maximum(annual_target - annual_payout, 0.0) * retired
+        withdrawal = np.minimum(need, other)
+        meets &= ~retired | (annual_payout + withdrawal >= annual_target - 1e-6)
+        depleted = np.where(np.isnan(depleted) & (need > 0) & (need >= other), age, depleted)
+        if paths:
+            income_path[k] = np.where(retired, (annual_payout + withdrawal) / 12.0, np.nan)
+            savings_path[k] = np.where(retired, other, np.nan)
+        other = np.where(retired, (other - withdrawal) * growth, other)
+
+    return Decumulation(
+        plans=plans,
+        premium=premium,
+        payout_start_age=start,
+        monthly_payout=monthly_payout,
+        meets_target=meets,
+        depleted_age=depleted,
+        ages=ages if paths else None,
+        monthly_income=income_path,
+        other_savings=savings_path,
+    )
+
+
+@dataclass(frozen=True)
+class RetirementOutlook:
+    """
+    Accumulation and retirement phase for one set of inputs.
+    """
+
+    accumulation: YearlyProjection
+    retirement: Decumulation  # deterministic, one scenario, with paths
+    monte_carlo: MonteCarloResult  # includes prob_meet_target
+
+
+@functools.lru_cache(maxsize=SIMULATOR_CACHE_SIZE)
+def _retirement_outlook(
+    key: tuple, target_income: float, return_volatility: float, n_paths: int, seed: int
+) -> RetirementOutlook:
+    inputs = RetirementInputs(*key)
+    accumulation = project_yearly(inputs)
+    retirement = decumulate(
+        accumulation.final_balance, inputs.retirement_age, inputs.assumed_return_rate, target_income, paths=True,
         current_age=inputs.current_age,
-        retirement_age=inputs.retirement_age,
-        current_savings=inputs.current_savings,
-        monthly_contribution=inputs.monthly_contribution * 1.2,
-        salary_growth_rate=inputs.salary_growth_rate,
-        assumed_return_rate=inputs.assumed_return_rate,
     )
-    higher_contrib_projection = project_savings(higher_contrib_inputs)
-    scenarios.append(
-        ScenarioResult(
-            name="Increase contribution by 20%",
-            retirement_age=higher_contrib_inputs.retirement_age,
-            projected_savings=higher_contrib_projection,
-            notes="Shows effect of increasing your monthly CPF contribution."
-        )
+    for array in (retirement.premium, retirement.payout_start_age, retirement.monthly_payout,
+                  retirement.meets_target, retirement.depleted_age, retirement.ages,
+                  retirement.monthly_income, retirement.other_savings):
+        array.flags.writeable = False
+    monte_carlo = simulate_monte_carlo(
+        inputs, n_paths=n_paths, return_volatility=return_volatility, seed=seed, target_income=target_income
     )
+    return RetirementOutlook(accumulation=accumulation, retirement=retirement, monte_carlo=monte_carlo)
+
+
+def project_retirement(
+    inputs: RetirementInputs,
+    target_income: float = 0.0,
+    return_volatility: float = SIMULATOR_RETURN_VOLATILITY,
+    n_paths: int = SIMULATOR_MC_PATHS,
+    seed: int = 0,
+) -> RetirementOutlook:
+    """
+    One call for the page: the year-by-year projection, the retirement
+    phase on each CPF LIFE plan, and the Monte Carlo bands with the chance
+    of meeting target_income (S$ per month) every year to
+    DECUMULATION_END_AGE. Memoised like project_yearly.
+    """
+    if inputs.retirement_age < inputs.current_age:
+        raise ValueError("Retirement age must be >= current age")
+    return _retirement_outlook(astuple(inputs), float(target_income), return_volatility, n_paths, seed)
+
+
+def build_scenarios(inputs: RetirementInputs) -> List[ScenarioResult]:
+    """
+    Build a few simple comparison scenarios:
+    - Base case
+    - Retire 2 years later
+    - Increase monthly contribution by 20%
+    All are read off one scenario_grid.
+    """
+    later = inputs.retirement_age + 2 <= 75  # arbitrary cap
+    ages = [inputs.retirement_age, inputs.retirement_age + 2] if later else [inputs.retirement_age]
+    savings = scenario_grid(inputs, ages, [1.0, 1.2]).projected_savings[:, :, 0, 0]
 
+    scenarios = [
+        ScenarioResult("Base case", inputs.retirement_age, float(savings[0, 0]),
+                       "Projection using your current inputs."),
+    ]
+    if later:
+        scenarios.append(
+            ScenarioResult("Retire 2 years later", inputs.retirement_age + 2, float(savings[1, 0]),
+                           "Shows effect of delaying retirement by 2 years.")
+        )
+    scenarios.append(
+        ScenarioResult("Increase contribution by 20%", inputs.retirement_age, float(savings[0, 1]),
+                       "Shows effect of increasing your monthly CPF contribution.")
+    )
     return scenarios
 
 
+# ---------------------------------------------------------------------
+# Retirement sums by cohort, and classification against them
+# ---------------------------------------------------------------------
+
+RETIREMENT_SUM_NAMES = ("BRS", "FRS", "ERS")
+# Indexed by classify(): how many of BRS / FRS / ERS a balance reaches
+RETIREMENT_SUM_LABELS = ("Below BRS", "Between BRS and FRS", "Between FRS and ERS", "At or above ERS")
+
+
+@functools.lru_cache(maxsize=None)
+def _retirement_sum_table(path: str) -> Tuple[int, np.ndarray]:
+    table = pd.read_csv(path).sort_values("year_turning_55")
+    years = table["year_turning_55"].to_numpy()
+    if np.any(np.diff(years) != 1):
+        raise ValueError(f"{path} must have one row per year")
+    sums = table[["brs", "frs", "ers"]].to_numpy(dtype="float64")
+    sums.flags.writeable = False
+    return int(years[0]), sums
+
+
+def retirement_sums_for_year(year_turning_55) -> np.ndarray:
+    """
+    BRS / FRS / ERS (last axis) for the cohort turning 55 in each year, from
+    RETIREMENT_SUMS_PATH. Years after the table grow from its last row at
+    RETIREMENT_SUM_GROWTH a year; years before it shrink from its first.
+    """
+    first, sums = _retirement_sum_table(RETIREMENT_SUMS_PATH)
+    offset = np.asarray(year_turning_55, dtype="int64") - first
+    # Sums for each year in the range once, then one gather per member
+    lo = int(offset.min(initial=0))
+    years = np.arange(lo, int(offset.max(initial=0)) + 1)
+    row = np.clip(years, 0, len(sums) - 1)
+    by_year = sums[row] * ((1.0 + RETIREMENT_SUM_GROWTH) ** (years - row))[:, None]
+    return by_year[offset - lo]
+
+
+def cohort_retirement_sums(current_age, year: int = int(CURRENT_YEAR_LABEL)) -> np.ndarray:
+    """
+    The retirement sums that apply to members of current_age in year: those
+    of the year they turn (or turned) 55.
+    """
+    return retirement_sums_for_year(year + 55 - np.floor(np.asarray(current_age, dtype="float64")))
+
+
+def classify(projected_savings, sums) -> np.ndarray:
+    """
+    Index into RETIREMENT_SUM_LABELS for each balance. sums is one set of
+    BRS / FRS / ERS, searched in a single np.searchsorted call, or one set
+    per balance (shape (..., 3), e.g. from cohort_retirement_sums), where
+    each balance is counted against its own three sums instead.
+    """
+    sums = np.asarray(sums, dtype="float64")
+    if sums.ndim == 1:
+        return np.searchsorted(sums, projected_savings, side="right").astype("int8")
+    reached = np.asarray(projected_savings, dtype="float64")[..., None] >= sums
+    return np.count_nonzero(reached, axis=-1).astype("int8")
+
+
 def classify_vs_retirement_sums(
     projected_savings: float,
     brs: float,
@@ -122,16 +1219,30 @@ def classify_vs_retirement_sums(
     """
     multiple_of_frs = projected_savings / frs if frs > 0 else 0
 
-    if projected_savings < brs:
-        label = "Below BRS"
-    elif brs <= projected_savings < frs:
-        label = "Between BRS and FRS"
-    elif frs <= projected_savings < ers:
-        label = "Between FRS and ERS"
-    else:
-        label = "At or above ERS"
-
     return {
-        "label": label,
+        "label": RETIREMENT_SUM_LABELS[int(classify(projected_savings, [brs, frs, ers]))],
         "multiple_of_frs": f"{multiple_of_frs:.2f} × FRS",
     }
+
+
+def _projection_cache_metrics():
+    caches = {
+        "yearly": _yearly_projection.cache_info(),
+        "monte_carlo": _monte_carlo.cache_info(),
+        "accounts": _yearly_accounts.cache_info(),
+        "retirement": _retirement_outlook.cache_info(),
+    }
+    paths = {"balance": _balance_paths.info(), "accounts": _account_paths.info()}
+    yield ("cpf_projection_cache_hits_total", "counter", "Projections served from the memo.",
+           [({"cache": name}, info.hits) for name, info in caches.items()])
+    yield ("cpf_projection_cache_misses_total", "counter", "Projections computed.",
+           [({"cache": name}, info.misses) for name, info in caches.items()])
+    yield ("cpf_projection_cache_entries", "gauge", "Projections currently memoised.",
+           [({"cache": name}, info.currsize) for name, info in caches.items()])
+    yield ("cpf_path_cache_requests_total", "counter",
+           "Year-by-year path requests; result=hit|extended (resumed from a cached prefix)|miss.",
+           [({"path": name, "result": result}, info[key]) for name, info in paths.items()
+            for result, key in (("hit", "hits"), ("extended", "extensions"), ("miss", "misses"))])
+
+
+metrics.register_collector(_projection_cache_metrics)
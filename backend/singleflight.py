@@ -0,0 +1,117 @@
+# backend/singleflight.py
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict
+
+from backend import metrics
+
+# Every group registers itself here so stats can be reported process-wide.
+_GROUPS: Dict[str, "SingleFlight"] = {}
+_GROUPS_LOCK = threading.Lock()
+
+
+def request_key(namespace: str, payload: Any) -> str:
+    """
+    Stable key for a request: namespace + SHA-256 of the JSON-serialised payload
+    (dict keys sorted, non-JSON values stringified).
+    """
+    blob = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    digest = hashlib.sha256(blob.encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Process-wide request coalescing: while a call for a key is in flight,
+    identical calls wait for it and share its result (or its exception)
+    instead of running the same work again.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+        with _GROUPS_LOCK:
+            _GROUPS[name] = self
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+
+def singleflight_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Snapshot of executed / coalesced / in-flight counts for every group.
+    """
+    with _GROUPS_LOCK:
+        groups = list(_GROUPS.values())
+    return {g.name: g.stats() for g in groups}
+
+
+def _singleflight_metrics():
+    stats = singleflight_stats()
+    yield (
+        "cpf_singleflight_calls_total", "counter",
+        "Calls per coalescing group; result=coalesced shared another caller's run.",
+        [({"group": g, "result": r}, s[r]) for g, s in stats.items() for r in ("executed", "coalesced")],
+    )
+    yield (
+        "cpf_singleflight_in_flight", "gauge", "Runs currently in flight per coalescing group.",
+        [({"group": g}, s["in_flight"]) for g, s in stats.items()],
+    )
+
+
+metrics.register_collector(_singleflight_metrics)
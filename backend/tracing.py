@@ -0,0 +1,276 @@
+# backend/tracing.py
+
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.config import TRACING_ENABLED, TRACING_SINKS, TRACING_JSONL_PATH
+
+# Lightweight spans for the RAG pipeline. When tracing is disabled, span()
+# returns a shared no-op object and traced() calls straight through, so the
+# hot path pays one boolean check.
+
+_enabled = TRACING_ENABLED
+_current: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+logger = logging.getLogger("cpf.tracing")
+
+
+class Span:
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "attrs", "start", "duration_s", "error", "_t0", "_token",
+    )
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent.span_id if parent else None
+        self.attrs = attrs
+        self.start = 0.0
+        self.duration_s = 0.0
+        self.error: Optional[str] = None
+        self._t0 = 0.0
+        self._token = None
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration_s = time.perf_counter() - self._t0
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _current.reset(self._token)
+        _emit(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round(1000 * self.duration_s, 3),
+            "attrs": self.attrs,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+    trace_id = None
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+# ---------------------------------------------------------------------
+# Sinks
+# ---------------------------------------------------------------------
+
+
+class LogSink:
+    def emit(self, span: Span) -> None:
+        logger.info("span %s %.1fms %s", span.name, 1000 * span.duration_s, span.attrs)
+
+
+class JsonlSink:
+    def __init__(self, path: str = TRACING_JSONL_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str, ensure_ascii=False)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class MemoryAggregator:
+    """
+    Per-stage latency aggregates plus the spans of the most recent traces
+    (used by the debug panel in the pages).
+    """
+
+    def __init__(self, window: int = 500, max_traces: int = 100):
+        self._lock = threading.Lock()
+        self._durations: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self.window = window
+        self.max_traces = max_traces
+
+    def emit(self, span: Span) -> None:
+        with self._lock:
+            self._durations.setdefault(span.name, deque(maxlen=self.window)).append(span.duration_s)
+            self._counts[span.name] = self._counts.get(span.name, 0) + 1
+            if span.error:
+                self._errors[span.name] = self._errors.get(span.name, 0) + 1
+
+            spans = self._traces.setdefault(span.trace_id, [])
+            spans.append(span)
+            self._traces.move_to_end(span.trace_id)
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+
+    def trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """
+        Spans of one trace, in start order.
+        """
+        with self._lock:
+            spans = list(self._traces.get(trace_id, []))
+        return [s.to_dict() for s in sorted(spans, key=lambda s: s.start)]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out = {}
+        with self._lock:
+            for name, samples in self._durations.items():
+                ordered = sorted(samples)
+                out[name] = {
+                    "count": self._counts[name],
+                    "errors": self._errors.get(name, 0),
+                    "p50_ms": 1000 * ordered[len(ordered) // 2],
+                    "p95_ms": 1000 * ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+                    "max_ms": 1000 * ordered[-1],
+                }
+        return out
+
+
+memory = MemoryAggregator()
+
+
+def _build_sinks(spec: str) -> List[Any]:
+    sinks = []
+    for name in (s.strip() for s in spec.split(",")):
+        if name == "memory":
+            sinks.append(memory)
+        elif name == "log":
+            sinks.append(LogSink())
+        elif name == "jsonl":
+            sinks.append(JsonlSink())
+        elif name:
+            raise ValueError(f"Unknown tracing sink: {name!r}")
+    return sinks
+
+
+def _emit(span: Span) -> None:
+    for sink in _sinks:
+        try:
+            sink.emit(span)
+        except Exception:
+            logger.exception("Tracing sink %r failed", sink)
+
+
+_sinks = _build_sinks(TRACING_SINKS)
+
+
+# ---------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def set_sinks(sinks: List[Any]) -> None:
+    """
+    Replace the sinks; anything with an emit(span) method works.
+    """
+    global _sinks
+    _sinks = list(sinks)
+
+
+def span(name: str, **attrs):
+    """
+    with span("similarity_scan", rows=28) as s:
+        ...
+        s.set(k=5)
+    """
+    if not _enabled:
+        return _NOOP
+    return Span(name, _current.get(), attrs)
+
+
+def annotate(**attrs) -> None:
+    """
+    Attach attributes (e.g. token counts) to the innermost open span.
+    """
+    if _enabled:
+        current = _current.get()
+        if current is not None:
+            current.attrs.update(attrs)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator form of span(); the span is named after the function by default.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with Span(span_name, _current.get(), {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_rows(trace_id: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Spans of a recent trace as table rows for the debug panel: stage name
+    indented by nesting depth, duration, share of the root span and attributes.
+    Empty unless tracing is enabled with the memory sink.
+    """
+    if not trace_id:
+        return []
+    spans = memory.trace(trace_id)
+    depth = {}
+    for s in spans:
+        depth[s["span_id"]] = depth.get(s["parent_id"], -1) + 1
+    total = max((s["duration_ms"] for s in spans), default=0.0) or 1.0
+    return [
+        {
+            "Stage": "\u2003" * depth[s["span_id"]] + s["name"],
+            "ms": round(s["duration_ms"], 1),
+            "% of request": round(100 * s["duration_ms"] / total, 1),
+            "Details": ", ".join(f"{k}={v}" for k, v in s["attrs"].items()) + (f" error={s['error']}" if s["error"] else ""),
+        }
+        for s in spans
+    ]
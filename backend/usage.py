@@ -0,0 +1,183 @@
+# backend/usage.py
+
+import contextvars
+import datetime as dt
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from backend import metrics
+from backend.config import (
+    MODEL_PRICES_PER_1M,
+    OPENAI_MODEL,
+    BUDGET_SESSION_USD,
+    BUDGET_DAILY_USD,
+    USAGE_LOG_PATH,
+)
+
+# Token and cost accounting for every embedding and chat call, aggregated per
+# session, use case and day. Calls are attributed to whatever session / use
+# case the caller set with attribute_to(); contextvars carry this into the
+# deadline worker threads.
+
+_session: contextvars.ContextVar = contextvars.ContextVar("usage_session", default=None)
+_use_case: contextvars.ContextVar = contextvars.ContextVar("usage_use_case", default="other")
+
+# Sessions whose spend is remembered; the least recently active are dropped
+MAX_SESSIONS = 10_000
+
+_TOKENS = metrics.counter(
+    "cpf_tokens_total", "Tokens metered per use case and model; type=prompt|completion.",
+    ["use_case", "model", "type"],
+)
+_COST = metrics.counter("cpf_cost_usd_total", "Estimated spend in USD.", ["use_case", "model"])
+_DOWNGRADES = metrics.counter(
+    "cpf_budget_downgrades_total", "Answers downgraded because a budget was exhausted.", ["use_case", "scope"]
+)
+
+
+class UsageLedger:
+    """
+    Running totals: per (day, use case, model) for reporting, plus spend per
+    session and per day for budget checks.
+    """
+
+    def __init__(self, log_path: str = USAGE_LOG_PATH):
+        self._lock = threading.Lock()
+        # (day, use_case, model) -> [calls, prompt_tokens, completion_tokens, cost]
+        self._totals: Dict[Tuple[str, str, str], list] = {}
+        self._by_session: "OrderedDict[str, float]" = OrderedDict()
+        self._by_day: Dict[str, float] = {}
+        self._log_path = Path(log_path) if log_path else None
+
+    def record(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int = 0,
+        kind: str = "chat",
+        estimated: bool = False,
+    ) -> float:
+        """
+        Meter one call and return its estimated cost in USD.
+        """
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        session, use_case = _session.get() or "anonymous", _use_case.get()
+        day = dt.date.today().isoformat()
+
+        with self._lock:
+            row = self._totals.setdefault((day, use_case, model), [0, 0, 0, 0.0])
+            row[0] += 1
+            row[1] += prompt_tokens
+            row[2] += completion_tokens
+            row[3] += cost
+            self._by_session[session] = self._by_session.get(session, 0.0) + cost
+            self._by_session.move_to_end(session)
+            while len(self._by_session) > MAX_SESSIONS:
+                self._by_session.popitem(last=False)
+            self._by_day[day] = self._by_day.get(day, 0.0) + cost
+
+            if self._log_path is not None:
+                self._log_path.parent.mkdir(parents=True, exist_ok=True)
+                with self._log_path.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps({
+                        "ts": round(time.time(), 3), "day": day, "session": session, "use_case": use_case,
+                        "kind": kind, "model": model, "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens, "cost_usd": cost, "estimated": estimated,
+                    }) + "\n")
+
+        _TOKENS.labels(use_case=use_case, model=model, type="prompt").inc(prompt_tokens)
+        if completion_tokens:
+            _TOKENS.labels(use_case=use_case, model=model, type="completion").inc(completion_tokens)
+        _COST.labels(use_case=use_case, model=model).inc(cost)
+        return cost
+
+    def session_spend(self, session_id: str) -> float:
+        with self._lock:
+            return self._by_session.get(session_id, 0.0)
+
+    def day_spend(self, day: Optional[str] = None) -> float:
+        with self._lock:
+            return self._by_day.get(day or dt.date.today().isoformat(), 0.0)
+
+    def totals(self) -> Dict[Tuple[str, str, str], Dict[str, float]]:
+        with self._lock:
+            return {
+                key: {"calls": r[0], "prompt_tokens": r[1], "completion_tokens": r[2], "cost_usd": r[3]}
+                for key, r in self._totals.items()
+            }
+
+
+ledger = UsageLedger()
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int = 0) -> float:
+    price_in, price_out = MODEL_PRICES_PER_1M.get(model, MODEL_PRICES_PER_1M.get(OPENAI_MODEL, (0.0, 0.0)))
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1e6
+
+
+def record(model: str, prompt_tokens: int, completion_tokens: int = 0, kind: str = "chat",
+           estimated: bool = False) -> float:
+    return ledger.record(model, prompt_tokens, completion_tokens, kind, estimated)
+
+
+@contextmanager
+def attribute_to(session_id: Optional[str] = None, use_case: Optional[str] = None):
+    """
+    Attribute calls made inside the block to this session and/or use case.
+    """
+    tokens = []
+    if session_id is not None:
+        tokens.append((_session, _session.set(session_id)))
+    if use_case is not None:
+        tokens.append((_use_case, _use_case.set(use_case)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def attributed(use_case: str) -> Callable:
+    """
+    Decorator form of attribute_to(use_case=...).
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with attribute_to(use_case=use_case):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def exhausted_budget() -> Optional[str]:
+    """
+    "session" or "daily" if the current session or today's spend has reached
+    its budget, else None. Calls outside a session (batch jobs, load tests)
+    only count towards the daily budget.
+    """
+    session = _session.get()
+    if BUDGET_SESSION_USD and session is not None and ledger.session_spend(session) >= BUDGET_SESSION_USD:
+        scope = "session"
+    elif BUDGET_DAILY_USD and ledger.day_spend() >= BUDGET_DAILY_USD:
+        scope = "daily"
+    else:
+        return None
+    _DOWNGRADES.labels(use_case=_use_case.get(), scope=scope).inc()
+    return scope
+
+
+def _usage_metrics():
+    yield "cpf_spend_today_usd", "gauge", "Estimated spend so far today (this process).", [({}, ledger.day_spend())]
+
+
+metrics.register_collector(_usage_metrics)
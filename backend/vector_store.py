@@ -1,25 +1,41 @@
 # backend/vector_store.py
 
+import hashlib
 import json
+import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Union
 
 import numpy as np
-from openai import OpenAI
 
-from backend.config import OPENAI_API_KEY, OPENAI_EMBEDDING_MODEL
+from backend import metrics
+from backend.config import CORPUS_PATH as _CORPUS_PATH, EMBED_TIMEOUT_S
+from backend.providers import get_embedder
+from backend.singleflight import SingleFlight, request_key
+from backend.tracing import span, traced
 
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-CORPUS_PATH = Path("data/processed/cpf_corpus.jsonl")
+CORPUS_PATH = Path(_CORPUS_PATH)
 
 # Simple global cache (loaded once per process)
 _EMBEDDINGS_MATRIX: Optional[np.ndarray] = None
 _RECORDS: List[Dict] = []
+_CORPUS_VERSION: Optional[str] = None
+# Row indices of each topic, so topic-filtered searches scan only those rows
+_TOPIC_INDEX: Dict[str, np.ndarray] = {}
+
+# Coalesces concurrent embedding calls for the same query text
+_embed_flight = SingleFlight("embed_query")
+
+_CORPUS_LOAD_SECONDS = metrics.gauge("cpf_corpus_load_seconds", "Time taken to load the corpus file.")
+_CORPUS_CHUNKS = metrics.gauge("cpf_corpus_chunks", "Chunks in the loaded corpus.")
+_EMBED_SECONDS = metrics.histogram(
+    "cpf_embedding_seconds", "Latency of query embedding calls.", ["provider"]
+)
+_RETRIEVE_SECONDS = metrics.histogram("cpf_retrieve_seconds", "Latency of vector_store.retrieve.")
 
 
 def _load_corpus():
-    global _EMBEDDINGS_MATRIX, _RECORDS
+    global _EMBEDDINGS_MATRIX, _RECORDS, _TOPIC_INDEX
 
     if _EMBEDDINGS_MATRIX is not None:
         return
@@ -30,6 +46,7 @@ def _load_corpus():
             "Run backend.build_corpus first."
         )
 
+    start = time.perf_counter()
     records: List[Dict] = []
     embeddings = []
 
@@ -39,55 +56,110 @@ def _load_corpus():
             records.append(rec)
             embeddings.append(rec["embedding"])
 
+    topic_rows: Dict[str, List[int]] = {}
+    for i, rec in enumerate(records):
+        topic_rows.setdefault(rec.get("topic", "general"), []).append(i)
+
     _RECORDS = records
+    _TOPIC_INDEX = {t: np.array(rows, dtype=np.intp) for t, rows in topic_rows.items()}
     _EMBEDDINGS_MATRIX = np.array(embeddings, dtype="float32")
 
+    _CORPUS_LOAD_SECONDS.set(time.perf_counter() - start)
+    _CORPUS_CHUNKS.set(len(records))
+
 
 def _ensure_corpus_loaded():
     if _EMBEDDINGS_MATRIX is None:
         _load_corpus()
 
 
+def corpus_records() -> List[Dict]:
+    """
+    All corpus chunks (with embeddings), loading the corpus if needed.
+    """
+    _ensure_corpus_loaded()
+    return _RECORDS
+
+
+def corpus_version() -> str:
+    """
+    Short content hash of the corpus file. Anything derived from the corpus
+    (e.g. pre-generated answers) records this to detect staleness.
+    """
+    global _CORPUS_VERSION
+
+    if _CORPUS_VERSION is None:
+        if not CORPUS_PATH.exists():
+            raise RuntimeError(
+                f"Corpus file not found at {CORPUS_PATH}. "
+                "Run backend.build_corpus first."
+            )
+        digest = hashlib.sha256(CORPUS_PATH.read_bytes()).hexdigest()
+        _CORPUS_VERSION = digest[:12]
+    return _CORPUS_VERSION
+
+
+def _embed_query(text: str) -> np.ndarray:
+    embedder = get_embedder()
+    start = time.perf_counter()
+    with span("embed_query", provider=embedder.name):
+        vec = embedder.embed([text], timeout=EMBED_TIMEOUT_S)[0]
+    _EMBED_SECONDS.labels(provider=embedder.name).observe(time.perf_counter() - start)
+    # The same array may be shared by coalesced callers
+    vec.setflags(write=False)
+    return vec
+
+
 def embed_query(text: str) -> np.ndarray:
-    resp = client.embeddings.create(
-        model=OPENAI_EMBEDDING_MODEL,
-        input=[text],
-    )
-    return np.array(resp.data[0].embedding, dtype="float32")
+    key = request_key("embed", [get_embedder().name, text])
+    return _embed_flight.do(key, _embed_query, text)
 
 
+@traced()
 def retrieve(
     query: str,
     k: int = 5,
-    topic_filter: Optional[str] = None,
+    topic_filter: Optional[Union[str, Iterable[str]]] = None,
 ) -> List[Dict]:
     """
     Retrieve top-k relevant chunks for the given query.
-    Optionally filter by topic (e.g. 'retirement_sums', 'withdrawals').
+    Optionally filter by one topic or a collection of topics
+    (e.g. 'retirement_sums', 'withdrawals'); only those rows are scanned.
+    Each returned chunk carries its cosine similarity under 'score'.
     """
+    start = time.perf_counter()
     _ensure_corpus_loaded()
 
     assert _EMBEDDINGS_MATRIX is not None
 
     query_vec = embed_query(query)
 
-    # Cosine similarity
-    emb_matrix = _EMBEDDINGS_MATRIX
-    dot = emb_matrix @ query_vec
-    norms = np.linalg.norm(emb_matrix, axis=1) * np.linalg.norm(query_vec)
-    sims = dot / (norms + 1e-8)
-
-    # Sort indices by similarity
-    idxs = np.argsort(-sims)  # descending
+    if topic_filter:
+        topics = {topic_filter} if isinstance(topic_filter, str) else set(topic_filter)
+        rows = [_TOPIC_INDEX[t] for t in sorted(topics) if t in _TOPIC_INDEX]
+        if not rows:
+            _RETRIEVE_SECONDS.observe(time.perf_counter() - start)
+            return []
+        candidates = np.concatenate(rows)
+        emb_matrix = _EMBEDDINGS_MATRIX[candidates]
+    else:
+        candidates = None
+        emb_matrix = _EMBEDDINGS_MATRIX
+
+    with span("similarity_scan", rows=len(emb_matrix), k=k):
+        # Cosine similarity
+        dot = emb_matrix @ query_vec
+        norms = np.linalg.norm(emb_matrix, axis=1) * np.linalg.norm(query_vec)
+        sims = dot / (norms + 1e-8)
+
+        # Sort indices by similarity
+        order = np.argsort(-sims)[:k]  # descending
 
     results: List[Dict] = []
 
-    for idx in idxs:
-        rec = _RECORDS[idx]
-        if topic_filter and rec.get("topic") != topic_filter:
-            continue
-        results.append(rec)
-        if len(results) >= k:
-            break
+    for pos in order:
+        idx = candidates[pos] if candidates is not None else pos
+        results.append({**_RECORDS[idx], "score": float(sims[pos])})
 
+    _RETRIEVE_SECONDS.observe(time.perf_counter() - start)
     return results
@@ -1,10 +1,25 @@
+import uuid
+
 import streamlit as st
 import pandas as pd
 
-from backend.rag import answer_policy_question
+from backend import recorder, tracing, usage
+from backend.metrics import start_metrics_server
+from backend.rag import (
+    generate_policy_answer,
+    lookup_faq_answer,
+    retrieve_policy_context,
+)
 
 # NOTE: Do NOT call st.set_page_config here; it's already called in Home.py.
 
+# Also started here in case the app is opened directly on this page
+start_metrics_server()
+
+# Anonymous id that session spend and budgets are tracked under
+if "usage_session_id" not in st.session_state:
+    st.session_state.usage_session_id = uuid.uuid4().hex
+
 st.title("💬 CPF Policy Explainer")
 
 st.markdown(
@@ -152,15 +167,62 @@ if submitted:
     st.markdown("### 💭 Your question")
     st.markdown(f"> {question.strip()}")
 
-    with st.spinner("Thinking..."):
-        answer = answer_policy_question(
-            question=question,
-            profile_context=profile_context,
-        )
+    # The request is one trace; its per-stage timings show in the debug panel
+    # (and, if recording is enabled, one line in the replay log)
+    with tracing.span("policy_request") as request_trace, recorder.recording(
+        "policy", question=question.strip(), age_band=age_band, income_band=income_band
+    ) as rec, usage.attribute_to(session_id=st.session_state.usage_session_id):
+        # Frequently asked questions are pre-generated and served instantly
+        with rec.stage("faq"):
+            answer = lookup_faq_answer(question, profile_context)
+        rec.set(served="faq" if answer is not None else "generated")
+
+        if answer is None:
+            # Phase 1: show the retrieved CPF sections as soon as retrieval finishes
+            with st.spinner("Searching CPF materials..."), rec.stage("retrieve"):
+                retrieval = retrieve_policy_context(
+                    question=question,
+                    profile_context=profile_context,
+                )
+
+            if retrieval.context_chunks:
+                st.markdown("### 📚 Relevant CPF sections")
+                st.caption(
+                    f"Found in {retrieval.retrieval_seconds:.1f}s. "
+                    "These are the curated sections the explanation below is based on."
+                )
+                for ch in retrieval.context_chunks:
+                    title = ch.get("title", "Untitled section")
+                    topic = ch.get("topic", "general")
+                    score = ch.get("score")
+                    label = f"{title} · {topic}" + (f" · relevance {score:.2f}" if score is not None else "")
+                    with st.expander(label):
+                        st.markdown(ch.get("text", ""))
+                        if ch.get("source"):
+                            st.markdown(f"Source: {ch['source']}")
+
+            # Phase 2: generate the explanation
+            queue_notice = st.empty()
+
+            def show_queue_position(position: int):
+                queue_notice.info(
+                    f"⏳ Many people are asking questions right now. You are number {position} in the queue."
+                )
+
+            with st.spinner("Writing an explanation..."), rec.stage("generate"):
+                answer = generate_policy_answer(
+                    retrieval,
+                    on_queued=show_queue_position,
+                )
+            queue_notice.empty()
 
     st.markdown("### 🧾 Explanation")
     st.markdown(answer)
 
+    if tracing.is_enabled():
+        with st.expander("⏱️ Timing breakdown (debug)"):
+            st.dataframe(pd.DataFrame(tracing.trace_rows(request_trace.trace_id)), use_container_width=True)
+
     st.info(
         """
 **Reminder:**  
@@ -1,3 +1,6 @@
+import uuid
+
+import numpy as np
 import streamlit as st
 import pandas as pd
 
@@ -6,11 +9,31 @@ from backend.config import (
     CURRENT_YEAR_FRS,
     CURRENT_YEAR_ERS,
     CURRENT_YEAR_LABEL,
+    RETIREMENT_SUM_GROWTH,
+    DECUMULATION_END_AGE,
+    RA_FORMATION_TARGET,
+    SIMULATOR_RETURN_VOLATILITY,
 )
+from backend import recorder, tracing, usage
+from backend.metrics import start_metrics_server
 from backend.rag import explain_simulation_results
+from backend.simulator import (
+    PRESETS,
+    RetirementInputs,
+    classify_vs_retirement_sums,
+    cohort_retirement_sums,
+    goal_seek,
+    project_accounts,
+    project_retirement,
+    scenario_grid,
+    sensitivity,
+)
 
 # NOTE: Do NOT call st.set_page_config here; it's already called in Home.py.
 
+# Also started here in case the app is opened directly on this page
+start_metrics_server()
+
 st.title("🧮 CPF Retirement Planning Simulator")
 
 st.markdown(
@@ -22,6 +45,11 @@ You can explore:
 
 - How your savings might grow until a chosen retirement age  
 - How your projected balance compares to **BRS / FRS / ERS**  
+- A likely range of outcomes when returns and contributions vary from year to year  
+- Estimated CPF LIFE payouts and whether they (plus other savings) meet your target income  
+- An OA / SA / MA / RA breakdown under CPF's month-by-month interest and allocation rules  
+- Which assumptions move your result the most  
+- What contribution, savings or retirement age would reach each retirement sum or your target income  
 - A narrative explanation of what the numbers might mean  
 
 All results are **illustrative only** and do *not* reflect your actual CPF balances.
@@ -34,77 +62,33 @@ st.markdown(
 - Basic Retirement Sum (BRS) for cohort year {CURRENT_YEAR_LABEL}: ~S${CURRENT_YEAR_BRS:,.0f}  
 - Full Retirement Sum (FRS) for cohort year {CURRENT_YEAR_LABEL}: ~S${CURRENT_YEAR_FRS:,.0f}  
 - Enhanced Retirement Sum (ERS) for cohort year {CURRENT_YEAR_LABEL}: ~S${CURRENT_YEAR_ERS:,.0f}  
+
+Your projection is compared with the sums for the year you turn 55, assumed to rise about
+{RETIREMENT_SUM_GROWTH:.1%} a year after the latest published figures.
 """
 )
 
 st.markdown("---")
 
-# ---------------------------------------------------------------------
-# Helpers: projection + classification
-# ---------------------------------------------------------------------
-
-
-def run_projection(
-    current_age: int,
-    retirement_age: int,
-    current_savings: float,
-    monthly_contribution: float,
-    salary_growth_rate_pct: float,
-    assumed_return_rate_pct: float,
-) -> pd.DataFrame:
-    years = list(range(current_age, retirement_age + 1))
-    balance = current_savings
-    monthly_contrib = monthly_contribution
-
-    records = []
-
-    growth_rate = salary_growth_rate_pct / 100.0
-    return_rate = assumed_return_rate_pct / 100.0
-
-    for age in years:
-        records.append(
-            {
-                "Age": age,
-                "Year": age - current_age,  # years from now
-                "Projected savings (S$)": balance,
-            }
-        )
-        # end of year: apply interest + contributions
-        annual_contrib = monthly_contrib * 12.0
-        balance = balance * (1.0 + return_rate) + annual_contrib
-        monthly_contrib *= 1.0 + growth_rate
-
-    df = pd.DataFrame(records)
-    return df
-
-
-def classify_against_frs(final_amount: float) -> dict:
-    ratio = final_amount / CURRENT_YEAR_FRS if CURRENT_YEAR_FRS > 0 else 0.0
-
-    if ratio < 0.8:
-        label = "Below FRS"
-    elif 0.8 <= ratio <= 1.2:
-        label = "Around FRS"
-    elif 1.2 < ratio <= 1.8:
-        label = "Between FRS and ERS"
-    else:
-        label = "At or above ERS (approx.)"
-
-    return {
-        "label": label,
-        "multiple_of_frs": f"≈ {ratio:0.2f} × FRS" if CURRENT_YEAR_FRS > 0 else "N/A",
-    }
-
-
 # ---------------------------------------------------------------------
 # Initialise session_state for simulation
 # ---------------------------------------------------------------------
 
+# Anonymous id that session spend and budgets are tracked under
+if "usage_session_id" not in st.session_state:
+    st.session_state.usage_session_id = uuid.uuid4().hex
+
 if "simulation_ready" not in st.session_state:
     st.session_state.simulation_ready = False
     st.session_state.projection_df = None
     st.session_state.classification = None
     st.session_state.sim_inputs = None
+    st.session_state.monte_carlo = None
+    st.session_state.retirement = None
+    st.session_state.accounts = None
+    st.session_state.sensitivity_df = None
+    st.session_state.grid_df = None
+    st.session_state.goal_df = None
 
 # Defaults for inputs (used for presets)
 default_values = {
@@ -115,6 +99,7 @@ default_values = {
     "salary_growth_rate_pct": 2.0,
     "assumed_return_rate_pct": 4.0,
     "target_income": 2000.0,
+    "return_volatility_pct": SIMULATOR_RETURN_VOLATILITY * 100,
 }
 
 for k, v in default_values.items():
@@ -127,32 +112,8 @@ def apply_preset(preset_name: str):
     """
     Set session_state values for inputs based on chosen preset.
     """
-    if preset_name == "Typical 35-year-old (mid-income)":
-        st.session_state.current_age = 35
-        st.session_state.retirement_age = 65
-        st.session_state.current_savings = 60_000.0
-        st.session_state.monthly_contribution = 900.0
-        st.session_state.salary_growth_rate_pct = 2.0
-        st.session_state.assumed_return_rate_pct = 4.0
-        st.session_state.target_income = 2200.0
-
-    elif preset_name == "Age 45, catching up":
-        st.session_state.current_age = 45
-        st.session_state.retirement_age = 65
-        st.session_state.current_savings = 140_000.0
-        st.session_state.monthly_contribution = 1_000.0
-        st.session_state.salary_growth_rate_pct = 1.5
-        st.session_state.assumed_return_rate_pct = 4.0
-        st.session_state.target_income = 2500.0
-
-    elif preset_name == "Near retirement (age 55)":
-        st.session_state.current_age = 55
-        st.session_state.retirement_age = 65
-        st.session_state.current_savings = 260_000.0
-        st.session_state.monthly_contribution = 1_100.0
-        st.session_state.salary_growth_rate_pct = 1.0
-        st.session_state.assumed_return_rate_pct = 4.0
-        st.session_state.target_income = 2500.0
+    for key, value in PRESETS.get(preset_name, {}).items():
+        st.session_state[key] = value
 
     # Custom inputs: do nothing (keep whatever is in session_state)
 
@@ -166,12 +127,7 @@ tab_inputs, tab_results = st.tabs(["🧮 Simulation inputs", "📊 Results & exp
 with tab_inputs:
     st.subheader("Enter your details (all values are approximate)")
 
-    preset_options = [
-        "Custom inputs",
-        "Typical 35-year-old (mid-income)",
-        "Age 45, catching up",
-        "Near retirement (age 55)",
-    ]
+    preset_options = ["Custom inputs"] + list(PRESETS)
 
     preset = st.selectbox(
         "Quick presets (optional)",
@@ -238,6 +194,14 @@ with tab_inputs:
             step=100.0,
             key="target_income",
         )
+        return_volatility_pct = st.slider(
+            "Year-to-year variation in returns (± % per year)",
+            min_value=0.0,
+            max_value=3.0,
+            step=0.25,
+            key="return_volatility_pct",
+            help="Used for the range of outcomes: each simulated year's return is drawn around your assumed rate.",
+        )
 
         submitted = st.form_submit_button("Run simulation")
 
@@ -245,21 +209,35 @@ with tab_inputs:
         if retirement_age <= current_age:
             st.error("Planned retirement age must be **greater than** current age.")
         else:
-            with st.spinner("Running projection..."):
-                df = run_projection(
-                    current_age=current_age,
-                    retirement_age=retirement_age,
-                    current_savings=current_savings,
-                    monthly_contribution=monthly_contribution,
-                    salary_growth_rate_pct=salary_growth_rate_pct,
-                    assumed_return_rate_pct=assumed_return_rate_pct,
-                )
-
-            final_amount = float(df["Projected savings (S$)"].iloc[-1])
-            classification = classify_against_frs(final_amount)
+            inputs = RetirementInputs(
+                current_age=current_age,
+                retirement_age=retirement_age,
+                current_savings=current_savings,
+                monthly_contribution=monthly_contribution,
+                salary_growth_rate=salary_growth_rate_pct / 100.0,
+                assumed_return_rate=assumed_return_rate_pct / 100.0,
+            )
+            outlook = project_retirement(
+                inputs, target_income=target_income, return_volatility=return_volatility_pct / 100.0
+            )
+            projection = outlook.accumulation
+            df = projection.to_frame()
+            classification = classify_vs_retirement_sums(
+                projection.final_balance, *cohort_retirement_sums(current_age).tolist()
+            )
 
             st.session_state.simulation_ready = True
             st.session_state.projection_df = df
+            st.session_state.monte_carlo = outlook.monte_carlo
+            st.session_state.retirement = outlook.retirement
+            st.session_state.accounts = project_accounts(inputs)
+            st.session_state.sensitivity_df = sensitivity(inputs)
+            st.session_state.goal_df = goal_seek(inputs, target_payout=target_income)
+            st.session_state.grid_df = scenario_grid(
+                inputs,
+                retirement_ages=np.arange(max(current_age, 50), 71),
+                contribution_multipliers=np.arange(0.5, 2.01, 0.25),
+            ).to_frame()
             st.session_state.classification = classification
             st.session_state.sim_inputs = {
                 "current_age": current_age,
@@ -314,16 +292,117 @@ with tab_results:
     col_b.metric("Projected CPF savings", f"S${final_amount:,.0f}")
     col_c.metric("Relative to FRS", classification["multiple_of_frs"])
 
+    brs, frs, ers = cohort_retirement_sums(sim_inputs["current_age"]).tolist()
     st.caption(
-        "Classification is approximate and uses the current FRS as a benchmark for illustration."
+        f"Classification compares the projection with the sums for the year you turn 55 "
+        f"({int(CURRENT_YEAR_LABEL) + 55 - sim_inputs['current_age']}): BRS ~S${brs:,.0f}, "
+        f"FRS ~S${frs:,.0f}, ERS ~S${ers:,.0f}, for illustration."
     )
 
     st.markdown("### 📈 Savings over time")
     st.line_chart(df.set_index("Age")["Projected savings (S$)"])
 
+    monte_carlo = st.session_state.get("monte_carlo")
+    if monte_carlo is not None:
+        st.markdown("### 🎲 Range of outcomes")
+        st.line_chart(monte_carlo.to_frame().set_index("Age"))
+        st.caption(
+            f"{monte_carlo.n_paths:,} simulated paths with returns and contribution growth varying "
+            "each year. P50 is the middle outcome; 90% of paths end between P5 and P95."
+        )
+        col_brs, col_frs, col_ers = st.columns(3)
+        col_brs.metric("Chance of reaching BRS", f"{monte_carlo.prob_reach['BRS']:.0%}")
+        col_frs.metric("Chance of reaching FRS", f"{monte_carlo.prob_reach['FRS']:.0%}")
+        col_ers.metric("Chance of reaching ERS", f"{monte_carlo.prob_reach['ERS']:.0%}")
+
+    retirement = st.session_state.get("retirement")
+    if retirement is not None:
+        st.markdown("### 🧓 After retirement (CPF LIFE)")
+        plan_columns = st.columns(len(retirement.plans))
+        for p, (plan, col) in enumerate(zip(retirement.plans, plan_columns)):
+            chance = monte_carlo.prob_meet_target.get(plan) if monte_carlo is not None else None
+            col.metric(
+                f"{plan} plan",
+                f"S${retirement.monthly_payout[p, 0]:,.0f}/month",
+                f"{chance:.0%} chance of meeting target" if chance is not None else None,
+                delta_color="off",
+            )
+        income_df = retirement.to_frame().set_index("Age")
+        if target_income > 0:
+            income_df["Target (S$/month)"] = target_income
+        st.line_chart(income_df)
+        st.caption(
+            f"Up to the {RA_FORMATION_TARGET} is committed to CPF LIFE, with payouts from age "
+            f"{retirement.payout_start_age[0]:.0f}; the rest of your savings tops up income towards your "
+            f"target until it runs out. The chance of meeting the target counts the simulated paths that "
+            f"meet it every year to age {DECUMULATION_END_AGE}. Payout rates are rough estimates."
+        )
+
+    accounts = st.session_state.get("accounts")
+    if accounts is not None:
+        st.markdown("### 🏦 By CPF account")
+        accounts_df = accounts.to_frame()
+        st.area_chart(accounts_df.set_index("Age")[["OA (S$)", "SA (S$)", "MA (S$)", "RA (S$)"]])
+        st.caption(
+            f"Month-by-month CPF rules instead of your assumed return: floor rates plus extra interest, "
+            f"contributions split by age band, MediSave capped at the Basic Healthcare Sum, and the RA "
+            f"set aside at 55 against the {RA_FORMATION_TARGET}. Your current savings are split across "
+            f"accounts in today's allocation proportions. Total at retirement: "
+            f"S${accounts.final_total:,.0f}."
+        )
+
+    if st.session_state.get("goal_df") is not None:
+        st.markdown("### 🎯 What it would take")
+        st.dataframe(
+            st.session_state.goal_df.style.format(
+                {
+                    "Amount (S$)": "S${:,.0f}",
+                    "Monthly contribution (S$)": "S${:,.0f}",
+                    "Savings today (S$)": "S${:,.0f}",
+                    "Retirement age": "{:.0f}",
+                },
+                na_rep="Not by 75",
+            ),
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption(
+            "Each column changes one thing and keeps your other inputs: the monthly contribution "
+            "(growing as you set), the savings you would need today, or the earliest retirement age "
+            "that reaches the target. A payout target is converted to a rough CPF LIFE sum at 65."
+        )
+
+    if st.session_state.get("sensitivity_df") is not None:
+        st.markdown("### 🔀 What moves the result")
+        st.bar_chart(
+            st.session_state.sensitivity_df.set_index("Assumption"),
+            horizontal=True,
+            x_label="Change in projected savings (S$)",
+            color=["#d62728", "#2ca02c"],
+        )
+        st.caption("Each bar moves one assumption down (Lower) or up (Higher) and keeps the rest as entered.")
+
+        # Imported here: altair is slow to import and only needed once results exist
+        import altair as alt
+
+        grid_df = st.session_state.grid_df
+        heatmap = (
+            alt.Chart(grid_df)
+            .mark_rect()
+            .encode(
+                x=alt.X("Retirement age:O"),
+                y=alt.Y("Contribution multiplier:O", sort="descending", title="Contribution × your input"),
+                color=alt.Color("Projected savings (S$):Q", scale=alt.Scale(scheme="viridis")),
+                tooltip=["Retirement age", "Contribution multiplier",
+                         alt.Tooltip("Projected savings (S$):Q", format=",.0f")],
+            )
+        )
+        st.altair_chart(heatmap, use_container_width=True)
+        st.caption("Projected savings for other retirement ages and contribution levels, at your assumed rates.")
+
     st.markdown("### 📋 Detailed table")
     st.dataframe(
-        df.style.format({"Projected savings (S$)": "S${:,.0f}"}),
+        df.style.format({col: "S${:,.0f}" for col in df.columns if col.endswith("(S$)")}),
         use_container_width=True,
     )
 
@@ -339,15 +418,35 @@ with tab_results:
         }
     ]
 
-    with st.spinner("Generating explanation..."):
-        explanation = explain_simulation_results(
+    queue_notice = st.empty()
+
+    def show_queue_position(position: int):
+        queue_notice.info(
+            f"⏳ The assistant is busy. Your explanation is number {position} in the queue."
+        )
+
+    with st.spinner("Generating explanation..."), tracing.span("simulation_request") as request_trace:
+        # Inputs are the simplified, non-PII simulator fields
+        with recorder.recording(
+            "simulation",
             user_inputs=sim_inputs,
             scenarios=scenarios_dicts,
             base_classification=classification,
-        )
+        ) as rec, rec.stage("explain"), usage.attribute_to(session_id=st.session_state.usage_session_id):
+            explanation = explain_simulation_results(
+                user_inputs=sim_inputs,
+                scenarios=scenarios_dicts,
+                base_classification=classification,
+                on_queued=show_queue_position,
+            )
+    queue_notice.empty()
 
     st.markdown(explanation)
 
+    if tracing.is_enabled():
+        with st.expander("⏱️ Timing breakdown (debug)"):
+            st.dataframe(pd.DataFrame(tracing.trace_rows(request_trace.trace_id)), use_container_width=True)
+
     with st.expander("ℹ️ How to interpret these results", expanded=False):
         st.markdown(
             """
@@ -0,0 +1,77 @@
+# tests/test_batch_simulate.py
+"""
+Rows the projection cannot sensibly handle are labelled "Invalid input"
+without affecting the rest of the chunk.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.batch_simulate import INPUT_COLUMNS, INVALID, LABELS, project_chunk, run
+from backend.simulator import RetirementInputs, project_savings
+
+VALID_ROW = {
+    "current_age": 40,
+    "retirement_age": 65,
+    "current_savings": 150_000.0,
+    "monthly_contribution": 1_500.0,
+    "salary_growth_rate": 0.02,
+    "assumed_return_rate": 0.04,
+}
+
+INVALID_ROWS = {
+    "negative_current_age": {"current_age": -5},
+    "huge_retirement_age": {"retirement_age": 1e9},
+    "huge_current_and_retirement_age": {"current_age": 1e9, "retirement_age": 1e9},
+    "retirement_before_current": {"retirement_age": 39},
+    "negative_savings": {"current_savings": -1.0},
+    "negative_contribution": {"monthly_contribution": -100.0},
+    "infinite_savings": {"current_savings": np.inf},
+    "return_rate_minus_100_percent": {"assumed_return_rate": -1.0},
+    "growth_rate_as_percent": {"salary_growth_rate": 2.0},
+    "missing_value": {"assumed_return_rate": np.nan},
+}
+
+
+def _columns(rows):
+    return {name: np.array([row[name] for row in rows], dtype="float64") for name in INPUT_COLUMNS}
+
+
+@pytest.mark.parametrize("override", INVALID_ROWS.values(), ids=INVALID_ROWS.keys())
+def test_out_of_range_rows_are_invalid(override):
+    result = project_chunk(_columns([VALID_ROW, {**VALID_ROW, **override}]))
+
+    assert result["code"][1] == INVALID
+    assert np.isnan(result["projected_savings"][1])
+    assert result["invalid"] == 1
+    # The valid row is still projected
+    assert result["code"][0] != INVALID
+    assert result["projected_savings"][0] == pytest.approx(project_savings(RetirementInputs(**VALID_ROW)))
+
+
+def test_boundary_rows_are_valid():
+    rows = [
+        {**VALID_ROW, "current_age": 0, "retirement_age": 120},
+        {**VALID_ROW, "current_age": 120, "retirement_age": 120},
+        {**VALID_ROW, "current_savings": 0.0, "monthly_contribution": 0.0},
+        {**VALID_ROW, "salary_growth_rate": -0.5, "assumed_return_rate": 1.0},
+    ]
+    result = project_chunk(_columns(rows))
+
+    assert result["invalid"] == 0
+    assert np.isfinite(result["projected_savings"]).all()
+
+
+def test_run_labels_invalid_rows(tmp_path):
+    members = pd.DataFrame([VALID_ROW, {**VALID_ROW, "retirement_age": 1e9}, {**VALID_ROW, "current_age": -1}])
+    members.insert(0, "member_id", [1, 2, 3])
+    members.to_csv(tmp_path / "members.csv", index=False)
+
+    summary = run(tmp_path / "members.csv", tmp_path / "results.csv", workers=0, chunk_rows=2, max_pending=1)
+    results = pd.read_csv(tmp_path / "results.csv")
+
+    assert summary["rows"] == 3
+    assert summary["invalid"] == 2
+    assert results["member_id"].tolist() == [1, 2, 3]
+    assert results["classification"].tolist()[1:] == [LABELS[INVALID]] * 2
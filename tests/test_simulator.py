@@ -0,0 +1,162 @@
+# tests/test_simulator.py
+"""
+The vectorised and cached projections must agree with the scalar reference,
+project_savings, year for year.
+"""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from backend.simulator import (
+    RetirementInputs,
+    _PathCache,
+    _extend_balance_path,
+    project_savings,
+    project_savings_batch,
+    project_yearly,
+    sensitivity,
+)
+
+BASE = RetirementInputs(
+    current_age=35,
+    retirement_age=65,
+    current_savings=80_000.0,
+    monthly_contribution=1_200.0,
+    salary_growth_rate=0.02,
+    assumed_return_rate=0.035,
+)
+
+CASES = {
+    "typical": BASE,
+    "zero_years": replace(BASE, retirement_age=BASE.current_age),
+    "zero_growth": replace(BASE, salary_growth_rate=0.0),
+    "growth_equals_return": replace(BASE, salary_growth_rate=0.035),
+    "growth_near_return": replace(BASE, salary_growth_rate=0.035 + 1e-12),
+    "zero_return": replace(BASE, assumed_return_rate=0.0),
+    "growth_above_return": replace(BASE, salary_growth_rate=0.06),
+    "no_savings_or_contribution": replace(BASE, current_savings=0.0, monthly_contribution=0.0),
+    "one_year": replace(BASE, retirement_age=BASE.current_age + 1),
+    "long_horizon": replace(BASE, current_age=21, retirement_age=70),
+}
+
+
+def _profiles(inputs_list):
+    return {
+        name: np.array([getattr(inputs, name) for inputs in inputs_list])
+        for name in ("current_age", "retirement_age", "current_savings", "monthly_contribution",
+                     "salary_growth_rate", "assumed_return_rate")
+    }
+
+
+def _scalar_path(inputs):
+    return np.array([
+        project_savings(replace(inputs, retirement_age=inputs.current_age + k))
+        for k in range(inputs.retirement_age - inputs.current_age + 1)
+    ])
+
+
+@pytest.mark.parametrize("inputs", CASES.values(), ids=CASES.keys())
+def test_batch_matches_scalar(inputs):
+    result = project_savings_batch(_profiles([inputs]), paths=True)
+
+    assert result.years.tolist() == [inputs.retirement_age - inputs.current_age]
+    assert result.final_balance[0] == pytest.approx(project_savings(inputs), rel=1e-9, abs=1e-6)
+    np.testing.assert_allclose(result.paths[0], _scalar_path(inputs), rtol=1e-9, atol=1e-6)
+
+
+def test_batch_mixed_horizons():
+    inputs_list = list(CASES.values())
+    result = project_savings_batch(_profiles(inputs_list), paths=True)
+
+    horizon = max(inputs.retirement_age - inputs.current_age for inputs in inputs_list)
+    assert result.paths.shape == (len(inputs_list), horizon + 1)
+    for i, inputs in enumerate(inputs_list):
+        expected = _scalar_path(inputs)
+        assert result.final_balance[i] == pytest.approx(expected[-1], rel=1e-9, abs=1e-6)
+        np.testing.assert_allclose(result.paths[i, : len(expected)], expected, rtol=1e-9, atol=1e-6)
+        # Past each profile's retirement the path is padded with NaN
+        assert np.isnan(result.paths[i, len(expected):]).all()
+
+
+def test_batch_rejects_retirement_before_current_age():
+    with pytest.raises(ValueError):
+        project_savings_batch(_profiles([replace(BASE, retirement_age=BASE.current_age - 1)]))
+
+
+@pytest.mark.parametrize("inputs", CASES.values(), ids=CASES.keys())
+def test_project_yearly_matches_scalar(inputs):
+    projection = project_yearly(inputs)
+    expected = _scalar_path(inputs)
+
+    assert projection.age.tolist() == list(range(inputs.current_age, inputs.retirement_age + 1))
+    np.testing.assert_allclose(projection.balance, expected, rtol=1e-9, atol=1e-6)
+    assert projection.final_balance == pytest.approx(project_savings(inputs), rel=1e-9, abs=1e-6)
+    # Each year's contribution plus interest is that year's change in balance
+    np.testing.assert_allclose(
+        (projection.contribution + projection.interest)[:-1], np.diff(projection.balance), rtol=1e-9, atol=1e-6
+    )
+
+
+def test_project_yearly_reuses_path_across_retirement_ages():
+    # Inputs no other test uses, so the shared cache starts cold for them
+    inputs = replace(BASE, current_savings=12_345.67, monthly_contribution=987.65)
+    projections = {age: project_yearly(replace(inputs, retirement_age=age)) for age in (60, 67, 62)}
+
+    for age, projection in projections.items():
+        np.testing.assert_allclose(
+            projection.balance, _scalar_path(replace(inputs, retirement_age=age)), rtol=1e-9, atol=1e-6
+        )
+    # The shorter and longer horizons share one path
+    np.testing.assert_array_equal(projections[67].balance[: len(projections[60].balance)], projections[60].balance)
+
+
+def test_path_cache_extends_prefix():
+    calls = []
+
+    def extend(key, rows, carry, years):
+        calls.append((0 if rows is None else len(rows), years))
+        return _extend_balance_path(key, rows, carry, years)
+
+    cache = _PathCache(extend, maxsize=4)
+    key = (BASE.current_savings, BASE.monthly_contribution, BASE.salary_growth_rate, BASE.assumed_return_rate)
+    expected = _scalar_path(replace(BASE, retirement_age=BASE.current_age + 40))
+
+    short = cache.get(key, 10)
+    longer = cache.get(key, 40)
+    shorter = cache.get(key, 5)
+
+    # The longer horizon only computes the years after the cached ones
+    assert calls == [(0, 10), (11, 40)]
+    assert cache.info() == {"hits": 1, "extensions": 1, "misses": 1, "entries": 1}
+    np.testing.assert_allclose(longer, expected, rtol=1e-9, atol=1e-6)
+    np.testing.assert_array_equal(longer[:11], short)
+    np.testing.assert_array_equal(shorter, short[:6])
+    assert not longer.flags.writeable
+
+
+def test_path_cache_evicts_least_recently_used():
+    cache = _PathCache(_extend_balance_path, maxsize=2)
+    keys = [(1_000.0 * i, 100.0, 0.0, 0.03) for i in range(3)]
+    for key in keys:
+        cache.get(key, 3)
+    cache.get(keys[0], 3)
+
+    assert cache.info()["entries"] == 2
+    assert cache.info()["misses"] == 4
+
+
+@pytest.mark.parametrize(
+    "retirement_age, label, lower_age",
+    [(65, "Retirement age ±2 years", 63), (36, "Retirement age −1 / +2 years", 35), (35, "Retirement age +2 years", 35)],
+)
+def test_sensitivity_labels_retirement_ages_used(retirement_age, label, lower_age):
+    inputs = replace(BASE, retirement_age=retirement_age)
+    frame = sensitivity(inputs).set_index("Assumption")
+
+    assert label in frame.index
+    lower = frame.loc[label, "Lower (S$)"]
+    assert lower == pytest.approx(
+        project_savings(replace(inputs, retirement_age=lower_age)) - project_savings(inputs), abs=1e-6
+    )